@@ -0,0 +1,129 @@
+"""
+An asyncio facade over a provider's services.
+
+Each service method is exposed as a coroutine which runs the underlying
+blocking call on a bounded thread pool, so that cloudbridge can be used from
+an asyncio event loop without blocking it.
+"""
+import asyncio
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from ..interfaces.services import CloudService
+
+log = logging.getLogger(__name__)
+
+DEFAULT_AIO_MAX_WORKERS = 10
+
+_END_OF_ITERATION = object()
+
+
+class AsyncServiceProxy(object):
+    """
+    Wraps a :class:`.CloudService`, exposing its methods as coroutines.
+
+    Nested services, such as ``compute.instances``, are wrapped in turn.
+    Other attributes are returned as is, and are therefore evaluated
+    synchronously.
+
+    Example::
+
+        instance = await provider.aio.compute.instances.get(instance_id)
+        async for volume in provider.aio.storage.volumes:
+            print(volume.id)
+    """
+
+    def __init__(self, service, executor):
+        self._service = service
+        self._executor = executor
+
+    def _run(self, func, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return loop.run_in_executor(
+            self._executor, functools.partial(func, *args, **kwargs))
+
+    def __getattr__(self, name):
+        attr = getattr(self._service, name)
+        if isinstance(attr, CloudService):
+            return AsyncServiceProxy(attr, self._executor)
+        elif callable(attr):
+            @functools.wraps(attr)
+            async def run_in_executor(*args, **kwargs):
+                return await self._run(attr, *args, **kwargs)
+            return run_in_executor
+        return attr
+
+    async def iter(self, **kwargs):
+        """
+        An async generator over all objects in the service, fetching each
+        page through the service's own ``iter`` method on the executor.
+        """
+        results = await self._run(self._service.iter, **kwargs)
+        try:
+            while True:
+                result = await self._run(next, results, _END_OF_ITERATION)
+                if result is _END_OF_ITERATION:
+                    return
+                yield result
+        finally:
+            # Closing this generator, e.g. with aclose(), closes the
+            # service's generator too, which stops any prefetching
+            close = getattr(results, 'close', None)
+            if close:
+                await self._run(close)
+
+    def __aiter__(self):
+        return self.iter()
+
+    def __repr__(self):
+        return "<AsyncServiceProxy: {0}>".format(self._service)
+
+
+class AsyncCloudProvider(object):
+    """
+    Mirrors a provider's top level services with :class:`AsyncServiceProxy`
+    objects. All blocking calls are run on a thread pool of at most
+    ``max_workers`` threads, which bounds the number of concurrent requests
+    issued to the cloud.
+    """
+
+    def __init__(self, provider, max_workers=DEFAULT_AIO_MAX_WORKERS):
+        self._provider = provider
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="cloudbridge-aio")
+
+    @property
+    def provider(self):
+        return self._provider
+
+    @property
+    def executor(self):
+        return self._executor
+
+    @property
+    def compute(self):
+        return AsyncServiceProxy(self._provider.compute, self._executor)
+
+    @property
+    def networking(self):
+        return AsyncServiceProxy(self._provider.networking, self._executor)
+
+    @property
+    def security(self):
+        return AsyncServiceProxy(self._provider.security, self._executor)
+
+    @property
+    def storage(self):
+        return AsyncServiceProxy(self._provider.storage, self._executor)
+
+    @property
+    def dns(self):
+        return AsyncServiceProxy(self._provider.dns, self._executor)
+
+    def shutdown(self, wait=True):
+        """
+        Shuts down the executor. No further calls can be made through this
+        object afterwards.
+        """
+        self._executor.shutdown(wait=wait)
@@ -0,0 +1,445 @@
+"""
+Caches of cloud catalogs, such as the available VM types, kept in memory
+and optionally persisted to disk, so that they are fetched from the cloud at
+most once per ttl, and a new process can warm start from the catalog saved
+by an earlier one, along with indexes for querying them.
+"""
+import bisect
+import gzip
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from os.path import expanduser
+
+from .pool import fingerprint
+from .resources import ClientPagedCursor
+from ..interfaces.exceptions import InvalidParamException
+
+log = logging.getLogger(__name__)
+
+DEFAULT_CATALOG_TTL = 86400
+# Bump when the layout of catalog files changes, so that older files are
+# ignored rather than misread
+CATALOG_FORMAT_VERSION = 1
+
+
+def default_catalog_path():
+    """
+    Returns the conventional directory to save catalogs to, which is
+    ``$XDG_CACHE_HOME/cloudbridge``, or ``~/.cache/cloudbridge``. Catalogs
+    are only saved to disk if a path, such as this one, is configured.
+    """
+    cache_home = (os.environ.get('XDG_CACHE_HOME') or
+                  os.path.join(expanduser('~'), '.cache'))
+    return os.path.join(cache_home, 'cloudbridge')
+
+
+class Catalog(object):
+    """
+    A catalog of resources available to a provider in a given scope, such as
+    a region and zone.
+
+    The catalog holds the raw, JSON serializable records returned by a
+    ``fetch`` function, and is loaded in the following order:
+
+    1. from memory, if the catalog has been loaded before;
+    2. from disk, if a catalog was saved under ``path``, which allows a
+       process to start without contacting the cloud;
+    3. from the cloud, by calling ``fetch``.
+
+    Catalogs are shared by providers, so the catalog does not hold a
+    ``fetch`` function of its own. Each provider passes its own to the
+    methods which may contact the cloud, so that a catalog is always
+    fetched through the connections of the provider using it.
+
+    Once a catalog is older than ``ttl`` seconds, its records are still
+    served, but a background thread fetches a fresh copy. If the fetch fails,
+    e.g. because the cloud cannot be reached, the stale records are kept.
+
+    Each catalog carries a ``version``, which is a digest of its records.
+    It only changes when the records do, so that indexes built over the
+    catalog know when to rebuild.
+
+    Subclasses set :attr:`kind`, which names the catalog's files, and may
+    override :meth:`_fetch_records`, e.g. to only fetch the records that
+    changed. Values kept in :attr:`meta` are saved along with the records.
+
+    Example::
+
+        catalog = VMTypeCatalog(('aws', 'us-east-1', 'us-east-1a'))
+        for record in catalog.get(fetch_instance_types):
+            ...
+        # fetch now, e.g. after new types are announced
+        catalog.refresh(fetch_instance_types)
+    """
+
+    kind = 'catalog'
+
+    def __init__(self, key, path=None, ttl=DEFAULT_CATALOG_TTL):
+        """
+        :type key: ``tuple``
+        :param key: The values that identify the catalog, starting with the
+                    provider id. Catalogs with the same key share a file.
+                    Only a digest of the key is saved, so it may contain
+                    credentials.
+
+        :type path: ``str``
+        :param path: The directory to save the catalog to. If ``None``, the
+                     catalog is only kept in memory.
+
+        :type ttl: ``int``
+        :param ttl: Seconds after which the catalog is refreshed. If
+                    ``None``, the catalog is only refreshed on request.
+        """
+        self.key = tuple(key)
+        self.path = path
+        self.ttl = ttl
+        self._records = None
+        self._version = None
+        self._fetched_at = None
+        self.meta = {}
+        self._lock = threading.RLock()
+        self._refresh_thread = None
+
+    @property
+    def file_name(self):
+        """
+        The file the catalog is saved to, or ``None`` if it is only kept in
+        memory.
+        """
+        if not self.path:
+            return None
+        return os.path.join(
+            self.path, "%s-%s-%s.json.gz"
+            % (self.kind, self.key[0], fingerprint(*self.key)[:32]))
+
+    def get(self, fetch):
+        """
+        Returns the raw records in the catalog. Only contacts the cloud, by
+        calling ``fetch``, if no catalog is held in memory or on disk, or to
+        refresh an expired catalog in the background.
+
+        :type fetch: ``callable``
+        :param fetch: Returns a ``list`` of JSON serializable records.
+
+        :rtype: ``list``
+        """
+        with self._lock:
+            if self._records is None and not self.load():
+                self.refresh(fetch)
+            records = self._records
+        if self.expired:
+            self.refresh_async(fetch)
+        return records
+
+    @property
+    def records(self):
+        """
+        The raw records held in memory or on disk, without contacting the
+        cloud, or ``None`` if the catalog has not been fetched yet.
+
+        :rtype: ``list``
+        """
+        with self._lock:
+            if self._records is None:
+                self.load()
+            return self._records
+
+    @property
+    def version(self):
+        """
+        A digest of the records, which changes whenever the records do, or
+        ``None`` if the catalog has not been fetched yet.
+
+        :rtype: ``str``
+        """
+        if self._version is None:
+            # loads the catalog from disk
+            self.records  # pylint:disable=pointless-statement
+        return self._version
+
+    @property
+    def fetched_at(self):
+        """
+        The time, in seconds since the epoch, that the records were fetched
+        from the cloud, or ``None`` if the catalog has not been loaded.
+        """
+        return self._fetched_at
+
+    @property
+    def expired(self):
+        """
+        Whether the catalog is older than its ttl.
+
+        :rtype: ``bool``
+        """
+        return (self.ttl is not None and self._fetched_at is not None and
+                time.time() - self._fetched_at >= self.ttl)
+
+    def refresh(self, fetch):
+        """
+        Fetches the records from the cloud, by calling ``fetch``, and saves
+        them.
+
+        :rtype: ``list``
+        :return: The fetched records.
+        """
+        records = self._fetch_records(fetch)
+        version = fingerprint(records)
+        with self._lock:
+            if version != self._version:
+                log.debug("%s catalog %s changed to version %s", self.kind,
+                          self.key[:1], version)
+            self._records = records
+            self._version = version
+            self._fetched_at = time.time()
+            self.save()
+            return records
+
+    def _fetch_records(self, fetch):
+        """
+        Fetches the records of the catalog from the cloud.
+
+        :rtype: ``list``
+        """
+        return list(fetch())
+
+    def refresh_async(self, fetch):
+        """
+        Refreshes the catalog in a background thread, by calling ``fetch``,
+        unless a refresh is already in progress.
+
+        :rtype: ``threading.Thread``
+        :return: The thread performing the refresh.
+        """
+        with self._lock:
+            if self._refresh_thread and self._refresh_thread.is_alive():
+                return self._refresh_thread
+            self._refresh_thread = threading.Thread(
+                target=self._refresh_quietly, args=(fetch,),
+                name="cloudbridge-%s-catalog-refresh" % self.kind)
+            self._refresh_thread.daemon = True
+            self._refresh_thread.start()
+            return self._refresh_thread
+
+    def _refresh_quietly(self, fetch):
+        try:
+            self.refresh(fetch)
+        except Exception as e:
+            log.warning("Could not refresh %s catalog %s, keeping the "
+                        "current catalog: %s", self.kind, self.key[:1], e)
+
+    def invalidate(self):
+        """
+        Discards the catalog from memory and disk, so that it is fetched
+        from the cloud on next use.
+        """
+        with self._lock:
+            self._records = None
+            self._version = None
+            self._fetched_at = None
+            self.meta = {}
+            if self.file_name:
+                try:
+                    os.remove(self.file_name)
+                except OSError:
+                    pass
+
+    def load(self):
+        """
+        Loads the catalog from disk, even if it has expired.
+
+        :rtype: ``bool``
+        :return: Whether a catalog was loaded.
+        """
+        if not self.file_name:
+            return False
+        try:
+            with gzip.open(self.file_name, 'rt') as f:
+                data = json.load(f)
+        except (IOError, OSError, ValueError) as e:
+            if os.path.exists(self.file_name):
+                log.warning("Ignoring unreadable %s catalog %s: %s",
+                            self.kind, self.file_name, e)
+            return False
+        if (data.get('format') != CATALOG_FORMAT_VERSION or
+                data.get('key') != fingerprint(*self.key)):
+            return False
+        with self._lock:
+            self._records = data['records']
+            self._version = data['version']
+            self._fetched_at = data['fetched_at']
+            self.meta = data.get('meta', {})
+        log.debug("Loaded %s catalog %s from %s", self.kind, self.key[:1],
+                  self.file_name)
+        return True
+
+    def save(self):
+        """
+        Saves the catalog to disk, if it has a path. The file is replaced
+        atomically, so that concurrent processes never read a partial file.
+        """
+        if not self.file_name or self._records is None:
+            return
+        data = {'format': CATALOG_FORMAT_VERSION,
+                'key': fingerprint(*self.key),
+                'version': self._version,
+                'fetched_at': self._fetched_at,
+                'meta': self.meta,
+                'records': self._records}
+        try:
+            if not os.path.isdir(self.path):
+                os.makedirs(self.path)
+            fd, tmp_name = tempfile.mkstemp(dir=self.path, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as raw, \
+                        gzip.GzipFile(fileobj=raw, mode='wb') as f:
+                    f.write(json.dumps(data, separators=(',', ':'),
+                                       default=str).encode('utf-8'))
+                os.replace(tmp_name, self.file_name)
+            except Exception:
+                os.remove(tmp_name)
+                raise
+        except (IOError, OSError) as e:
+            log.warning("Could not save %s catalog to %s: %s", self.kind,
+                        self.file_name, e)
+
+
+class VMTypeCatalog(Catalog):
+    """
+    The VM types available to a provider in a given scope, such as a region
+    and zone.
+    """
+
+    kind = 'vm-types'
+
+
+class VMTypeIndex(object):
+    """
+    Indexes over the VM types of a catalog version, which answer lookups by
+    id, range queries and best-fit queries without scanning the catalog.
+
+    For each numeric column, such as ``vcpus``, the index keeps the column's
+    values in sorted order, with the position of the VM type holding each
+    value, so that the VM types within a range are found by bisection. VM
+    types are ranked by fit, smallest first, so that matching VM types are
+    returned in order of least waste.
+    """
+
+    # column name -> VMType property
+    COLUMNS = {'vcpus': 'vcpus',
+               'ram': 'ram',
+               'root_disk': 'size_root_disk',
+               'ephemeral': 'size_ephemeral_disks'}
+    # The order that VM types are ranked by, on ties in earlier columns
+    FIT_ORDER = ('vcpus', 'ram', 'root_disk', 'ephemeral')
+
+    def __init__(self, vm_types, version=None):
+        """
+        :type vm_types: ``list`` of :class:`.VMType`
+        :param vm_types: The VM types to index.
+
+        :type version: ``str``
+        :param version: The version of the catalog the VM types belong to.
+        """
+        self.vm_types = list(vm_types)
+        self.version = version
+        # shared by all pages listed from this index
+        self.cursor = ClientPagedCursor(self.vm_types)
+        self.by_id = {}
+        for vm_type in self.vm_types:
+            self.by_id.setdefault(vm_type.id, vm_type)
+        self.columns = {}
+        self._sorted = {}
+        for column, attr in self.COLUMNS.items():
+            values = [self._number(getattr(vm_type, attr))
+                      for vm_type in self.vm_types]
+            self.columns[column] = values
+            pairs = sorted((value, position)
+                           for position, value in enumerate(values)
+                           if value is not None)
+            self._sorted[column] = ([value for value, _ in pairs],
+                                    [position for _, position in pairs])
+        self._by_family = {}
+        for position, vm_type in enumerate(self.vm_types):
+            self._by_family.setdefault(vm_type.family, set()).add(position)
+        ranked = sorted(
+            range(len(self.vm_types)),
+            key=lambda p: tuple(self.columns[c][p] or 0
+                                for c in self.FIT_ORDER) +
+            (self.vm_types[p].name or '',))
+        self._rank = [0] * len(ranked)
+        for rank, position in enumerate(ranked):
+            self._rank[position] = rank
+
+    @staticmethod
+    def _number(value):
+        try:
+            return float(value) if value is not None else None
+        except (TypeError, ValueError):
+            return None
+
+    def __len__(self):
+        return len(self.vm_types)
+
+    def get(self, vm_type_id):
+        """
+        Returns the VM type with the given id, or ``None``.
+        """
+        return self.by_id.get(vm_type_id)
+
+    def range(self, column, low=None, high=None):
+        """
+        Returns the positions of the VM types whose ``column`` value lies
+        within ``low`` and ``high``, inclusive. VM types without a value for
+        the column never match.
+
+        :rtype: ``set`` of ``int``
+        """
+        values, positions = self._sorted[column]
+        start = 0 if low is None else bisect.bisect_left(values, low)
+        end = (len(values) if high is None
+               else bisect.bisect_right(values, high))
+        return set(positions[start:end])
+
+    def select(self, family=None, **bounds):
+        """
+        Returns the VM types within the given bounds, best fit first.
+
+        :type family: ``str``
+        :param family: Only return VM types of this family.
+
+        :type bounds: ``dict``
+        :param bounds: ``min_<column>`` and ``max_<column>`` bounds, where
+                       column is one of :attr:`COLUMNS`, e.g.
+                       ``min_vcpus=2, max_ram=16``.
+
+        :rtype: ``list`` of :class:`.VMType`
+        """
+        ranges = {}
+        for key, value in bounds.items():
+            bound, _, column = key.partition('_')
+            if bound not in ('min', 'max') or column not in self.COLUMNS:
+                raise InvalidParamException(
+                    "Unrecognised parameters for search: %s. Supported "
+                    "bounds are min_ and max_ of: %s."
+                    % (key, ", ".join(sorted(self.COLUMNS))))
+            if value is not None:
+                low, high = ranges.get(column, (None, None))
+                ranges[column] = ((value, high) if bound == 'min'
+                                  else (low, value))
+        candidates = [self.range(column, low, high)
+                      for column, (low, high) in ranges.items()]
+        if family is not None:
+            candidates.append(self._by_family.get(family, set()))
+        if candidates:
+            # intersect the smallest sets first
+            candidates.sort(key=len)
+            matches = candidates[0].intersection(*candidates[1:])
+        else:
+            matches = range(len(self.vm_types))
+        return [self.vm_types[position]
+                for position in sorted(matches, key=self._rank.__getitem__)]
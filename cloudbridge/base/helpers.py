@@ -1,9 +1,11 @@
 import fnmatch
 import functools
+import json
 import os
 import re
 import sys
 import traceback
+from collections import OrderedDict
 from contextlib import contextmanager
 
 from cryptography.hazmat.backends import default_backend
@@ -39,6 +41,149 @@ def generate_key_pair():
     return public_key, private_key
 
 
+@functools.lru_cache(maxsize=256)
+def compile_glob(pattern):
+    """
+    Compiles a glob pattern, as accepted by ``find()``, into a regular
+    expression matching the whole of a value. Compiled patterns are cached,
+    so repeated queries for the same pattern do not translate it again.
+    """
+    return re.compile(fnmatch.translate(pattern))
+
+
+def is_glob_literal(pattern):
+    """
+    Returns ``True`` if a glob pattern contains no wildcards, and can
+    therefore only match a value equal to itself.
+    """
+    return not any(char in pattern for char in '*?[')
+
+
+def glob_literal_prefix(pattern):
+    """
+    Returns the literal prefix of a glob pattern, before its first wildcard.
+    Every value matched by the pattern starts with this prefix, which makes
+    it suitable for narrowing down a prefix based listing.
+    """
+    return re.split(r'[*?[]', pattern, 1)[0]
+
+
+class FindQuery(object):
+    """
+    A plan for evaluating a ``find()`` call.
+
+    The query takes its criteria out of the ``find()`` keyword arguments,
+    raising an :class:`InvalidParamException` for any unsupported argument
+    before anything is listed. A provider can then push individual criteria
+    down to the cloud as native filters, with :meth:`push_down`, so that
+    fewer objects are listed. Criteria which are not pushed down are left
+    for client-side evaluation through :meth:`filter`, with glob patterns
+    compiled once per query.
+
+    Example::
+
+        query = FindQuery(['label'], kwargs)
+        label = query.push_down('label', translatable=is_glob_literal)
+        objs = list_objects(name=label) if label else list_objects()
+        return query.filter(objs)
+    """
+
+    def __init__(self, filter_names, kwargs):
+        self.filter_names = list(filter_names)
+        self.criteria = OrderedDict()
+        for name in self.filter_names:
+            value = kwargs.pop(name, None)
+            # An empty pattern places no constraint, but falsy values such
+            # as 0 or False are criteria like any other
+            if value is not None and value != '':
+                self.criteria[name] = value
+
+        # All kwargs should have been popped at this time.
+        if len(kwargs) > 0:
+            raise InvalidParamException(
+                "Unrecognised parameters for search: %s. Supported "
+                "attributes: %s" % (kwargs, self.filter_names))
+
+        self._residual = OrderedDict(self.criteria)
+        self._predicates = None
+
+    def get(self, name):
+        """
+        Returns the value a criterion is to match, or ``None`` if the
+        query does not filter on it.
+        """
+        return self.criteria.get(name)
+
+    def push_down(self, name, translatable=None):
+        """
+        Takes a criterion for evaluation by the cloud provider, which must
+        then return only matching objects. The criterion will not be
+        evaluated again client-side.
+
+        :type name: ``str``
+        :param name: The name of the criterion.
+
+        :type translatable: ``callable``
+        :param translatable: An optional check on the criterion's value. If
+                             it returns ``False``, the provider cannot
+                             evaluate the value exactly and the criterion is
+                             left for client-side evaluation.
+
+        :rtype: ``object``
+        :return: The value to filter on server-side, or ``None`` if the
+                 criterion cannot or need not be pushed down.
+        """
+        value = self._residual.get(name)
+        if value is None:
+            return None
+        if translatable and not translatable(value):
+            return None
+        del self._residual[name]
+        self._predicates = None
+        return value
+
+    @property
+    def residual(self):
+        """
+        Returns the names of criteria left for client-side evaluation.
+        """
+        return list(self._residual)
+
+    def _compile(self):
+        predicates = []
+        for name, value in self._residual.items():
+            if isinstance(value, six.string_types):
+                regex = compile_glob(value)
+                predicates.append(
+                    (name, lambda val, regex=regex: regex.match(val)))
+            else:
+                predicates.append(
+                    (name, lambda val, expected=value: val == expected))
+        return predicates
+
+    def matches(self, obj):
+        """
+        Checks whether an object satisfies the criteria left for
+        client-side evaluation.
+        """
+        if self._predicates is None:
+            self._predicates = self._compile()
+        for name, predicate in self._predicates:
+            value = getattr(obj, name)
+            if value is None or not predicate(value):
+                return False
+        return True
+
+    def filter(self, objs):
+        """
+        Returns a list of the objects which satisfy the criteria left for
+        client-side evaluation.
+        """
+        if not self._residual:
+            return list(objs)
+        return [obj for obj in objs if self.matches(obj)]
+
+
 def filter_by(prop_name, kwargs, objs):
     """
     Utility method for filtering a list of objects by a property.
@@ -48,15 +193,7 @@ def filter_by(prop_name, kwargs, objs):
     """
     prop_val = kwargs.pop(prop_name, None)
     if prop_val:
-        if isinstance(prop_val, six.string_types):
-            regex = fnmatch.translate(prop_val)
-            results = [o for o in objs
-                       if getattr(o, prop_name)
-                       and re.search(regex, getattr(o, prop_name))]
-        else:
-            results = [o for o in objs
-                       if getattr(o, prop_name) == prop_val]
-        return results
+        return FindQuery([prop_name], {prop_name: prop_val}).filter(objs)
     else:
         return objs
 
@@ -65,17 +202,34 @@ def generic_find(filter_names, kwargs, objs):
     """
     Utility method for filtering a list of objects by a list of filters.
     """
-    matches = objs
-    for name in filter_names:
-        matches = filter_by(name, kwargs, matches)
+    return FindQuery(filter_names, kwargs).filter(objs)
 
-    # All kwargs should have been popped at this time.
-    if len(kwargs) > 0:
-        raise InvalidParamException(
-            "Unrecognised parameters for search: %s. Supported attributes: %s"
-            % (kwargs, filter_names))
 
-    return matches
+def to_jsonl(resources, stream, cheap=False):
+    """
+    Writes the JSON representation of each resource to a stream, one per
+    line, in the JSON Lines format. Values which are not natively
+    serializable, such as dates, are written as strings.
+
+    :type resources: iterable of :class:`.CloudResource`
+    :param resources: The resources to write, e.g. a provider service.
+
+    :type stream: file-like object
+    :param stream: A text stream to write to.
+
+    :type cheap: ``bool``
+    :param cheap: Whether to serialize locally available fields only. See
+                  :meth:`.CloudResource.to_json`.
+
+    :rtype: ``int``
+    :return: The number of resources written.
+    """
+    count = 0
+    for resource in resources:
+        stream.write(json.dumps(resource.to_json(cheap=cheap), default=str))
+        stream.write('\n')
+        count += 1
+    return count
 
 
 @contextmanager
@@ -1,5 +1,13 @@
+import bisect
+import copy
+import fnmatch
 import logging
+import random
 import sys
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
 
 from pyeventsystem.middleware import dispatch as pyevent_dispatch
 from pyeventsystem.middleware import intercept
@@ -8,12 +16,17 @@ from pyeventsystem.middleware import observe
 import six
 
 from ..interfaces.exceptions import CloudBridgeBaseException
+from ..interfaces.resources import CloudResource
 
 log = logging.getLogger(__name__)
 
 
 dispatch = pyevent_dispatch
 
+# Operations which only read from the cloud, and may therefore be cached,
+# coalesced and retried
+READ_OPERATIONS = ("get", "list", "find", "select")
+
 
 class EventDebugLoggingMiddleware(object):
     """
@@ -55,3 +68,732 @@ class ExceptionWrappingMiddleware(object):
                     six.raise_from(cb_ex, e)
                 else:
                     six.reraise(CloudBridgeBaseException, cb_ex, traceback)
+
+
+def _freeze(value):
+    """
+    Converts an event argument into a hashable value suitable for use in
+    a cache key. CloudBridge resources are identified by their type and id,
+    since they do not define a hash of their own.
+    """
+    if isinstance(value, CloudResource):
+        return (value.__class__.__name__, value.id)
+    elif isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _event_key(event_args, args, kwargs):
+    """
+    Returns a hashable key identifying an event invocation by its sender,
+    event name and normalized arguments, or ``None`` if the arguments
+    cannot be hashed.
+    """
+    key = (id(event_args.get("sender")), event_args.get("event"),
+           _freeze(args), _freeze(kwargs))
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+# Whether read events dispatched by the current thread bypass the cache
+_cache_bypass = threading.local()
+
+
+@contextmanager
+def bypass_cache():
+    """
+    Makes read events dispatched by the current thread, within this context,
+    fetch fresh results rather than return those held by a
+    :class:`CachingMiddleware`. The fresh results replace the cached ones.
+    Resources refresh within this context, so that refreshes and the polls
+    of ``wait_for`` always see the latest state of the cloud.
+
+    Example::
+
+        with bypass_cache():
+            instance = provider.compute.instances.get(instance_id)
+    """
+    previous = getattr(_cache_bypass, "active", False)
+    _cache_bypass.active = True
+    try:
+        yield
+    finally:
+        _cache_bypass.active = previous
+
+
+def cache_bypassed():
+    """
+    Returns whether the current thread is within :func:`bypass_cache`.
+
+    :rtype: ``bool``
+    """
+    return getattr(_cache_bypass, "active", False)
+
+
+class CachingMiddleware(object):
+    """
+    A read-through cache for ``get``, ``list``, ``find`` and ``select``
+    events.
+
+    Results are cached per service (e.g. ``provider.compute.instances``),
+    keyed on the event name and its arguments, and expire after ``ttl``
+    seconds. Each service holds at most ``max_entries`` results, with the
+    least recently used entries evicted first. Any other event on a service,
+    such as ``create``, ``delete`` or a label update, invalidates all cached
+    results for that service.
+
+    Note that cached results are shared between callers, and may therefore
+    be stale by up to ``ttl`` seconds with respect to changes made outside
+    of this provider. Resource refreshes, and therefore the polls of
+    ``wait_for``, bypass the cache (see :func:`bypass_cache`).
+
+    Example::
+
+        provider.middleware.add(CachingMiddleware(ttl=30))
+    """
+    READ_OPERATIONS = READ_OPERATIONS
+
+    def __init__(self, ttl=60, max_entries=1000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        # service event prefix -> OrderedDict of key -> (expiry, result)
+        self._caches = {}
+        self._lock = threading.RLock()
+
+    @intercept(event_pattern="provider.*", priority=1100)
+    def cache_event(self, event_args, *args, **kwargs):
+        next_handler = event_args.pop("next_handler")
+        if not next_handler:
+            return
+        service, _, operation = event_args.get("event").rpartition(".")
+        if operation not in self.READ_OPERATIONS:
+            try:
+                return next_handler.invoke(event_args, *args, **kwargs)
+            finally:
+                self.invalidate(service)
+
+        key = _event_key(event_args, args, kwargs)
+        if key is None:
+            return next_handler.invoke(event_args, *args, **kwargs)
+        with self._lock:
+            cache = self._caches.setdefault(service, OrderedDict())
+            entry = cache.get(key)
+            if (entry and entry[0] > time.time() and
+                    not cache_bypassed()):
+                cache[key] = cache.pop(key)  # mark as most recently used
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        result = next_handler.invoke(event_args, *args, **kwargs)
+        with self._lock:
+            cache = self._caches.setdefault(service, OrderedDict())
+            cache.pop(key, None)
+            cache[key] = (time.time() + self.ttl, result)
+            while len(cache) > self.max_entries:
+                cache.popitem(last=False)
+        return result
+
+    def invalidate(self, service=None):
+        """
+        Discards cached results for the given service event prefix (e.g.
+        ``provider.compute.instances``), or for all services if no prefix
+        is given.
+        """
+        with self._lock:
+            if service:
+                self._caches.pop(service, None)
+            else:
+                self._caches.clear()
+
+
+class _InFlightCall(object):
+    """
+    A read event being dispatched on behalf of one or more callers.
+    """
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+def _raise_copy(error):
+    """
+    Raises a copy of an exception shared by several callers, chained to the
+    original, so that each caller gets its own traceback, and handlers that
+    modify the exception do not affect other callers.
+    """
+    try:
+        error_copy = copy.copy(error)
+    except Exception:
+        # exceptions which cannot be rebuilt from their args are shared
+        raise error
+    six.raise_from(error_copy, error)
+
+
+class SingleFlightMiddleware(object):
+    """
+    Coalesces concurrent identical ``get``, ``list``, ``find`` and
+    ``select`` events, so that only one request is issued to the cloud, and
+    all callers receive its result, or a copy of the exception it raised.
+
+    Events are identical if they have the same sender, event name and
+    arguments. Only events matching one of the given ``patterns`` are
+    coalesced. Unlike :class:`CachingMiddleware`, results are not kept
+    once the in-flight request completes, so callers never see results
+    older than their own call. Callers do share the same result object,
+    which should therefore not be modified.
+
+    Example::
+
+        single_flight = SingleFlightMiddleware(
+            patterns=["provider.compute.*", "provider.networking.*"])
+        provider.middleware.add(single_flight)
+        ...
+        print(single_flight.stats["coalesced"])
+    """
+    READ_OPERATIONS = READ_OPERATIONS
+
+    def __init__(self, patterns=("provider.*",)):
+        self.patterns = tuple(patterns)
+        # event key -> _InFlightCall
+        self._in_flight = {}
+        # event name -> whether the event matches a pattern
+        self._event_matches = {}
+        self._lock = threading.Lock()
+        self._calls = 0
+        self._coalesced = 0
+
+    def _should_coalesce(self, event):
+        matches = self._event_matches.get(event)
+        if matches is None:
+            matches = (event.rpartition(".")[2] in self.READ_OPERATIONS and
+                       any(fnmatch.fnmatchcase(event, pattern)
+                           for pattern in self.patterns))
+            with self._lock:
+                self._event_matches[event] = matches
+        return matches
+
+    @intercept(event_pattern="provider.*", priority=1200)
+    def coalesce_event(self, event_args, *args, **kwargs):
+        next_handler = event_args.pop("next_handler")
+        if not next_handler:
+            return
+        if not self._should_coalesce(event_args.get("event")):
+            return next_handler.invoke(event_args, *args, **kwargs)
+        key = _event_key(event_args, args, kwargs)
+        if key is None:
+            return next_handler.invoke(event_args, *args, **kwargs)
+
+        with self._lock:
+            self._calls += 1
+            call = self._in_flight.get(key)
+            if call:
+                self._coalesced += 1
+            else:
+                leader = _InFlightCall()
+                self._in_flight[key] = leader
+        if call:
+            call.done.wait()
+            if call.error is not None:
+                _raise_copy(call.error)
+            return call.result
+
+        try:
+            leader.result = next_handler.invoke(event_args, *args, **kwargs)
+            return leader.result
+        except Exception as e:
+            leader.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+            leader.done.set()
+
+    @property
+    def stats(self):
+        """
+        Returns the number of calls eligible for coalescing, and the number
+        of those calls which were served by another caller's request.
+
+        :rtype: ``dict``
+        """
+        with self._lock:
+            return {'calls': self._calls, 'coalesced': self._coalesced}
+
+
+# Upper bounds, in seconds, of the latency histogram buckets
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0,
+                           2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape_label_value(value):
+    return (str(value).replace('\\', '\\\\').replace('"', '\\"')
+            .replace('\n', '\\n'))
+
+
+class _EventSeries(object):
+    """
+    Metrics recorded for a single event. Labels are derived once, when the
+    event is first seen, so that recording a call allocates nothing.
+    """
+
+    def __init__(self, provider_id, event, num_buckets):
+        service, _, operation = event.rpartition(".")
+        if service.startswith("provider."):
+            service = service[len("provider."):]
+        self.labels = OrderedDict([("provider", provider_id or ""),
+                                   ("service", service),
+                                   ("operation", operation)])
+        self.label_text = ",".join(
+            '{0}="{1}"'.format(k, _escape_label_value(v))
+            for k, v in self.labels.items())
+        self.count = 0
+        self.errors = {}
+        self.latency_sum = 0.0
+        # per bucket counts, with an extra bucket for +Inf
+        self.bucket_counts = [0] * (num_buckets + 1)
+
+
+class MetricsMiddleware(object):
+    """
+    Records the number of calls, the number of errors by exception class,
+    and a latency histogram for every event dispatched through a provider.
+
+    Each event is labelled with the provider, service (e.g.
+    ``compute.instances``) and operation (e.g. ``get``). Metrics can be read
+    with :meth:`snapshot`, or rendered in the Prometheus text exposition
+    format with :meth:`to_prometheus`.
+
+    This middleware is installed on all providers, and can be accessed
+    through ``provider.metrics``.
+
+    Example::
+
+        provider.compute.instances.list()
+        stats = provider.metrics.snapshot()
+        print(stats['provider.compute.instances.list']['count'])
+    """
+
+    def __init__(self, provider_id=None, buckets=DEFAULT_LATENCY_BUCKETS):
+        self.provider_id = provider_id
+        self.buckets = tuple(sorted(buckets))
+        # event name -> _EventSeries
+        self._series = {}
+        self._lock = threading.Lock()
+
+    @intercept(event_pattern="*", priority=1060)
+    def measure_event(self, event_args, *args, **kwargs):
+        next_handler = event_args.pop("next_handler")
+        if not next_handler:
+            return
+        error = None
+        start = time.perf_counter()
+        try:
+            return next_handler.invoke(event_args, *args, **kwargs)
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            self._record(event_args.get("event"),
+                         time.perf_counter() - start, error)
+
+    def record(self, event, elapsed, error=None):
+        """
+        Records a call that was not dispatched as an event, such as one of
+        the cloud requests that an operation fans out to.
+
+        :type event: ``str``
+        :param event: The event name to record the call under, e.g.
+                      ``provider.compute.vm_types.describe_instance_types``.
+
+        :type elapsed: ``float``
+        :param elapsed: The duration of the call, in seconds.
+
+        :type error: ``Exception``
+        :param error: The exception raised by the call, if any.
+        """
+        self._record(event, elapsed, error)
+
+    def _record(self, event, elapsed, error):
+        bucket = bisect.bisect_left(self.buckets, elapsed)
+        with self._lock:
+            series = self._series.get(event)
+            if series is None:
+                series = _EventSeries(self.provider_id, event,
+                                      len(self.buckets))
+                self._series[event] = series
+            series.count += 1
+            series.latency_sum += elapsed
+            series.bucket_counts[bucket] += 1
+            if error is not None:
+                error_class = error.__class__.__name__
+                series.errors[error_class] = (
+                    series.errors.get(error_class, 0) + 1)
+
+    def snapshot(self):
+        """
+        Returns a copy of the metrics recorded so far, keyed by event name.
+        Histogram buckets are cumulative, as ``(upper_bound, count)`` pairs,
+        with the last bucket's upper bound being infinity.
+
+        :rtype: ``dict``
+        """
+        bounds = self.buckets + (float("inf"),)
+        with self._lock:
+            snapshot = {}
+            for event, series in self._series.items():
+                cumulative = 0
+                buckets = []
+                for bound, count in zip(bounds, series.bucket_counts):
+                    cumulative += count
+                    buckets.append((bound, cumulative))
+                snapshot[event] = dict(
+                    series.labels, count=series.count,
+                    errors=dict(series.errors),
+                    latency_sum=series.latency_sum,
+                    latency_buckets=buckets)
+            return snapshot
+
+    def reset(self):
+        """
+        Discards all metrics recorded so far.
+        """
+        with self._lock:
+            self._series.clear()
+
+    def to_prometheus(self, prefix="cloudbridge"):
+        """
+        Renders the metrics recorded so far in the Prometheus text
+        exposition format, which OpenMetrics scrapers also accept.
+
+        :rtype: ``str``
+        """
+        with self._lock:
+            series_list = sorted(
+                ((event, series.label_text, series.count,
+                  dict(series.errors), series.latency_sum,
+                  list(series.bucket_counts))
+                 for event, series in self._series.items()))
+        calls = "{0}_calls_total".format(prefix)
+        errors = "{0}_errors_total".format(prefix)
+        duration = "{0}_call_duration_seconds".format(prefix)
+        lines = ["# HELP {0} Number of cloudbridge operations invoked."
+                 .format(calls),
+                 "# TYPE {0} counter".format(calls)]
+        for _, labels, count, _, _, _ in series_list:
+            lines.append("{0}{{{1}}} {2}".format(calls, labels, count))
+        lines.extend(["# HELP {0} Number of cloudbridge operations that "
+                      "raised an exception.".format(errors),
+                      "# TYPE {0} counter".format(errors)])
+        for _, labels, _, error_counts, _, _ in series_list:
+            for error_class, count in sorted(error_counts.items()):
+                lines.append('{0}{{{1},exception="{2}"}} {3}'.format(
+                    errors, labels, _escape_label_value(error_class), count))
+        lines.extend(["# HELP {0} Duration of cloudbridge operations."
+                      .format(duration),
+                      "# TYPE {0} histogram".format(duration)])
+        bounds = ["{0:g}".format(b) for b in self.buckets] + ["+Inf"]
+        for _, labels, count, _, latency_sum, counts in series_list:
+            cumulative = 0
+            for bound, bucket_count in zip(bounds, counts):
+                cumulative += bucket_count
+                lines.append('{0}_bucket{{{1},le="{2}"}} {3}'.format(
+                    duration, labels, bound, cumulative))
+            lines.append("{0}_sum{{{1}}} {2}".format(
+                duration, labels, latency_sum))
+            lines.append("{0}_count{{{1}}} {2}".format(
+                duration, labels, count))
+        return "\n".join(lines) + "\n"
+
+
+class TokenBucket(object):
+    """
+    A thread-safe token bucket, which admits up to ``rate`` requests per
+    second on average, with bursts of up to ``burst`` requests.
+
+    Callers that find the bucket empty reserve a token ahead of time and
+    sleep until it is due, so that waiting callers are admitted in the
+    order in which they arrived, and the lock is never held while sleeping.
+    """
+
+    def __init__(self, rate, burst=None):
+        assert rate > 0
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else max(rate, 1))
+        assert self.burst >= 1
+        self._tokens = self.burst
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+        self._acquired = 0
+        self._waits = 0
+        self._wait_time = 0.0
+
+    def reserve(self, tokens=1):
+        """
+        Takes ``tokens`` from the bucket, and returns the number of seconds
+        the caller must wait before proceeding. This method does not sleep,
+        and can therefore be used with ``asyncio.sleep()``.
+
+        :rtype: ``float``
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst,
+                               self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= tokens
+            delay = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            self._acquired += 1
+            if delay:
+                self._waits += 1
+                self._wait_time += delay
+            return delay
+
+    def acquire(self, tokens=1):
+        """
+        Takes ``tokens`` from the bucket, sleeping until they are available.
+
+        :rtype: ``float``
+        :return: The number of seconds spent waiting.
+        """
+        delay = self.reserve(tokens)
+        if delay:
+            time.sleep(delay)
+        return delay
+
+    @property
+    def stats(self):
+        """
+        Returns the number of requests admitted, the number of requests
+        that had to wait for a token and the total seconds spent waiting.
+
+        :rtype: ``dict``
+        """
+        with self._lock:
+            return {'acquired': self._acquired, 'waits': self._waits,
+                    'wait_time': self._wait_time}
+
+    def __repr__(self):
+        return "<TokenBucket: rate={0}/s, burst={1}>".format(
+            self.rate, self.burst)
+
+
+class RateLimitMiddleware(object):
+    """
+    Limits the rate at which events are dispatched to the cloud, so that
+    calls fanned out across many threads are smoothed at the client rather
+    than rejected by the provider's API throttling.
+
+    Limits are given as a dict of event patterns to a rate in requests per
+    second, or a ``(rate, burst)`` tuple. Each pattern has its own
+    :class:`TokenBucket`, and an event takes a token from every bucket whose
+    pattern it matches, so that per service budgets can be nested within a
+    wider budget. Events matching no pattern are not limited.
+
+    The middleware runs inside the caching layer, so cache hits do not
+    consume tokens. Waiting blocks the calling thread, which for
+    ``provider.aio`` calls is an executor thread rather than the event loop.
+    The same instance may be added to several providers, such as clones of
+    a provider, to share a single budget between them.
+
+    Rate limits can also be set through the ``rate_limits`` provider config
+    value.
+
+    Example::
+
+        limiter = RateLimitMiddleware({
+            "provider.compute.*": 20,
+            "provider.storage._bucket_objects.*": (50, 100)})
+        provider.middleware.add(limiter)
+        ...
+        print(limiter.stats["provider.compute.*"]["wait_time"])
+    """
+
+    def __init__(self, limits):
+        self._buckets = OrderedDict()
+        for pattern, limit in limits.items():
+            rate, burst = (limit if isinstance(limit, (list, tuple))
+                           else (limit, None))
+            self._buckets[pattern] = TokenBucket(rate, burst)
+        # event name -> list of buckets matching that event
+        self._event_buckets = {}
+        self._lock = threading.Lock()
+
+    @property
+    def buckets(self):
+        """
+        The token buckets of this middleware, keyed by event pattern.
+        """
+        return self._buckets
+
+    def _buckets_for(self, event):
+        buckets = self._event_buckets.get(event)
+        if buckets is None:
+            buckets = [bucket for pattern, bucket in self._buckets.items()
+                       if fnmatch.fnmatchcase(event, pattern)]
+            with self._lock:
+                self._event_buckets[event] = buckets
+        return buckets
+
+    def reserve(self, event):
+        """
+        Takes a token for a request made by an event from every bucket the
+        event matches, and returns the number of seconds the caller must
+        wait before sending it. Requests which do not go through the event
+        system, such as the parts of a batch request, can be limited this
+        way.
+
+        :rtype: ``float``
+        """
+        buckets = self._buckets_for(event)
+        if not buckets:
+            return 0.0
+        # Reserve from all buckets at once, so that a wait on one bucket
+        # overlaps with waits on the others
+        return max(bucket.reserve() for bucket in buckets)
+
+    @intercept(event_pattern="provider.*", priority=1400)
+    def limit_event(self, event_args, *args, **kwargs):
+        next_handler = event_args.pop("next_handler")
+        if not next_handler:
+            return
+        delay = self.reserve(event_args.get("event"))
+        if delay:
+            log.debug("Rate limiting event %s for %.3f seconds",
+                      event_args.get("event"), delay)
+            time.sleep(delay)
+        return next_handler.invoke(event_args, *args, **kwargs)
+
+    @property
+    def stats(self):
+        """
+        Returns the statistics of each token bucket, keyed by event pattern,
+        including the total seconds spent waiting for tokens.
+
+        :rtype: ``dict``
+        """
+        return {pattern: bucket.stats
+                for pattern, bucket in self._buckets.items()}
+
+
+class RetryMiddleware(object):
+    """
+    Retries read events, namely ``get``, ``list``, ``find`` and ``select``,
+    which fail because the provider is throttling requests.
+
+    Whether an exception is a throttle is decided by ``classifier``, which
+    is given the raw exception raised by the provider SDK, and returns
+    ``None`` if the call should not be retried, or else the number of
+    seconds the provider asked the caller to wait (zero if it gave no
+    hint). Each provider supplies its own classifier through
+    :meth:`.BaseCloudProvider._throttle_delay`.
+
+    Retries are spaced with decorrelated jitter, each delay being drawn
+    from ``base_delay`` up to three times the previous delay, capped at
+    ``max_delay``, but never less than the delay hinted at by the provider.
+    The middleware runs inside the exception wrapping layer, so that it
+    sees provider exceptions before they are wrapped, and outside any rate
+    limits, so that retried calls consume tokens like any other call.
+    Only the outermost read event on a thread is retried, so that a
+    ``find`` implemented through ``list`` is not retried at both levels.
+
+    Example::
+
+        provider.compute.instances.list()
+        print(provider.retries.stats)
+    """
+    RETRY_OPERATIONS = READ_OPERATIONS
+
+    def __init__(self, classifier, max_attempts=5, base_delay=0.5,
+                 max_delay=20):
+        assert max_attempts >= 1
+        self.classifier = classifier
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._lock = threading.Lock()
+        self._retries = 0
+        self._recovered = 0
+        self._exhausted = 0
+        self._wait_time = 0.0
+        # marks threads which are already inside a retried event
+        self._local = threading.local()
+
+    def next_delay(self, previous_delay):
+        """
+        Returns the number of seconds to wait before the next attempt,
+        given the previous delay.
+        """
+        return min(self.max_delay,
+                   random.uniform(self.base_delay, previous_delay * 3))
+
+    @intercept(event_pattern="provider.*", priority=1300)
+    def retry_event(self, event_args, *args, **kwargs):
+        next_handler = event_args.pop("next_handler")
+        if not next_handler:
+            return
+        event = event_args.get("event")
+        if (event.rpartition(".")[2] not in self.RETRY_OPERATIONS or
+                getattr(self._local, 'active', False)):
+            return next_handler.invoke(event_args, *args, **kwargs)
+
+        self._local.active = True
+        try:
+            return self._retry(next_handler, event, event_args, *args,
+                               **kwargs)
+        finally:
+            self._local.active = False
+
+    def _retry(self, next_handler, event, event_args, *args, **kwargs):
+        delay = self.base_delay
+        attempt = 1
+        while True:
+            try:
+                result = next_handler.invoke(event_args, *args, **kwargs)
+            except Exception as e:
+                hint = self.classifier(e)
+                if hint is None:
+                    raise
+                if attempt >= self.max_attempts:
+                    with self._lock:
+                        self._exhausted += 1
+                    log.warning("Event %s still throttled after %s "
+                                "attempts", event, attempt)
+                    raise
+                delay = self.next_delay(delay)
+                wait = max(delay, hint)
+                with self._lock:
+                    self._retries += 1
+                    self._wait_time += wait
+                log.debug("Event %s throttled (%s), retrying in %.2f "
+                          "seconds", event, e, wait)
+                time.sleep(wait)
+                attempt += 1
+            else:
+                if attempt > 1:
+                    with self._lock:
+                        self._recovered += 1
+                return result
+
+    @property
+    def stats(self):
+        """
+        Returns the number of retries issued, the number of calls which
+        succeeded after being retried, the number of calls which were still
+        throttled after ``max_attempts`` attempts, and the total seconds
+        spent waiting between attempts.
+
+        :rtype: ``dict``
+        """
+        with self._lock:
+            return {'retries': self._retries, 'recovered': self._recovered,
+                    'exhausted': self._exhausted,
+                    'wait_time': self._wait_time}
@@ -0,0 +1,188 @@
+"""
+Poll schedules used when waiting on long running cloud operations.
+"""
+import logging
+import random
+import threading
+import time
+
+log = logging.getLogger(__name__)
+
+# Seconds before the first poll, unless a schedule sets its own
+DEFAULT_INITIAL_INTERVAL = 5
+
+
+class PollSchedule(object):
+    """
+    Determines how often to poll while waiting for an operation to complete.
+
+    The first poll is made ``initial_interval`` seconds after the wait
+    starts, and later polls back off exponentially, by ``multiplier`` per
+    poll, up to ``max_interval`` seconds apart. With ``jitter`` enabled,
+    later delays are drawn uniformly from ``initial_interval`` up to the
+    backoff value, so that concurrent waiters do not poll in lockstep.
+
+    A schedule is stateless with respect to individual waits and can be
+    shared between threads. Each wait is tracked by a :class:`PollWait`
+    returned from :meth:`start`. The schedule accumulates statistics across
+    all waits started from it, which can be read through :attr:`stats`.
+    Providers use their own copy of each schedule, see :meth:`copy`, so
+    that each provider keeps its own statistics.
+
+    Example::
+
+        wait = schedule.start(timeout=60)
+        while not is_done():
+            if not wait.sleep():
+                raise WaitStateException("Timed out")
+        log.debug("Done after %s polls", wait.polls)
+    """
+
+    def __init__(self, initial_interval=DEFAULT_INITIAL_INTERVAL,
+                 max_interval=30, multiplier=2, jitter=True):
+        assert initial_interval >= 0
+        assert max_interval >= initial_interval
+        assert multiplier >= 1
+        self.initial_interval = initial_interval
+        self.max_interval = max_interval
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self._lock = threading.Lock()
+        self._waits = 0
+        self._polls = 0
+        self._wait_time = 0.0
+
+    def delay(self, attempt):
+        """
+        Returns the number of seconds to sleep before the given poll
+        attempt, numbered from zero.
+        """
+        backoff = min(self.max_interval,
+                      self.initial_interval * self.multiplier ** attempt)
+        if self.jitter:
+            return random.uniform(self.initial_interval, backoff)
+        return backoff
+
+    def copy(self):
+        """
+        Returns a schedule with the same settings, but statistics of its
+        own.
+
+        :rtype: :class:`PollSchedule`
+        """
+        return PollSchedule(self.initial_interval, self.max_interval,
+                            self.multiplier, self.jitter)
+
+    def start(self, timeout=None):
+        """
+        Starts tracking a new wait with the given deadline in seconds, or
+        no deadline if ``timeout`` is ``None``.
+
+        :rtype: :class:`PollWait`
+        :return: An object tracking the progress of this wait.
+        """
+        return PollWait(self, timeout)
+
+    def _record(self, wait):
+        with self._lock:
+            self._waits += 1
+            self._polls += wait.polls
+            self._wait_time += wait.elapsed
+
+    @property
+    def stats(self):
+        """
+        Returns the number of waits completed, polls issued and total
+        seconds spent waiting across all waits started from this schedule.
+
+        :rtype: ``dict``
+        """
+        with self._lock:
+            return {'waits': self._waits, 'polls': self._polls,
+                    'wait_time': self._wait_time}
+
+    def __repr__(self):
+        return ("<PollSchedule: initial={0}s, max={1}s, multiplier={2}, "
+                "jitter={3}>".format(self.initial_interval, self.max_interval,
+                                     self.multiplier, self.jitter))
+
+
+class FixedPollSchedule(PollSchedule):
+    """
+    A poll schedule that waits a constant ``interval`` between polls.
+    """
+
+    def __init__(self, interval):
+        super(FixedPollSchedule, self).__init__(
+            initial_interval=interval, max_interval=interval, multiplier=1,
+            jitter=False)
+
+    def copy(self):
+        return FixedPollSchedule(self.initial_interval)
+
+
+class PollWait(object):
+    """
+    Tracks a single wait against a :class:`PollSchedule`, including the
+    number of polls issued and the time spent so far.
+    """
+
+    def __init__(self, schedule, timeout=None):
+        self.schedule = schedule
+        self.polls = 0
+        self.start_time = time.time()
+        self.end_time = (self.start_time + timeout
+                         if timeout is not None else None)
+        self._finished = False
+
+    @property
+    def elapsed(self):
+        return time.time() - self.start_time
+
+    @property
+    def remaining(self):
+        """
+        Seconds remaining till the deadline, or ``None`` if there is none.
+        """
+        if self.end_time is None:
+            return None
+        return max(0, self.end_time - time.time())
+
+    @property
+    def expired(self):
+        return self.end_time is not None and time.time() >= self.end_time
+
+    def sleep(self):
+        """
+        Sleeps till the next poll is due, but never past the deadline.
+
+        :rtype: ``bool``
+        :return: ``False`` if the deadline has passed and no further polls
+                 should be issued, ``True`` otherwise.
+        """
+        delay = self.schedule.delay(self.polls)
+        remaining = self.remaining
+        if remaining is not None:
+            delay = min(delay, remaining)
+        time.sleep(delay)
+        if self.expired:
+            self.finish()
+            return False
+        self.polls += 1
+        return True
+
+    def finish(self):
+        """
+        Marks this wait as complete and records its statistics against the
+        schedule. Subsequent calls have no effect.
+        """
+        if not self._finished:
+            self._finished = True
+            # pylint:disable=protected-access
+            self.schedule._record(self)
+            log.debug("Wait finished after %s poll(s) in %.2f seconds",
+                      self.polls, self.elapsed)
+
+    def __repr__(self):
+        return "<PollWait: {0} poll(s) in {1:.2f}s>".format(
+            self.polls, self.elapsed)
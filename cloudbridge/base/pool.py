@@ -0,0 +1,141 @@
+"""
+A process-wide pool of cloud sessions, connections and credentials, which
+providers with the same configuration share, so that creating a provider,
+or cloning one, does not have to reconnect to the cloud. Pooled objects
+are used from any thread, so only thread-safe objects, such as credentials
+and low-level clients, should be pooled.
+"""
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+log = logging.getLogger(__name__)
+
+DEFAULT_POOL_MAX_ENTRIES = 128
+DEFAULT_POOL_TTL = 3600
+
+
+def fingerprint(*values):
+    """
+    Returns a digest of the given values, such as credentials, for use in
+    a pool key, so that secrets are not kept in the keys themselves.
+    Values which are not JSON serializable are identified by their ``repr``.
+    """
+    data = json.dumps(values, sort_keys=True, default=repr)
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+
+class ConnectionPool(object):
+    """
+    A thread-safe pool of objects, keyed by tuples such as
+    ``('aws', 'session', <fingerprint>)``.
+
+    An object is created by the factory passed to :meth:`get` the first time
+    its key is requested, and shared with all later requests for that key.
+    Concurrent requests for a missing key wait on a single call to the
+    factory. Objects expire ``ttl`` seconds after they were created, and the
+    least recently used objects are evicted once the pool holds more than
+    ``max_entries`` objects.
+
+    Example::
+
+        client = connection_pool.get(
+            ('aws', 'route53', fingerprint(access_key, secret_key)),
+            lambda: session.client('route53'))
+        # discard all AWS objects, e.g. after rotating credentials
+        connection_pool.invalidate('aws')
+    """
+
+    def __init__(self, max_entries=DEFAULT_POOL_MAX_ENTRIES,
+                 ttl=DEFAULT_POOL_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        # key -> (expiry, object)
+        self._entries = OrderedDict()
+        # key -> lock held while the object for that key is being created
+        self._creating = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def _lookup(self, key):
+        # must be called with self._lock held
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        if self.ttl is not None and entry[0] <= time.monotonic():
+            del self._entries[key]
+            return False, None
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return True, entry[1]
+
+    def get(self, key, factory):
+        """
+        Returns the object pooled under ``key``, calling ``factory`` to
+        create it if the pool does not hold one.
+        """
+        with self._lock:
+            found, value = self._lookup(key)
+            if found:
+                return value
+            key_lock = self._creating.setdefault(key, threading.Lock())
+        with key_lock:
+            with self._lock:
+                found, value = self._lookup(key)
+                if found:
+                    return value
+            log.debug("Creating pooled object for %s", key[:2])
+            try:
+                value = factory()
+            finally:
+                with self._lock:
+                    self._creating.pop(key, None)
+            with self._lock:
+                self._misses += 1
+                expiry = (time.monotonic() + self.ttl
+                          if self.ttl is not None else None)
+                self._entries[key] = (expiry, value)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self._evictions += 1
+            return value
+
+    def invalidate(self, *prefix):
+        """
+        Discards all pooled objects whose key starts with the given values,
+        e.g. ``invalidate('aws')`` discards all AWS objects. Discards all
+        objects if no values are given.
+
+        :rtype: ``int``
+        :return: The number of objects discarded.
+        """
+        with self._lock:
+            keys = [key for key in self._entries
+                    if key[:len(prefix)] == prefix]
+            for key in keys:
+                del self._entries[key]
+            return len(keys)
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def stats(self):
+        """
+        Returns the number of objects pooled, and the number of hits, misses
+        and evictions so far.
+
+        :rtype: ``dict``
+        """
+        with self._lock:
+            return {'size': len(self._entries), 'hits': self._hits,
+                    'misses': self._misses, 'evictions': self._evictions}
+
+
+# The pool shared by all providers in this process
+connection_pool = ConnectionPool()
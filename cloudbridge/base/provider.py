@@ -3,6 +3,11 @@ import ast
 import functools
 import logging
 import os
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from os.path import expanduser
 try:
     from configparser import ConfigParser
@@ -13,9 +18,18 @@ from pyeventsystem.middleware import SimpleMiddlewareManager
 
 import six
 
+from ..base.aio import AsyncCloudProvider
+from ..base.aio import DEFAULT_AIO_MAX_WORKERS
 from ..base.middleware import ExceptionWrappingMiddleware
+from ..base.middleware import MetricsMiddleware
+from ..base.middleware import RateLimitMiddleware
+from ..base.middleware import RetryMiddleware
+from ..base.middleware import bypass_cache
+from ..base.pool import connection_pool
+from ..base.pool import fingerprint
 from ..interfaces import CloudProvider
 from ..interfaces.exceptions import ProviderConnectionException
+from ..interfaces.exceptions import WaitStateException
 from ..interfaces.resources import Configuration
 
 log = logging.getLogger(__name__)
@@ -23,6 +37,8 @@ log = logging.getLogger(__name__)
 DEFAULT_RESULT_LIMIT = 50
 DEFAULT_WAIT_TIMEOUT = 600
 DEFAULT_WAIT_INTERVAL = 5
+DEFAULT_RETRY_MAX_ATTEMPTS = 1
+DEFAULT_FAN_OUT_MAX_WORKERS = 8
 
 # By default, use two locations for CloudBridge configuration
 CloudBridgeConfigPath = '/etc/cloudbridge.ini'
@@ -31,6 +47,24 @@ UserConfigPath = os.path.join(expanduser('~'), '.cloudbridge')
 CloudBridgeConfigLocations.append(UserConfigPath)
 
 
+def _config_file_mtime(path):
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return None
+
+
+def _read_config_files():
+    config_parser = ConfigParser()
+    config_parser.read(CloudBridgeConfigLocations)
+    return config_parser
+
+
+def _mark_fan_out_thread(fan_out_local):
+    # marks the threads of a provider's fan out executor, see fan_out()
+    fan_out_local.worker = True
+
+
 class BaseConfiguration(Configuration):
 
     def __init__(self, user_config):
@@ -86,12 +120,32 @@ class BaseConfiguration(Configuration):
 class BaseCloudProvider(CloudProvider):
     def __init__(self, config):
         self._config = BaseConfiguration(config)
-        self._config_parser = ConfigParser()
-        self._config_parser.read(CloudBridgeConfigLocations)
+        # The config files are parsed once, and reparsed if they change
+        self._config_parser = connection_pool.get(
+            ('cloudbridge', 'config_files',
+             tuple((path, _config_file_mtime(path))
+                   for path in CloudBridgeConfigLocations)),
+            _read_config_files)
+        self._pool_keys = set()
         self._middleware = SimpleMiddlewareManager()
+        self._metrics = MetricsMiddleware(
+            getattr(self, 'PROVIDER_ID', self.name))
+        self._retries = RetryMiddleware(
+            self._throttle_delay,
+            max_attempts=self._config.get('retry_max_attempts',
+                                          DEFAULT_RETRY_MAX_ATTEMPTS))
         self.add_required_middleware()
         self._region_name = None
         self._zone_name = None
+        self._aio = None
+        self._aio_lock = threading.Lock()
+        self._fan_out_executor = None
+        self._fan_out_lock = threading.Lock()
+        # marks the threads of the fan out executor, see fan_out()
+        self._fan_out_local = threading.local()
+        # class level poll schedule -> this provider's copy of it
+        self._poll_schedules = {}
+        self._poll_schedules_lock = threading.Lock()
 
     @property
     def region_name(self):
@@ -125,12 +179,151 @@ class BaseCloudProvider(CloudProvider):
     def middleware(self):
         return self._middleware
 
+    @property
+    def metrics(self):
+        return self._metrics
+
+    @property
+    def retries(self):
+        return self._retries
+
+    @property
+    def aio(self):
+        if not self._aio:
+            with self._aio_lock:
+                if not self._aio:
+                    aio = AsyncCloudProvider(
+                        self, max_workers=self.config.get(
+                            'aio_max_workers', DEFAULT_AIO_MAX_WORKERS))
+                    # Shut the executor down once this provider is discarded
+                    weakref.finalize(self, aio.executor.shutdown, False)
+                    self._aio = aio
+        return self._aio
+
+    @property
+    def fan_out_executor(self):
+        """
+        The thread pool that :meth:`fan_out` runs calls on, which is shared
+        by all services of this provider. Its size can be set through the
+        ``fan_out_max_workers`` config value.
+        """
+        if not self._fan_out_executor:
+            with self._fan_out_lock:
+                if not self._fan_out_executor:
+                    self._fan_out_executor = ThreadPoolExecutor(
+                        max_workers=self.config.get(
+                            'fan_out_max_workers',
+                            DEFAULT_FAN_OUT_MAX_WORKERS),
+                        thread_name_prefix="cloudbridge-fan-out",
+                        # not a bound method, so that the executor does
+                        # not keep this provider alive
+                        initializer=_mark_fan_out_thread,
+                        initargs=(self._fan_out_local,))
+                    weakref.finalize(self, self._fan_out_executor.shutdown,
+                                     False)
+        return self._fan_out_executor
+
+    def fan_out(self, event, func, items):
+        """
+        Calls ``func`` once for each of ``items`` concurrently, on the
+        provider's bounded :attr:`fan_out_executor`, and returns the results
+        in the order of ``items``. If any call fails, the exception of the
+        first failing item is raised.
+
+        Each call is recorded in ``provider.metrics`` under ``event``, e.g.
+        ``provider.compute.vm_types.describe_instance_types``.
+
+        Calls are made sequentially if there is only one item, or if
+        ``fan_out`` is called from one of the executor's own threads, so that
+        nested fan outs cannot exhaust the pool and deadlock.
+
+        :rtype: ``list``
+        :return: The result of each call, in the order of ``items``.
+        """
+        items = list(items)
+
+        def timed(item):
+            error = None
+            start = time.perf_counter()
+            try:
+                return func(item)
+            except Exception as e:
+                error = e
+                raise
+            finally:
+                self._metrics.record(event, time.perf_counter() - start,
+                                     error)
+
+        if (len(items) <= 1 or
+                getattr(self._fan_out_local, 'worker', False)):
+            return [timed(item) for item in items]
+        log.debug("Fanning out %s over %d calls", event, len(items))
+        return list(self.fan_out_executor.map(timed, items))
+
     def add_required_middleware(self):
         """
         Adds common middleware that is essential for cloudbridge to function.
         Any other extra middleware can be added through the provider factory.
         """
         self.middleware.add(ExceptionWrappingMiddleware())
+        self.middleware.add(self._metrics)
+        self.middleware.add(self._retries)
+        rate_limits = self.config.get('rate_limits')
+        if rate_limits:
+            self.middleware.add(RateLimitMiddleware(rate_limits))
+
+    def _get_pooled(self, name, factory, *key_values):
+        """
+        Returns an object, such as a session or connection, from the process
+        wide connection pool, creating it with ``factory`` if the pool does
+        not hold one. Providers with the same ``key_values``, which should
+        include all credentials and endpoint settings that the object
+        depends on, share the same object, across threads, so the object
+        must be thread-safe.
+        """
+        key = (getattr(self, 'PROVIDER_ID', self.name), name,
+               fingerprint(*key_values))
+        self._pool_keys.add(key)
+        return connection_pool.get(key, factory)
+
+    def invalidate_connections(self):
+        """
+        Discards the pooled objects used by this provider, so that they are
+        recreated on next use. Providers should override this method to
+        also reset their own references to those objects.
+        """
+        for key in self._pool_keys:
+            connection_pool.invalidate(*key)
+        self._pool_keys.clear()
+
+    def close(self):
+        with self._aio_lock:
+            aio, self._aio = self._aio, None
+        if aio:
+            aio.shutdown()
+        with self._fan_out_lock:
+            executor, self._fan_out_executor = self._fan_out_executor, None
+        if executor:
+            executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _throttle_delay(self, exception):
+        """
+        Classifies an exception raised by the provider's SDK. Providers
+        should override this method to recognize the errors their cloud
+        returns when requests are being throttled.
+
+        :rtype: ``float``
+        :return: ``None`` if the exception is not due to throttling, or
+                 else the number of seconds to wait before retrying, as
+                 hinted at by the cloud, which is zero if there is no hint.
+        """
+        return None
 
     def authenticate(self):
         """
@@ -183,6 +376,105 @@ class BaseCloudProvider(CloudProvider):
                  service_type)
         return False
 
+    def poll_schedule(self, schedule):
+        """
+        Returns this provider's own copy of a poll schedule, such as a
+        resource type's ``POLL_SCHEDULE``, so that the statistics of waits
+        by this provider are kept apart from those of other providers.
+
+        Example::
+
+            schedule = provider.poll_schedule(BaseVolume.POLL_SCHEDULE)
+            print(schedule.stats)
+
+        :rtype: :class:`.PollSchedule`
+        """
+        with self._poll_schedules_lock:
+            copy = self._poll_schedules.get(schedule)
+            if copy is None:
+                copy = schedule.copy()
+                self._poll_schedules[schedule] = copy
+            return copy
+
+    def wait_all(self, resources, target_states, terminal_states=None,
+                 timeout=None, interval=None):
+        return self._wait_for_resources(resources, target_states,
+                                        terminal_states, timeout, interval,
+                                        wait_for_all=True)
+
+    def wait_any(self, resources, target_states, terminal_states=None,
+                 timeout=None, interval=None):
+        return self._wait_for_resources(resources, target_states,
+                                        terminal_states, timeout, interval,
+                                        wait_for_all=False)
+
+    def _wait_for_resources(self, resources, target_states, terminal_states,
+                            timeout, interval, wait_for_all):
+        """
+        Polls the given resources till all (or any) of them reach a target
+        state, following the poll schedule of the first resource. Resources
+        are grouped by type and provider on each poll, so that each group can
+        be refreshed with a single bulk request.
+        """
+        if timeout is None:
+            timeout = self.config.default_wait_timeout
+
+        assert timeout >= 0
+        if interval is not None:
+            assert interval >= 0
+            assert timeout >= interval
+
+        # resources may be any iterable, such as a generator, but are
+        # counted and iterated over more than once
+        resources = list(resources)
+        pending = list(resources)
+        done = []
+        # pylint:disable=protected-access
+        wait = (pending[0]._get_poll_schedule(interval).start(timeout)
+                if pending else None)
+
+        while pending:
+            still_pending = []
+            for resource in pending:
+                if resource.state in target_states:
+                    done.append(resource)
+                elif resource.state in (terminal_states or []):
+                    wait.finish()
+                    raise WaitStateException(
+                        "Object: {0} is in state: {1} which is a terminal "
+                        "state and cannot be waited on.".format(
+                            resource, resource.state))
+                else:
+                    still_pending.append(resource)
+            pending = still_pending
+            if not pending or (done and not wait_for_all):
+                break
+            log.debug("%s of %s object(s) are yet to reach target state(s):"
+                      " %s. Waiting another %s seconds...", len(pending),
+                      len(resources), target_states, int(wait.remaining))
+            if not wait.sleep():
+                raise WaitStateException(
+                    "Waited too long for objects: {0} to reach a desired "
+                    "state: {1}".format(pending, target_states))
+            groups = OrderedDict()
+            for resource in pending:
+                # pylint:disable=protected-access
+                key = (type(resource), resource._provider)
+                groups.setdefault(key, []).append(resource)
+            with bypass_cache():
+                for (resource_type, _), group in groups.items():
+                    # pylint:disable=protected-access
+                    resource_type._refresh_all(group)
+
+        if wait:
+            wait.finish()
+        log.debug("Objects: %s successfully reached target state(s): %s",
+                  done, target_states)
+        # Resources may define an expensive __eq__, so compare identities
+        done_ids = set(id(resource) for resource in done)
+        return [resource for resource in resources
+                if id(resource) in done_ids]
+
     def _get_config_value(self, key, default_value=None):
         """
         A convenience method to extract a configuration value.
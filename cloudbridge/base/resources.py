@@ -1,13 +1,12 @@
 """
 Base implementation for data objects exposed through a provider or service
 """
-import inspect
-import itertools
 import logging
 import os
+import queue
 import re
 import shutil
-import time
+import threading
 import uuid
 
 import six
@@ -52,6 +51,9 @@ from cloudbridge.interfaces.resources import Volume
 from cloudbridge.interfaces.resources import VolumeState
 
 from . import helpers as cb_helpers
+from .middleware import bypass_cache
+from .polling import FixedPollSchedule
+from .polling import PollSchedule
 
 log = logging.getLogger(__name__)
 
@@ -67,6 +69,16 @@ class BaseCloudResource(CloudResource):
     # -with-dashes-allowed-in-between-but-not-at-the-start-or-e
     CB_NAME_PATTERN = re.compile(r"^[a-z][-a-z0-9]{1,61}[a-z0-9]$")
 
+    # Properties that are fetched from the cloud when read, and are omitted
+    # from cheap JSON representations.
+    JSON_REMOTE_FIELDS = ()
+    # Properties that are never included in JSON representations, such as
+    # sub-services.
+    JSON_EXCLUDED_FIELDS = ()
+
+    # JSON schema of each resource class, as computed by _json_schema()
+    _json_schemas = {}
+
     def __init__(self, provider):
         self.__provider = provider
 
@@ -110,10 +122,43 @@ class BaseCloudResource(CloudResource):
     def _provider(self):
         return self.__provider
 
-    def to_json(self):
-        # Get all attributes but filter methods and private/magic ones
-        attr = inspect.getmembers(self, lambda a: not(inspect.isroutine(a)))
-        js = {k: v for(k, v) in attr if not k.startswith('_')}
+    @classmethod
+    def _json_schema(cls):
+        """
+        Returns the names of the public properties of this class to include
+        in its JSON representation, as a tuple of local and remote fields.
+        The schema is computed from the class alone, once per class, so that
+        no property is read in the process.
+        """
+        schema = BaseCloudResource._json_schemas.get(cls)
+        if schema is None:
+            excluded = set(cls.JSON_EXCLUDED_FIELDS)
+            remote = set(cls.JSON_REMOTE_FIELDS)
+            fields = [name for name in dir(cls)
+                      if not name.startswith('_') and name not in excluded
+                      and isinstance(getattr(cls, name, None), property)]
+            schema = (tuple(f for f in fields if f not in remote),
+                      tuple(f for f in fields if f in remote))
+            BaseCloudResource._json_schemas[cls] = schema
+        return schema
+
+    @staticmethod
+    def _to_json_value(value):
+        # Refer to other resources by id
+        if isinstance(value, CloudResource):
+            return value.id
+        elif isinstance(value, (list, tuple)) and any(
+                isinstance(v, CloudResource) for v in value):
+            return [v.id if isinstance(v, CloudResource) else v
+                    for v in value]
+        return value
+
+    def to_json(self, cheap=False):
+        local_fields, remote_fields = self._json_schema()
+        js = {k: v for (k, v) in vars(self).items() if not k.startswith('_')}
+        for field in (local_fields if cheap
+                      else local_fields + remote_fields):
+            js[field] = self._to_json_value(getattr(self, field))
         return js
 
     def __repr__(self):
@@ -135,22 +180,40 @@ class BaseObjectLifeCycleMixin(ObjectLifeCycleMixin):
     method, since the desired ready states are object specific.
     """
 
-    def wait_for(self, target_states, terminal_states=None, timeout=None,
+    # The schedule used to poll for state changes when no explicit interval
+    # is given. Subclasses can override this to suit how quickly the
+    # resource typically changes state. Each provider polls, and keeps
+    # statistics, through its own copy of the schedule.
+    POLL_SCHEDULE = PollSchedule()
+
+    def _get_poll_schedule(self, interval=None):
+        """
+        Returns the poll schedule to use for a wait. An explicit interval,
+        or a default_wait_interval set in the provider config, results in
+        polls at that fixed interval.
+        """
+        if interval is None:
+            config = self._provider.config
+            if 'default_wait_interval' not in config:
+                return self._provider.poll_schedule(self.POLL_SCHEDULE)
+            interval = config.default_wait_interval
+        return FixedPollSchedule(interval)
 
+    def wait_for(self, target_states, terminal_states=None, timeout=None,
                  interval=None):
         if timeout is None:
             timeout = self._provider.config.default_wait_timeout
-        if interval is None:
-            interval = self._provider.config.default_wait_interval
 
         assert timeout >= 0
-        assert interval >= 0
-        assert timeout >= interval
+        if interval is not None:
+            assert interval >= 0
+            assert timeout >= interval
 
-        end_time = time.time() + timeout
+        wait = self._get_poll_schedule(interval).start(timeout)
 
         while self.state not in target_states:
             if self.state in (terminal_states or []):
+                wait.finish()
                 raise WaitStateException(
                     "Object: {0} is in state: {1} which is a terminal state"
                     " and cannot be waited on.".format(self, self.state))
@@ -160,19 +223,32 @@ class BaseObjectLifeCycleMixin(ObjectLifeCycleMixin):
                     " seconds to reach target state(s): %s...",
                     self,
                     self.state,
-                    int(end_time - time.time()),
+                    int(wait.remaining),
                     target_states)
-                time.sleep(interval)
-                if time.time() > end_time:
+                if not wait.sleep():
                     raise WaitStateException(
                         "Waited too long for object: {0} to reach a desired"
                         "state: {1}. It's still in state: {2}".format(
                             self, target_states, self.state))
-            self.refresh()
-        log.debug("Object: %s successfully reached target state: %s",
-                  self, self.state)
+            # Polls must see the latest state of the cloud, rather than
+            # results cached by a CachingMiddleware
+            with bypass_cache():
+                self.refresh()
+        wait.finish()
+        log.debug("Object: %s successfully reached target state: %s after "
+                  "%s poll(s)", self, self.state, wait.polls)
         return True
 
+    @classmethod
+    def _refresh_all(cls, resources):
+        """
+        Refreshes a list of objects of this type, all belonging to the same
+        provider. Subclasses can override this method to refresh all objects
+        with a single bulk request.
+        """
+        for resource in resources:
+            resource.refresh()
+
 
 class BaseResultList(ResultList):
 
@@ -221,6 +297,57 @@ class ServerPagedResultList(BaseResultList):
             "ServerPagedResultLists do not support the data property")
 
 
+class ClientPagedCursor(object):
+    """
+    An indexed view over a full result set, used to page through it on the
+    client side.
+
+    The first marker is looked up with a linear scan, so that a result set
+    which is only paged once, such as one listed afresh for a single
+    ``list(marker=...)`` call, is never indexed. Once a cursor is reused,
+    the position of each object is indexed by id, so that every subsequent
+    page can be located in constant time. Only the objects on a page are
+    copied. A cursor can be shared by any number of
+    :class:`ClientPagedResultList` pages over the same result set.
+    """
+
+    def __init__(self, objects):
+        self._objects = objects
+        self._positions = None
+        self._lookups = 0
+        # pages over the same result set may be used from several threads
+        self._lock = threading.Lock()
+
+    @property
+    def objects(self):
+        return self._objects
+
+    def __len__(self):
+        return len(self._objects)
+
+    def position_after(self, marker):
+        """
+        Returns the position of the object following the one with the given
+        id, or the end of the result set if no such object exists.
+        """
+        with self._lock:
+            self._lookups += 1
+            scan = self._positions is None and self._lookups == 1
+            if not scan and self._positions is None:
+                positions = {}
+                for position, obj in enumerate(self._objects):
+                    # the first object with a given id wins, as in a scan
+                    positions.setdefault(obj.id, position)
+                self._positions = positions
+        if scan:
+            for position, obj in enumerate(self._objects):
+                if obj.id == marker:
+                    return position + 1
+            return len(self._objects)
+        position = self._positions.get(marker)
+        return len(self._objects) if position is None else position + 1
+
+
 class ClientPagedResultList(BaseResultList):
     """
     This is a convenience class that extends the :class:`BaseResultList` class
@@ -229,20 +356,22 @@ class ClientPagedResultList(BaseResultList):
     This class can be used to wrap a full result list when an operation does
     not support server side paging. This class will then provide a paged view
     of the full result set entirely on the client side.
+
+    The full result set may also be passed in as a :class:`ClientPagedCursor`,
+    in which case its index is shared with other pages of the same set.
     """
 
     def __init__(self, provider, objects, limit=None, marker=None):
-        self._objects = objects
-        limit = limit or provider.config.default_result_limit
-        total_size = len(objects)
-        if marker:
-            from_marker = itertools.dropwhile(
-                lambda obj: not obj.id == marker, objects)
-            # skip one past the marker
-            next(from_marker, None)
-            objects = list(from_marker)
-        is_truncated = len(objects) > limit
-        results = list(itertools.islice(objects, limit))
+        self._provider = provider
+        self._cursor = (objects if isinstance(objects, ClientPagedCursor)
+                        else ClientPagedCursor(objects))
+        self._limit = limit or provider.config.default_result_limit
+        total_size = len(self._cursor)
+        start = self._cursor.position_after(marker) if marker else 0
+        end = start + self._limit
+        # copies the objects on this page only
+        results = list(self._cursor.objects[start:end])
+        is_truncated = end < total_size
         super(ClientPagedResultList, self).__init__(
             is_truncated,
             results[-1].id if is_truncated else None,
@@ -255,7 +384,26 @@ class ClientPagedResultList(BaseResultList):
 
     @property
     def data(self):
-        return self._objects
+        return self._cursor.objects
+
+    @property
+    def cursor(self):
+        """
+        The :class:`ClientPagedCursor` over the full result set.
+        """
+        return self._cursor
+
+    def next_page(self):
+        """
+        Returns the page following this one, taken from the same result set
+        without listing it again, or ``None`` if this is the last page.
+
+        :rtype: :class:`ClientPagedResultList`
+        """
+        if not self.is_truncated:
+            return None
+        return ClientPagedResultList(self._provider, self._cursor,
+                                     limit=self._limit, marker=self.marker)
 
 
 class BasePageableObjectMixin(PageableObjectMixin):
@@ -268,7 +416,23 @@ class BasePageableObjectMixin(PageableObjectMixin):
         for result in self.iter():
             yield result
 
-    def iter(self, **kwargs):
+    def iter(self, prefetch=0, **kwargs):
+        """
+        Iterates through all objects, paging them in as iteration progresses.
+
+        :type prefetch: ``int``
+        :param prefetch: If greater than zero, pages are fetched on a
+                         background thread, so that network latency
+                         overlaps with the processing of earlier pages.
+                         At most ``prefetch`` pages, including the one
+                         being consumed, are held at a time. Only useful
+                         for services which support server side paging.
+        """
+        if prefetch > 0:
+            return self._iter_prefetch(prefetch, **kwargs)
+        return self._iter(**kwargs)
+
+    def _iter(self, **kwargs):
         result_list = self.list(**kwargs)
         if result_list.supports_server_paging:
             for result in result_list:
@@ -281,6 +445,57 @@ class BasePageableObjectMixin(PageableObjectMixin):
             for result in result_list.data:
                 yield result
 
+    def _iter_prefetch(self, prefetch, **kwargs):
+        pages = queue.Queue()
+        # limits the number of pages fetched but not yet consumed
+        free_slots = threading.Semaphore(prefetch)
+        cancelled = threading.Event()
+
+        def acquire_slot():
+            # Block while enough pages are buffered, but give up as soon as
+            # the consumer has gone away
+            while not cancelled.is_set():
+                if free_slots.acquire(timeout=0.1):
+                    return True
+            return False
+
+        def fetch_pages():
+            try:
+                marker = None
+                while acquire_slot():
+                    result_list = (self.list(marker=marker, **kwargs)
+                                   if marker else self.list(**kwargs))
+                    pages.put((result_list, None))
+                    if not (result_list.supports_server_paging and
+                            result_list.is_truncated):
+                        break
+                    marker = result_list.marker
+            except Exception as e:
+                pages.put((None, e))
+            finally:
+                pages.put((None, None))
+
+        fetcher = threading.Thread(target=fetch_pages,
+                                   name="cloudbridge-page-prefetch")
+        fetcher.daemon = True
+        fetcher.start()
+        try:
+            while True:
+                result_list, error = pages.get()
+                if error:
+                    raise error
+                if result_list is None:
+                    return
+                for result in (result_list if
+                               result_list.supports_server_paging else
+                               result_list.data):
+                    yield result
+                # The page counts against the limit until it has been
+                # consumed, not just taken off the queue
+                free_slots.release()
+        finally:
+            cancelled.set()
+
 
 class BaseVMType(BaseCloudResource, VMType):
 
@@ -300,6 +515,8 @@ class BaseVMType(BaseCloudResource, VMType):
 
 class BaseInstance(BaseCloudResource, BaseObjectLifeCycleMixin, Instance):
 
+    JSON_REMOTE_FIELDS = ('vm_type', 'vm_firewalls')
+
     def __init__(self, provider):
         super(BaseInstance, self).__init__(provider)
 
@@ -403,6 +620,9 @@ class BaseLaunchConfig(LaunchConfig):
 class BaseMachineImage(
         BaseCloudResource, BaseObjectLifeCycleMixin, MachineImage):
 
+    # Images typically take minutes to become available
+    POLL_SCHEDULE = PollSchedule(initial_interval=5, max_interval=60)
+
     def __init__(self, provider):
         super(BaseMachineImage, self).__init__(provider)
 
@@ -446,6 +666,8 @@ class BaseAttachmentInfo(AttachmentInfo):
 
 class BaseVolume(BaseCloudResource, BaseObjectLifeCycleMixin, Volume):
 
+    JSON_REMOTE_FIELDS = ('source',)
+
     def __init__(self, provider):
         super(BaseVolume, self).__init__(provider)
 
@@ -474,6 +696,9 @@ class BaseVolume(BaseCloudResource, BaseObjectLifeCycleMixin, Volume):
 
 class BaseSnapshot(BaseCloudResource, BaseObjectLifeCycleMixin, Snapshot):
 
+    # Snapshots typically take minutes to complete
+    POLL_SCHEDULE = PollSchedule(initial_interval=5, max_interval=60)
+
     def __init__(self, provider):
         super(BaseSnapshot, self).__init__(provider)
 
@@ -542,6 +767,8 @@ class BaseKeyPair(BaseCloudResource, KeyPair):
 
 class BaseVMFirewall(BaseCloudResource, VMFirewall):
 
+    JSON_EXCLUDED_FIELDS = ('rules',)
+
     def __init__(self, provider, vm_firewall):
         super(BaseVMFirewall, self).__init__(provider)
         self._vm_firewall = vm_firewall
@@ -588,9 +815,18 @@ class BaseVMFirewall(BaseCloudResource, VMFirewall):
         """
         return self._provider.security.vm_firewalls.delete(self)
 
+    def to_json(self, cheap=False):
+        js = super(BaseVMFirewall, self).to_json(cheap)
+        # Rules are listed from the cloud, so are omitted when cheap
+        if not cheap:
+            js['rules'] = [r.to_json(cheap) for r in self.rules]
+        return js
+
 
 class BaseVMFirewallRule(BaseCloudResource, VMFirewallRule):
 
+    JSON_EXCLUDED_FIELDS = ('src_dest_fw',)
+
     def __init__(self, parent_fw, rule):
         # pylint:disable=protected-access
         super(BaseVMFirewallRule, self).__init__(
@@ -637,11 +873,9 @@ class BaseVMFirewallRule(BaseCloudResource, VMFirewallRule):
             self.direction, self.protocol, self.from_port, self.to_port,
             self.cidr, self.src_dest_fw_id))
 
-    def to_json(self):
-        attr = inspect.getmembers(self, lambda a: not (inspect.isroutine(a)))
-        js = {k: v for (k, v) in attr if not k.startswith('_')}
+    def to_json(self, cheap=False):
+        js = super(BaseVMFirewallRule, self).to_json(cheap)
         js['src_dest_fw'] = self.src_dest_fw_id
-        js['firewall'] = self.firewall.id
         return js
 
     def delete(self):
@@ -662,6 +896,8 @@ class BasePlacementZone(BaseCloudResource, PlacementZone):
 
 class BaseRegion(BaseCloudResource, Region):
 
+    JSON_REMOTE_FIELDS = ('zones', 'default_zone')
+
     def __init__(self, provider):
         super(BaseRegion, self).__init__(provider)
 
@@ -671,12 +907,6 @@ class BaseRegion(BaseCloudResource, Region):
                 self._provider == other._provider and
                 self.id == other.id)
 
-    def to_json(self):
-        attr = inspect.getmembers(self, lambda a: not(inspect.isroutine(a)))
-        js = {k: v for(k, v) in attr if not k.startswith('_')}
-        js['zones'] = [z.id for z in self.zones]
-        return js
-
     @property
     def default_zone(self):
         return next(iter(self.zones))
@@ -724,6 +954,8 @@ class BaseBucketObject(BaseCloudResource, BucketObject):
 
 class BaseBucket(BaseCloudResource, Bucket):
 
+    JSON_EXCLUDED_FIELDS = ('objects',)
+
     def __init__(self, provider):
         super(BaseBucket, self).__init__(provider)
 
@@ -746,6 +978,9 @@ class BaseBucket(BaseCloudResource, Bucket):
 
 class BaseNetwork(BaseCloudResource, BaseObjectLifeCycleMixin, Network):
 
+    JSON_REMOTE_FIELDS = ('subnets',)
+    JSON_EXCLUDED_FIELDS = ('gateways',)
+
     CB_DEFAULT_NETWORK_LABEL = os.environ.get('CB_DEFAULT_NETWORK_LABEL',
                                               'cloudbridge-net')
     CB_DEFAULT_IPV4RANGE = os.environ.get('CB_DEFAULT_IPV4RANGE',
@@ -786,6 +1021,8 @@ class BaseNetwork(BaseCloudResource, BaseObjectLifeCycleMixin, Network):
 
 class BaseSubnet(BaseCloudResource, BaseObjectLifeCycleMixin, Subnet):
 
+    JSON_REMOTE_FIELDS = ('network', 'zone')
+
     CB_DEFAULT_SUBNET_LABEL = os.environ.get('CB_DEFAULT_SUBNET_LABEL',
                                              'cloudbridge-subnet')
     CB_DEFAULT_SUBNET_IPV4RANGE = os.environ.get('CB_DEFAULT_SUBNET_IPV4RANGE',
@@ -851,6 +1088,8 @@ class BaseFloatingIP(BaseCloudResource, BaseObjectLifeCycleMixin, FloatingIP):
 
 class BaseRouter(BaseCloudResource, Router):
 
+    JSON_REMOTE_FIELDS = ('subnets',)
+
     CB_DEFAULT_ROUTER_LABEL = os.environ.get('CB_DEFAULT_ROUTER_LABEL',
                                              'cloudbridge-router')
 
@@ -870,6 +1109,8 @@ class BaseRouter(BaseCloudResource, Router):
 class BaseInternetGateway(BaseCloudResource, BaseObjectLifeCycleMixin,
                           InternetGateway):
 
+    JSON_EXCLUDED_FIELDS = ('floating_ips',)
+
     CB_DEFAULT_INET_GATEWAY_NAME = cb_helpers.get_env(
         'CB_DEFAULT_INET_GATEWAY_NAME', 'cloudbridge-inetgateway')
 
@@ -896,6 +1137,8 @@ class BaseInternetGateway(BaseCloudResource, BaseObjectLifeCycleMixin,
 
 class BaseDnsZone(BaseCloudResource, DnsZone):
 
+    JSON_EXCLUDED_FIELDS = ('records',)
+
     CB_NAME_PATTERN = re.compile(
         r"^(?:[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?\.)+[a-z0-9]"
         r"[a-z0-9-]{0,61}[a-z0-9]\.?$")
@@ -2,6 +2,7 @@
 Base implementation for services available through a provider
 """
 import logging
+from abc import abstractmethod
 
 from cloudbridge.interfaces.exceptions import InvalidParamException
 from cloudbridge.interfaces.resources import DnsRecordType
@@ -32,6 +33,9 @@ from cloudbridge.interfaces.services import VMTypeService
 from cloudbridge.interfaces.services import VolumeService
 
 from . import helpers as cb_helpers
+from .catalog import DEFAULT_CATALOG_TTL
+from .catalog import VMTypeCatalog
+from .catalog import VMTypeIndex
 from .middleware import dispatch
 from .resources import BaseNetwork
 from .resources import BasePageableObjectMixin
@@ -214,12 +218,80 @@ class BaseVMTypeService(
     def __init__(self, provider):
         super(BaseVMTypeService, self).__init__(provider)
         self._service_event_pattern += ".compute.vm_types"
+        self._catalog = None
+        self._index = None
+
+    @property
+    def catalog(self):
+        if not self._catalog:
+            scope = tuple(self._catalog_scope())
+            # Catalogs are only saved to disk if a path is configured
+            path = self.provider.config.get('vm_type_catalog_path')
+            ttl = self.provider.config.get('vm_type_catalog_ttl',
+                                           DEFAULT_CATALOG_TTL)
+            # Providers with the same scope share the catalog in memory.
+            # Each of them fetches it through its own connections, by
+            # passing _fetch_vm_types to the catalog.
+            # pylint:disable=protected-access
+            self._catalog = self.provider._get_pooled(
+                'vm_type_catalog',
+                lambda: VMTypeCatalog(
+                    (getattr(self.provider, 'PROVIDER_ID',
+                             self.provider.name),) + scope,
+                    path=path, ttl=ttl),
+                scope, path, ttl)
+        return self._catalog
+
+    def _catalog_records(self):
+        """
+        Returns the raw records of the VM type catalog, fetching them through
+        this provider if the catalog has not been fetched yet.
+        """
+        return self.catalog.get(self._fetch_vm_types)
+
+    @property
+    def index(self):
+        """
+        The :class:`.VMTypeIndex` over the current version of the catalog,
+        which is rebuilt whenever the catalog changes.
+        """
+        catalog = self.catalog
+        records = self._catalog_records()
+        index = self._index
+        if index is None or index.version != catalog.version:
+            index = VMTypeIndex(
+                [self._to_vm_type(record) for record in records],
+                version=catalog.version)
+            self._index = index
+        return index
+
+    def _catalog_scope(self):
+        """
+        Returns the values that the VM types available to this provider
+        depend on. Providers whose VM types also depend on, for example, the
+        account or endpoint should add those values.
+        """
+        return (self.provider.region_name, self.provider.zone_name)
+
+    @abstractmethod
+    def _fetch_vm_types(self):
+        """
+        Fetches the VM types available to this provider from the cloud, as
+        a ``list`` of JSON serializable records for the catalog.
+        """
+        pass
+
+    @abstractmethod
+    def _to_vm_type(self, record):
+        """
+        Wraps a catalog record in the provider's VMType class.
+        """
+        pass
 
     @dispatch(event="provider.compute.vm_types.get",
               priority=BaseCloudService.STANDARD_EVENT_PRIORITY)
     def get(self, vm_type_id):
-        vm_type = (t for t in self if t.id == vm_type_id)
-        return next(vm_type, None)
+        return self.index.get(vm_type_id)
 
     @dispatch(event="provider.compute.vm_types.find",
               priority=BaseCloudService.STANDARD_EVENT_PRIORITY)
@@ -229,6 +301,23 @@ class BaseVMTypeService(
         matches = cb_helpers.generic_find(filters, kwargs, obj_list)
         return ClientPagedResultList(self._provider, list(matches))
 
+    @dispatch(event="provider.compute.vm_types.list",
+              priority=BaseCloudService.STANDARD_EVENT_PRIORITY)
+    def list(self, limit=None, marker=None):
+        # pages share the index's cursor, so markers are only indexed once
+        return ClientPagedResultList(self.provider, self.index.cursor,
+                                     limit=limit, marker=marker)
+
+    @dispatch(event="provider.compute.vm_types.select",
+              priority=BaseCloudService.STANDARD_EVENT_PRIORITY)
+    def select(self, min_vcpus=None, min_ram=None, min_ephemeral=None,
+               family=None, limit=None, marker=None, **bounds):
+        vm_types = self.index.select(
+            family=family, min_vcpus=min_vcpus, min_ram=min_ram,
+            min_ephemeral=min_ephemeral, **bounds)
+        return ClientPagedResultList(self.provider, vm_types,
+                                     limit=limit, marker=marker)
+
 
 class BaseRegionService(
         BasePageableObjectMixin, RegionService, BaseCloudService):
@@ -3,6 +3,10 @@ import inspect
 import logging
 import pkgutil
 from collections import defaultdict
+try:
+    from importlib import metadata as importlib_metadata
+except ImportError:  # Python < 3.8
+    importlib_metadata = None
 
 from cloudbridge import providers
 from cloudbridge.interfaces import CloudProvider
@@ -20,16 +24,118 @@ class ProviderList(object):
     MOCK = 'mock'
 
 
+# Locations of the providers included with cloudbridge, as
+# ``module:class`` paths, so that a provider can be created without
+# importing the SDKs of all other providers.
+BUILTIN_PROVIDERS = {
+    ProviderList.AWS: 'cloudbridge.providers.aws:AWSCloudProvider',
+    ProviderList.AZURE: 'cloudbridge.providers.azure:AzureCloudProvider',
+    ProviderList.GCP: 'cloudbridge.providers.gcp:GCPCloudProvider',
+    ProviderList.OPENSTACK:
+        'cloudbridge.providers.openstack:OpenStackCloudProvider',
+    ProviderList.MOCK: 'cloudbridge.providers.mock:MockAWSCloudProvider'
+}
+
+# Entry point group through which other packages can register providers,
+# with the PROVIDER_ID as the entry point name. For example, in setup.py:
+#     entry_points={'cloudbridge.providers': [
+#         'mycloud = mypackage.provider:MyCloudProvider']}
+PROVIDER_ENTRY_POINT_GROUP = 'cloudbridge.providers'
+
+
+def _provider_entry_points():
+    """
+    Returns the provider entry points of all installed packages, keyed by
+    entry point name.
+    """
+    if importlib_metadata is None:
+        try:
+            import pkg_resources
+        except ImportError:
+            return {}
+        return {ep.name: ep for ep in
+                pkg_resources.iter_entry_points(PROVIDER_ENTRY_POINT_GROUP)}
+    entry_points = importlib_metadata.entry_points()
+    if hasattr(entry_points, 'select'):
+        entry_points = entry_points.select(group=PROVIDER_ENTRY_POINT_GROUP)
+    else:  # Python < 3.10
+        entry_points = entry_points.get(PROVIDER_ENTRY_POINT_GROUP, [])
+    return {ep.name: ep for ep in entry_points}
+
+
 class CloudProviderFactory(object):
 
     """
     Get info and handle on the available cloud provider implementations.
+
+    Providers are imported on demand, so that creating a provider only
+    imports the modules, and cloud SDKs, of that provider. Providers are
+    located through :data:`BUILTIN_PROVIDERS`, paths registered with
+    :meth:`register_provider_path`, and entry points in the
+    ``cloudbridge.providers`` group of installed packages.
     """
 
     def __init__(self):
         self.provider_list = defaultdict(dict)
+        # provider id -> 'module:class' path of providers not yet imported
+        self.provider_paths = dict(BUILTIN_PROVIDERS)
+        self._entry_points = None
         log.debug("Providers List: %s", self.provider_list)
 
+    def register_provider_path(self, provider_id, path):
+        """
+        Registers the location of a provider class, as a ``module:class``
+        path, without importing it. The provider is imported the first time
+        it is requested.
+
+        :type  provider_id: ``str``
+        :param provider_id: The PROVIDER_ID of the provider, such as 'aws'.
+
+        :type  path: ``str``
+        :param path: The location of the provider class, such as
+                     ``cloudbridge.providers.aws:AWSCloudProvider``.
+        """
+        self.provider_paths[provider_id] = path
+
+    @property
+    def entry_points(self):
+        """
+        Provider entry points of installed packages, keyed by provider id.
+        These are looked up once, the first time they are needed.
+        """
+        if self._entry_points is None:
+            try:
+                self._entry_points = _provider_entry_points()
+            except Exception as e:
+                log.warning("Could not read provider entry points: %s", e)
+                self._entry_points = {}
+        return self._entry_points
+
+    def _load_provider(self, provider_id):
+        """
+        Imports and registers the provider with the given id from its
+        registered path, or else its entry point. Returns the provider class
+        or ``None`` if there is no such provider, or it cannot be imported.
+        """
+        path = self.provider_paths.get(provider_id)
+        try:
+            if path:
+                module_name, _, class_name = path.partition(':')
+                log.debug("Importing provider %s from %s", provider_id, path)
+                cls = getattr(importlib.import_module(module_name),
+                              class_name)
+            elif provider_id in self.entry_points:
+                log.debug("Loading provider %s from entry point",
+                          provider_id)
+                cls = self.entry_points[provider_id].load()
+            else:
+                return None
+        except Exception as e:
+            log.debug("Could not import provider %s: %s", provider_id, e)
+            return None
+        self.register_provider_class(cls)
+        return self.provider_list.get(provider_id, {}).get('class')
+
     def register_provider_class(self, cls):
         """
         Registers a provider class with the factory. The class must
@@ -49,7 +155,8 @@ class CloudProviderFactory(object):
         if isinstance(cls, type) and issubclass(cls, CloudProvider):
             if hasattr(cls, "PROVIDER_ID"):
                 provider_id = getattr(cls, "PROVIDER_ID")
-                if self.provider_list.get(provider_id, {}).get('class'):
+                existing = self.provider_list.get(provider_id, {}).get('class')
+                if existing and existing is not cls:
                     log.warning("Provider with id: %s is already "
                                 "registered. Overriding with class: %s",
                                 provider_id, cls)
@@ -63,10 +170,15 @@ class CloudProviderFactory(object):
 
     def discover_providers(self):
         """
-        Discover all available providers within the
-        ``cloudbridge.providers`` package.
-        Note that this methods does not guard against a failed import.
+        Discover all available providers, which imports every registered
+        provider, provider entry point and module within the
+        ``cloudbridge.providers`` package. Providers which cannot be
+        imported are skipped.
         """
+        for provider_id in (set(self.provider_paths) |
+                            set(self.entry_points)):
+            if not self.provider_list.get(provider_id, {}).get('class'):
+                self._load_provider(provider_id)
         for _, modname, _ in pkgutil.iter_modules(providers.__path__):
             log.debug("Importing provider: %s", modname)
             try:
@@ -92,8 +204,8 @@ class CloudProviderFactory(object):
         """
         Get a list of available providers.
 
-        It uses a simple automatic discovery system by iterating through all
-        submodules in cloudbridge.providers.
+        This imports all available providers. Use
+        :meth:`get_provider_class` to import a single provider instead.
 
         :rtype: dict
         :return: A dict of available providers and their implementations in the
@@ -147,10 +259,11 @@ class CloudProviderFactory(object):
                  if the provider was not found.
         """
         log.debug("Returning a class for the %s provider", name)
-        impl = self.list_providers().get(name)
-        if impl:
+        cls = (self.provider_list.get(name, {}).get('class') or
+               self._load_provider(name))
+        if cls:
             log.debug("Returning provider class for %s", name)
-            return impl["class"]
+            return cls
         else:
             log.debug("Provider with the name: %s not found", name)
             return None
@@ -71,6 +71,72 @@ class CloudProvider(object):
         """
         pass
 
+    @abstractproperty
+    def metrics(self):
+        """
+        Returns the metrics middleware associated with this provider, which
+        records call counts, errors and latencies for every operation
+        invoked through the provider.
+
+        Example:
+
+        .. code-block:: python
+
+            provider.compute.instances.list()
+            stats = provider.metrics.snapshot()
+            print(stats['provider.compute.instances.list']['count'])
+            # Prometheus text exposition format
+            print(provider.metrics.to_prometheus())
+
+        :rtype: :class:`.MetricsMiddleware`
+        :return:  The metrics recorded for this provider.
+        """
+        pass
+
+    @abstractproperty
+    def retries(self):
+        """
+        Returns the retry middleware associated with this provider, which
+        retries ``get``, ``list``, ``find`` and ``select`` calls that the
+        cloud rejected due to throttling. Retries are off by default, as
+        the provider SDKs already retry throttled requests, and are enabled
+        by setting the ``retry_max_attempts`` config value above 1.
+
+        Example:
+
+        .. code-block:: python
+
+            print(provider.retries.stats['retries'])
+
+        :rtype: :class:`.RetryMiddleware`
+        :return:  The retry middleware for this provider.
+        """
+        pass
+
+    @abstractproperty
+    def aio(self):
+        """
+        Returns an asyncio facade over this provider's services. The facade
+        mirrors the ``compute``, ``networking``, ``security``, ``storage`` and
+        ``dns`` services, with each service method exposed as a coroutine
+        that runs on a bounded thread pool. The pool size can be set through
+        the ``aio_max_workers`` config value.
+
+        Example:
+
+        .. code-block:: python
+
+            instance = await provider.aio.compute.instances.get(inst_id)
+            volumes = await asyncio.gather(
+                *[provider.aio.storage.volumes.get(vid) for vid in vol_ids])
+            async for bucket in provider.aio.storage.buckets:
+                print(bucket.name)
+
+        :rtype: :class:`.AsyncCloudProvider`
+        :return:  An asyncio facade over this provider.
+        """
+        pass
+
     @abstractmethod
     def clone(self, zone=None):
         """
@@ -100,6 +166,42 @@ class CloudProvider(object):
         """
         pass
 
+    @abstractmethod
+    def invalidate_connections(self):
+        """
+        Sessions, connections and credentials are shared by all providers in
+        a process that have the same configuration, including clones, so
+        that creating a provider is cheap. This method discards those used
+        by this provider, so that they are recreated on next use, for
+        example after credentials have been rotated.
+
+        Example:
+
+        .. code-block:: python
+
+            provider.invalidate_connections()
+            provider.authenticate()
+        """
+        pass
+
+    @abstractmethod
+    def close(self):
+        """
+        Shuts down the thread pools used by this provider, such as those
+        behind :attr:`aio` and :meth:`fan_out`. They are otherwise shut down
+        once the provider is garbage collected. Providers can also be used
+        as context managers, which close them on exit.
+
+        Example:
+
+        .. code-block:: python
+
+            with CloudProviderFactory().create_provider(
+                    ProviderList.AWS, config) as provider:
+                print(list(provider.compute.instances))
+        """
+        pass
+
     @abstractmethod
     def authenticate(self):
         """
@@ -148,6 +250,70 @@ class CloudProvider(object):
         """
         pass
 
+    @abstractmethod
+    def wait_all(self, resources, target_states, terminal_states=None,
+                 timeout=None, interval=None):
+        """
+        Wait for all of the given objects to reach one of the desired target
+        states.
+
+        This is equivalent to calling ``wait_for`` on each object, except
+        that objects of the same type are refreshed together, using a single
+        bulk request per poll where the provider supports it.
+
+        Example:
+
+        .. code-block:: python
+
+            instances = [provider.compute.instances.create(...)
+                         for _ in range(10)]
+            provider.wait_all(instances, [InstanceState.RUNNING],
+                              terminal_states=[InstanceState.ERROR])
+
+        :type resources: ``list`` of :class:`.ObjectLifeCycleMixin`
+        :param resources: The objects to wait on.
+
+        :type target_states: ``list`` of states
+        :param target_states: The list of target states to wait for.
+
+        :type terminal_states: ``list`` of states
+        :param terminal_states: A list of terminal states after which an
+                                object will not transition into a target state.
+                                A WaitStateException will be raised if any
+                                object transitions into a terminal state.
+
+        :type timeout: ``int``
+        :param timeout: The maximum length of time (in seconds) to wait for
+                        all objects to reach a target state. If no timeout is
+                        specified, the global default_wait_timeout defined in
+                        the provider config will apply.
+
+        :type interval: ``int``
+        :param interval: How frequently to poll the objects' states (in
+                         seconds). If no interval is specified, the global
+                         default_wait_interval defined in the provider config
+                         will apply.
+
+        :rtype: ``list`` of :class:`.ObjectLifeCycleMixin`
+        :return: The objects that reached a target state, in the order in
+                 which they were supplied. A ``WaitStateException`` will be
+                 raised if the objects do not reach a target state in time.
+        """
+        pass
+
+    @abstractmethod
+    def wait_any(self, resources, target_states, terminal_states=None,
+                 timeout=None, interval=None):
+        """
+        Wait for at least one of the given objects to reach one of the desired
+        target states. Accepts the same parameters as :meth:`wait_all`.
+
+        :rtype: ``list`` of :class:`.ObjectLifeCycleMixin`
+        :return: The objects that have reached a target state, which will
+                 contain at least one object.
+        """
+        pass
+
     @abstractproperty
     def region_name(self):
         """
@@ -105,9 +105,20 @@ class CloudResource(object):
         pass
 
     @abstractmethod
-    def to_json(self):
+    def to_json(self, cheap=False):
         """
         Returns a JSON representation of the CloudResource object.
+
+        Related resources are represented by their ids.
+
+        :type cheap: ``bool``
+        :param cheap: If ``True``, only fields which are available locally
+                      are included, and fields which would require further
+                      requests to the cloud provider, such as an instance's
+                      ``vm_type``, are omitted.
+
+        :rtype: ``dict``
+        :return: A JSON compatible ``dict`` of the resource's fields.
         """
         pass
 
@@ -1614,6 +1614,33 @@ class VMFirewallRuleService(CloudService):
 class VMTypeService(PageableObjectMixin, CloudService):
     __metaclass__ = ABCMeta
 
+    @abstractproperty
+    def catalog(self):
+        """
+        Provides access to the cached catalog of VM types that ``list`` and
+        ``find`` are served from. The catalog is kept in memory, and shared
+        by all providers with the same region and zone, or the equivalent
+        scope of the cloud. It is only saved to disk if the
+        ``vm_type_catalog_path`` config value is set, in which case a new
+        process can start without fetching it again. It is refreshed in the
+        background once it is older than the ``vm_type_catalog_ttl`` config
+        value.
+
+        Example:
+
+        .. code-block:: python
+
+            # discard the catalog, e.g. after new VM types are announced,
+            # so that it is fetched again on next use
+            provider.compute.vm_types.catalog.invalidate()
+            vm_types = provider.compute.vm_types.list()
+            print(provider.compute.vm_types.catalog.version)
+
+        :rtype: :class:`.VMTypeCatalog`
+        :return: The VM type catalog of this provider
+        """
+        pass
+
     @abstractmethod
     def get(self, vm_type_id):
         """
@@ -1654,6 +1681,46 @@ class VMTypeService(PageableObjectMixin, CloudService):
         """
         pass
 
+    @abstractmethod
+    def select(self, min_vcpus=None, min_ram=None, min_ephemeral=None,
+               family=None, limit=None, marker=None, **kwargs):
+        """
+        Returns the VM types that satisfy the given requirements, best fit
+        first, i.e. ordered by vcpus, ram, root disk size and ephemeral disk
+        size, smallest first. Queries are answered from indexes over the
+        catalog, without contacting the cloud.
+
+        Besides the arguments below, ``min_`` and ``max_`` bounds may be
+        given for ``vcpus``, ``ram``, ``root_disk`` and ``ephemeral``, e.g.
+        ``max_vcpus=8``. VM types without a value for a bounded property
+        never match.
+
+        Example:
+
+        .. code-block:: python
+
+            # the smallest VM type with 2 vcpus and 4GB of ram
+            vm_type = provider.compute.vm_types.select(
+                min_vcpus=2, min_ram=4, limit=1)[0]
+
+        :type min_vcpus: ``int``
+        :param min_vcpus: The minimum number of vcpus.
+
+        :type min_ram: ``float``
+        :param min_ram: The minimum amount of ram, in GB.
+
+        :type min_ephemeral: ``int``
+        :param min_ephemeral: The minimum total size of the ephemeral disks,
+                              in GB.
+
+        :type family: ``str``
+        :param family: Only return VM types of this family.
+
+        :rtype: ``list`` of :class:`.VMType`
+        :return: The matching VM types, best fit first
+        """
+        pass
+
 
 class RegionService(PageableObjectMixin, CloudService):
 
@@ -50,6 +50,90 @@ def find_tag_value(tags, key):
     return None
 
 
+def is_filter_translatable(pattern):
+    """
+    Checks whether a ``find()`` glob pattern can be passed as is to a
+    describe filter. Filter values support the ``*`` and ``?`` wildcards
+    with the same meaning as a glob, but treat character sets literally and
+    backslashes as escapes.
+    """
+    return isinstance(pattern, str) and not any(
+        char in pattern for char in '[\\')
+
+
+# EC2 accepts at most 200 values for a single describe filter
+EC2_FILTER_VALUE_LIMIT = 200
+
+
+# Error codes returned by AWS APIs when requests are being throttled
+AWS_THROTTLING_ERROR_CODES = frozenset([
+    'Throttling', 'ThrottlingException', 'ThrottledException',
+    'RequestThrottled', 'RequestThrottledException', 'RequestLimitExceeded',
+    'TooManyRequestsException', 'SlowDown', 'BandwidthLimitExceeded',
+    'EC2ThrottledException', 'PriorRequestNotComplete'])
+
+
+def throttle_delay(exception):
+    """
+    Returns zero if a botocore exception signals that requests are being
+    throttled, and ``None`` otherwise. AWS does not hint at how long to
+    wait before retrying.
+    """
+    if isinstance(exception, ClientError):
+        response = exception.response
+        if (response.get('Error', {}).get('Code')
+                in AWS_THROTTLING_ERROR_CODES or
+                response.get('ResponseMetadata', {})
+                .get('HTTPStatusCode') == 429):
+            return 0
+    return None
+
+
+def refresh_all(resources, boto_collection, id_filter, boto_attr):
+    """
+    Refreshes a list of CloudBridge resources that wrap boto resources of
+    the same type, by fetching their latest state with one describe request
+    per chunk of ids, instead of reloading each boto resource individually.
+    Resources that are no longer returned by the cloud are marked as being
+    in an unknown state.
+
+    :type resources: list of CloudBridge resources
+    :param resources: The resources to refresh
+
+    :type boto_collection: ``boto3.resources.collection.CollectionManager``
+    :param boto_collection: The boto collection to describe the resources
+                            with, e.g. ``ec2_conn.instances``
+
+    :type id_filter: ``str``
+    :param id_filter: Name of the describe filter matching resource ids,
+                      e.g. ``instance-id``
+
+    :type boto_attr: ``str``
+    :param boto_attr: Name of the attribute holding the wrapped boto
+                      resource, e.g. ``_ec2_instance``
+    """
+    by_id = {resource.id: resource for resource in resources}
+    ids = list(by_id)
+    refreshed = set()
+    for i in range(0, len(ids), EC2_FILTER_VALUE_LIMIT):
+        chunk = ids[i:i + EC2_FILTER_VALUE_LIMIT]
+        log.debug("Refreshing %s resources with filter %s", len(chunk),
+                  id_filter)
+        for boto_obj in boto_collection.filter(
+                Filters=[{'Name': id_filter, 'Values': chunk}]):
+            resource = by_id.get(boto_obj.id)
+            if resource:
+                setattr(resource, boto_attr, boto_obj)
+                # pylint:disable=protected-access
+                resource._unknown_state = False
+                refreshed.add(boto_obj.id)
+    for resource_id, resource in by_id.items():
+        if resource_id not in refreshed:
+            # The resource no longer exists and cannot be refreshed.
+            # pylint:disable=protected-access
+            resource._unknown_state = True
+
+
 class BotoGenericService(object):
     """
     Generic implementation of a Boto3 AWS service. Uses Boto3
@@ -74,14 +158,41 @@ class BotoGenericService(object):
         """
         self.provider = provider
         self.cb_resource = cb_resource
-        self.boto_conn = boto_conn
-        self.boto_collection_model = self._infer_collection_model(
-            boto_conn, boto_collection_name)
-        # Perform an empty filter to convert to a ResourceCollection
-        self.boto_collection = (getattr(self.boto_conn, boto_collection_name)
-                                .filter())
-        self.boto_resource = self._infer_boto_resource(
-            boto_conn, self.boto_collection_model)
+        self._boto_conn = boto_conn
+        self.boto_collection_name = boto_collection_name
+        # Boto models are introspected on first use, since loading them is
+        # expensive, and most services of a provider are never used
+        self._boto_models = None
+
+    @property
+    def boto_conn(self):
+        return self._boto_conn
+
+    def _get_boto_models(self):
+        # Models are rebuilt if the provider's connection has been replaced,
+        # e.g. after a call to provider.invalidate_connections()
+        conn = self.boto_conn
+        if not self._boto_models or self._boto_models[0] is not conn:
+            collection_model = self._infer_collection_model(
+                conn, self.boto_collection_name)
+            # Perform an empty filter to convert to a ResourceCollection
+            collection = getattr(conn, self.boto_collection_name).filter()
+            resource = self._infer_boto_resource(conn, collection_model)
+            self._boto_models = (conn, collection_model, collection,
+                                 resource)
+        return self._boto_models
+
+    @property
+    def boto_collection_model(self):
+        return self._get_boto_models()[1]
+
+    @property
+    def boto_collection(self):
+        return self._get_boto_models()[2]
+
+    @property
+    def boto_resource(self):
+        return self._get_boto_models()[3]
 
     def _infer_collection_model(self, conn, collection_name):
         log.debug("Retrieving boto model for collection: %s", collection_name)
@@ -94,7 +205,7 @@ class BotoGenericService(object):
         resource_model = next(
             sr for sr in conn.meta.resource_model.subresources
             if sr.resource.model.name == collection_model.resource.model.name)
-        return getattr(self.boto_conn, resource_model.name)
+        return getattr(conn, resource_model.name)
 
     def get_raw(self, resource_id):
         """
@@ -258,6 +369,47 @@ class BotoGenericService(object):
             collection = collection.filter(**kwargs)
         return self.list(limit=limit, marker=marker, collection=collection)
 
+    def find_by_query(self, query, filter_map, filters=None, **kwargs):
+        """
+        Return a list of resources matching a find query.
+
+        Each criterion named in ``filter_map`` is pushed down as the
+        corresponding describe filter, provided that the filter can express
+        it exactly. If any criteria are left over, all resources matching
+        the pushed down filters are listed and the remaining criteria are
+        evaluated client-side.
+
+        :type query: :class:`.FindQuery`
+        :param query: The query to evaluate.
+
+        :type filter_map: A ``dict`` of filter names
+        :param filter_map: Maps criteria names to describe filter names,
+            e.g. ``{'label': 'tag:Name'}``.
+
+        :type filters: A ``dict`` of filters
+        :param filters: Additional filters to apply, as accepted by
+            :meth:`find`.
+        """
+        filters = dict(filters or {})
+        for name, filter_name in filter_map.items():
+            value = query.push_down(name, is_filter_translatable)
+            if value:
+                filters[filter_name] = value
+        if not query.residual:
+            return self.find(filters, **kwargs)
+
+        log.debug("Filtering %s client-side by %s",
+                  self.boto_collection_model.name, query.residual)
+        results = []
+        marker = None
+        while True:
+            page = self.find(filters, marker=marker, **kwargs)
+            results.extend(query.filter(page))
+            if not page.is_truncated:
+                break
+            marker = page.marker
+        return ClientPagedResultList(self.provider, results)
+
     def create(self, boto_method, **kwargs):
         """
         Creates a resource
@@ -309,8 +461,11 @@ class BotoEC2Service(BotoGenericService):
                                     to the CloudBridge resource (e.g. key_pair)
         """
         super(BotoEC2Service, self).__init__(
-            provider, cb_resource, provider.ec2_conn,
-            boto_collection_name)
+            provider, cb_resource, None, boto_collection_name)
+
+    @property
+    def boto_conn(self):
+        return self.provider.ec2_conn
 
 
 class BotoS3Service(BotoGenericService):
@@ -331,5 +486,8 @@ class BotoS3Service(BotoGenericService):
                                     to the CloudBridge resource (e.g. key_pair)
         """
         super(BotoS3Service, self).__init__(
-            provider, cb_resource, provider.s3_conn,
-            boto_collection_name)
+            provider, cb_resource, None, boto_collection_name)
+
+    @property
+    def boto_conn(self):
+        return self.provider.s3_conn
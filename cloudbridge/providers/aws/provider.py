@@ -3,11 +3,14 @@ import logging as log
 
 import boto3
 
+import botocore.loaders
+import botocore.session
 from botocore.client import Config
 
 from cloudbridge.base import BaseCloudProvider
 from cloudbridge.base.helpers import get_env
 
+from .helpers import throttle_delay
 from .services import AWSComputeService
 from .services import AWSDnsService
 from .services import AWSNetworkingService
@@ -15,6 +18,26 @@ from .services import AWSSecurityService
 from .services import AWSStorageService
 
 
+class _SharedLoader(botocore.loaders.Loader):
+    """
+    A botocore loader shared by all sessions, so that service models, which
+    the loader caches, are only read and parsed once per process. boto3 adds
+    its own data path to the loader of every session it creates, so search
+    paths that are already known are not added again.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super(_SharedLoader, self).__init__(*args, **kwargs)
+        self._search_paths = _SearchPaths(self._search_paths)
+
+
+class _SearchPaths(list):
+
+    def append(self, path):
+        if path not in self:
+            super(_SearchPaths, self).append(path)
+
+
 class AWSCloudProvider(BaseCloudProvider):
     '''AWS cloud provider interface'''
     PROVIDER_ID = 'aws'
@@ -53,15 +76,15 @@ class AWSCloudProvider(BaseCloudProvider):
         # service connections, lazily initialized
         self._session = None
         self._ec2_conn = None
-        self._vpc_conn = None
         self._s3_conn = None
+        self._route53_conn = None
 
-        # Initialize provider services
-        self._compute = AWSComputeService(self)
-        self._networking = AWSNetworkingService(self)
-        self._security = AWSSecurityService(self)
-        self._storage = AWSStorageService(self)
-        self._dns = AWSDnsService(self)
+        # provider services, lazily initialized
+        self._compute = None
+        self._networking = None
+        self._security = None
+        self._storage = None
+        self._dns = None
 
     @property
     def session(self):
@@ -69,10 +92,42 @@ class AWSCloudProvider(BaseCloudProvider):
         if not self._session:
             if self.config.debug_mode:
                 boto3.set_stream_logger(level=log.DEBUG)
-            self._session = boto3.session.Session(
-                region_name=self.region_name, **self.session_cfg)
+            # Sessions are not thread-safe, so each provider has its own,
+            # but all of them share the loader and its cached models
+            self._session = self._new_session()
         return self._session
 
+    def _new_session(self):
+        botocore_session = botocore.session.get_session()
+        botocore_session.register_component(
+            'data_loader', self._get_pooled('loader', _SharedLoader))
+        return boto3.session.Session(botocore_session=botocore_session,
+                                     region_name=self.region_name,
+                                     **self.session_cfg)
+
+    def _get_resource(self, service_name, region_name, cfg):
+        """
+        Returns a new boto3 resource object for this provider. Resources are
+        not thread-safe, so are never shared, but the low-level client and
+        the resource class that a resource is built on are, so they are
+        pooled, and only created once for each set of credentials and
+        endpoint settings.
+        """
+        def create():
+            resource = self._new_session().resource(
+                service_name, region_name=region_name, **cfg)
+            return resource.meta.client, type(resource)
+
+        # botocore's Config has no stable representation, so only the
+        # settings that are used are part of the key
+        settings = {k: v for k, v in cfg.items() if k != 'config'}
+        signature_version = getattr(cfg.get('config'), 'signature_version',
+                                    None)
+        client, resource_cls = self._get_pooled(
+            service_name, create, region_name, self.session_cfg, settings,
+            signature_version)
+        return resource_cls(client=client)
+
     @property
     def ec2_conn(self):
         if not self._ec2_conn:
@@ -85,26 +140,45 @@ class AWSCloudProvider(BaseCloudProvider):
             self._s3_conn = self._connect_s3()
         return self._s3_conn
 
+    @property
+    def route53_conn(self):
+        if not self._route53_conn:
+            self._route53_conn = self._connect_route53()
+        return self._route53_conn
+
     @property
     def compute(self):
+        if not self._compute:
+            self._compute = AWSComputeService(self)
         return self._compute
 
     @property
     def networking(self):
+        if not self._networking:
+            self._networking = AWSNetworkingService(self)
         return self._networking
 
     @property
     def security(self):
+        if not self._security:
+            self._security = AWSSecurityService(self)
         return self._security
 
     @property
     def storage(self):
+        if not self._storage:
+            self._storage = AWSStorageService(self)
         return self._storage
 
     @property
     def dns(self):
+        if not self._dns:
+            self._dns = AWSDnsService(self)
         return self._dns
 
+    def _throttle_delay(self, exception):
+        return throttle_delay(exception)
+
     def _connect_ec2(self):
         """
         Get a boto ec2 connection object.
@@ -113,10 +187,24 @@ class AWSCloudProvider(BaseCloudProvider):
 
     def _connect_ec2_region(self, region_name=None):
         '''Get an EC2 resource object'''
-        return self.session.resource(
-            'ec2', region_name=region_name, **self.ec2_cfg)
+        return self._get_resource('ec2', region_name, self.ec2_cfg)
 
     def _connect_s3(self):
         '''Get an S3 resource object'''
-        return self.session.resource(
-            's3', region_name=self.region_name, **self.s3_cfg)
+        return self._get_resource('s3', self.region_name, self.s3_cfg)
+
+    def _connect_route53(self):
+        '''Get a Route53 client object'''
+        # Low-level clients are thread-safe, so can be shared
+        return self._get_pooled(
+            'route53',
+            lambda: self._new_session().client(
+                'route53', region_name=self.region_name),
+            self.region_name, self.session_cfg)
+
+    def invalidate_connections(self):
+        super(AWSCloudProvider, self).invalidate_connections()
+        self._session = None
+        self._ec2_conn = None
+        self._s3_conn = None
+        self._route53_conn = None
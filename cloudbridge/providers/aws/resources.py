@@ -2,7 +2,6 @@
 DataTypes used by this provider
 """
 import hashlib
-import inspect
 import logging
 
 from botocore.exceptions import ClientError
@@ -40,6 +39,7 @@ from cloudbridge.interfaces.resources import SubnetState
 from cloudbridge.interfaces.resources import VolumeState
 
 from .helpers import find_tag_value
+from .helpers import refresh_all
 from .helpers import trim_empty_params
 from .subservices import AWSBucketObjectSubService
 from .subservices import AWSDnsRecordSubService
@@ -301,8 +301,8 @@ class AWSInstance(BaseInstance):
 
     @property
     def vm_type(self):
-        return self._provider.compute.vm_types.find(
-            name=self._ec2_instance.instance_type)[0]
+        return self._provider.compute.vm_types.get(
+            self._ec2_instance.instance_type)
 
     def reboot(self):
         self._ec2_instance.reboot()
@@ -415,6 +415,12 @@ class AWSInstance(BaseInstance):
             # set the state to unknown
             self._unknown_state = True
 
+    @classmethod
+    def _refresh_all(cls, resources):
+        # pylint:disable=protected-access
+        refresh_all(resources, resources[0]._provider.ec2_conn.instances,
+                    'instance-id', '_ec2_instance')
+
     # pylint:disable=unused-argument
     def _wait_till_exists(self, timeout=None, interval=None):
         self._ec2_instance.wait_until_exists()
@@ -565,6 +571,12 @@ class AWSVolume(BaseVolume):
             # set the status to unknown
             self._unknown_state = True
 
+    @classmethod
+    def _refresh_all(cls, resources):
+        # pylint:disable=protected-access
+        refresh_all(resources, resources[0]._provider.ec2_conn.volumes,
+                    'volume-id', '_volume')
+
 
 class AWSSnapshot(BaseSnapshot):
 
@@ -653,6 +665,12 @@ class AWSSnapshot(BaseSnapshot):
             # set the status to unknown
             self._unknown_state = True
 
+    @classmethod
+    def _refresh_all(cls, resources):
+        # pylint:disable=protected-access
+        refresh_all(resources, resources[0]._provider.ec2_conn.snapshots,
+                    'snapshot-id', '_snapshot')
+
     def create_volume(self, size=None, volume_type=None, iops=None):
         label = "from-snap-{0}".format(self.label or self.id)
         cb_vol = self._provider.storage.volumes.create(
@@ -671,6 +689,10 @@ class AWSKeyPair(BaseKeyPair):
 
 class AWSVMFirewall(BaseVMFirewall):
 
+    # Omit for consistency across cloud providers
+    JSON_EXCLUDED_FIELDS = (BaseVMFirewall.JSON_EXCLUDED_FIELDS +
+                            ('network_id',))
+
     def __init__(self, provider, _vm_firewall):
         super(AWSVMFirewall, self).__init__(provider, _vm_firewall)
         self._rule_container = AWSVMFirewallRuleSubService(provider, self)
@@ -727,15 +749,6 @@ class AWSVMFirewall(BaseVMFirewall):
     def refresh(self):
         self._vm_firewall.reload()
 
-    def to_json(self):
-        attr = inspect.getmembers(self, lambda a: not inspect.isroutine(a))
-        js = {k: v for (k, v) in attr if not k.startswith('_')}
-        json_rules = [r.to_json() for r in self.rules]
-        js['rules'] = json_rules
-        if js.get('network_id'):
-            js.pop('network_id')  # Omit for consistency across cloud providers
-        return js
-
 
 class AWSVMFirewallRule(BaseVMFirewallRule):
 
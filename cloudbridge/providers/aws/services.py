@@ -120,16 +120,9 @@ class AWSKeyPairService(BaseKeyPairService):
     @dispatch(event="provider.security.key_pairs.find",
               priority=BaseKeyPairService.STANDARD_EVENT_PRIORITY)
     def find(self, **kwargs):
-        name = kwargs.pop('name', None)
-
-        # All kwargs should have been popped at this time.
-        if len(kwargs) > 0:
-            raise InvalidParamException(
-                "Unrecognised parameters for search: %s. Supported "
-                "attributes: %s" % (kwargs, 'name'))
-
-        log.debug("Searching for Key Pair %s", name)
-        return self.svc.find(filters={'key-name': name})
+        query = cb_helpers.FindQuery(['name'], kwargs)
+        log.debug("Searching for Key Pair %s", query.get('name'))
+        return self.svc.find_by_query(query, {'name': 'key-name'})
 
     @dispatch(event="provider.security.key_pairs.create",
               priority=BaseKeyPairService.STANDARD_EVENT_PRIORITY)
@@ -197,14 +190,9 @@ class AWSVMFirewallService(BaseVMFirewallService):
               priority=BaseVMFirewallService.STANDARD_EVENT_PRIORITY)
     def find(self, **kwargs):
         # Filter by name or label
-        label = kwargs.pop('label', None)
-        log.debug("Searching for Firewall Service %s", label)
-        # All kwargs should have been popped at this time.
-        if len(kwargs) > 0:
-            raise InvalidParamException(
-                "Unrecognised parameters for search: %s. Supported "
-                "attributes: %s" % (kwargs, 'label'))
-        return self.svc.find(filters={'tag:Name': label})
+        query = cb_helpers.FindQuery(['label'], kwargs)
+        log.debug("Searching for Firewall Service %s", query.get('label'))
+        return self.svc.find_by_query(query, {'label': 'tag:Name'})
 
     @dispatch(event="provider.security.vm_firewalls.delete",
               priority=BaseVMFirewallService.STANDARD_EVENT_PRIORITY)
@@ -336,18 +324,11 @@ class AWSVolumeService(BaseVolumeService):
     @dispatch(event="provider.storage.volumes.find",
               priority=BaseVolumeService.STANDARD_EVENT_PRIORITY)
     def find(self, **kwargs):
-        label = kwargs.pop('label', None)
-
-        # All kwargs should have been popped at this time.
-        if len(kwargs) > 0:
-            raise InvalidParamException(
-                "Unrecognised parameters for search: %s. Supported "
-                "attributes: %s" % (kwargs, 'label'))
-
-        log.debug("Searching for AWS Volume Service %s", label)
-        return self.svc.find(
-            filters={'tag:Name': label,
-                     'availability-zone': self.provider.zone_name})
+        query = cb_helpers.FindQuery(['label'], kwargs)
+        log.debug("Searching for AWS Volume Service %s", query.get('label'))
+        return self.svc.find_by_query(
+            query, {'label': 'tag:Name'},
+            filters={'availability-zone': self.provider.zone_name})
 
     @dispatch(event="provider.storage.volumes.list",
               priority=BaseVolumeService.STANDARD_EVENT_PRIORITY)
@@ -400,17 +381,11 @@ class AWSSnapshotService(BaseSnapshotService):
               priority=BaseSnapshotService.STANDARD_EVENT_PRIORITY)
     def find(self, **kwargs):
         # Filter by description or label
-        label = kwargs.get('label', None)
-
-        obj_list = []
-        if label:
-            log.debug("Searching for AWS Snapshot with label %s", label)
-            obj_list.extend(self.svc.find(filters={'tag:Name': label},
-                                          OwnerIds=['self']))
-        else:
-            obj_list = list(self)
-        filters = ['label']
-        return cb_helpers.generic_find(filters, kwargs, obj_list)
+        query = cb_helpers.FindQuery(['label'], kwargs)
+        log.debug("Searching for AWS Snapshot with label %s",
+                  query.get('label'))
+        return self.svc.find_by_query(query, {'label': 'tag:Name'},
+                                      OwnerIds=['self'])
 
     @dispatch(event="provider.storage.snapshots.list",
               priority=BaseSnapshotService.STANDARD_EVENT_PRIORITY)
@@ -557,12 +532,16 @@ class AWSBucketObjectService(BaseBucketObjectService):
                                      limit=limit, marker=marker)
 
     def find(self, bucket, **kwargs):
+        query = cb_helpers.FindQuery(['name'], kwargs)
+        name = query.get('name')
+        # Only list the objects sharing the pattern's literal prefix
+        prefix = (cb_helpers.glob_literal_prefix(name)
+                  if isinstance(name, str) else None)
         # pylint:disable=protected-access
-        obj_list = [AWSBucketObject(self.provider, o)
-                    for o in bucket._bucket.objects.all()]
-        filters = ['name']
-        matches = cb_helpers.generic_find(filters, kwargs, obj_list)
-        return ClientPagedResultList(self.provider, list(matches),
+        boto_objs = (bucket._bucket.objects.filter(Prefix=prefix) if prefix
+                     else bucket._bucket.objects.all())
+        obj_list = [AWSBucketObject(self.provider, o) for o in boto_objs]
+        return ClientPagedResultList(self.provider, query.filter(obj_list),
                                      limit=None, marker=None)
 
     def create(self, bucket, name):
@@ -629,11 +608,22 @@ class AWSImageService(BaseImageService):
         # and "AMI name" to allow for searches of public images
         if label:
             log.debug("Searching for AWS Image Service %s", label)
+            ec2_conn = self.provider.ec2_conn
+            # Resources are not thread-safe, so the searches run
+            # concurrently on the low-level client, which is, and the
+            # results are wrapped on this thread
+            client = ec2_conn.meta.client
             obj_list = []
-            obj_list.extend(
-                self.svc.find(filters={'name': label}, **extra_args))
-            obj_list.extend(
-                self.svc.find(filters={'tag:Name': label}, **extra_args))
+            for results in self.provider.fan_out(
+                    self._service_event_pattern + ".describe_images",
+                    lambda name: client.describe_images(
+                        Filters=[{'Name': name, 'Values': [label]}],
+                        **extra_args)['Images'],
+                    ['name', 'tag:Name']):
+                for data in results:
+                    image = ec2_conn.Image(data['ImageId'])
+                    image.meta.data = data
+                    obj_list.append(AWSMachineImage(self.provider, image))
             return obj_list
         else:
             return []
@@ -802,17 +792,10 @@ class AWSInstanceService(BaseInstanceService):
     @dispatch(event="provider.compute.instances.find",
               priority=BaseInstanceService.STANDARD_EVENT_PRIORITY)
     def find(self, **kwargs):
-        label = kwargs.pop('label', None)
-
-        # All kwargs should have been popped at this time.
-        if len(kwargs) > 0:
-            raise InvalidParamException(
-                "Unrecognised parameters for search: %s. Supported "
-                "attributes: %s" % (kwargs, 'label'))
-
-        return self.svc.find(
-            filters={'tag:Name': label,
-                     'availability-zone': self.provider.zone_name})
+        query = cb_helpers.FindQuery(['label'], kwargs)
+        return self.svc.find_by_query(
+            query, {'label': 'tag:Name'},
+            filters={'availability-zone': self.provider.zone_name})
 
     @dispatch(event="provider.compute.instances.list",
               priority=BaseInstanceService.STANDARD_EVENT_PRIORITY)
@@ -839,6 +822,11 @@ class AWSVMTypeService(BaseVMTypeService):
     @dispatch(event="provider.compute.vm_types.get",
               priority=BaseVMTypeService.STANDARD_EVENT_PRIORITY)
     def get(self, vm_type):
+        # types that are not offered in the current zone are described
+        # individually
+        cb_vm_type = self.index.get(vm_type)
+        if cb_vm_type:
+            return cb_vm_type
         try:
             t = self.provider.ec2_conn.meta.client.describe_instance_types(
                 InstanceTypes=[vm_type]).get('InstanceTypes')[0]
@@ -850,9 +838,12 @@ class AWSVMTypeService(BaseVMTypeService):
             else:
                 raise e
 
-    @dispatch(event="provider.compute.vm_types.list",
-              priority=BaseVMTypeService.STANDARD_EVENT_PRIORITY)
-    def list(self, limit=None, marker=None):
+    def _catalog_scope(self):
+        return (self.provider.region_name, self.provider.zone_name,
+                self.provider.ec2_cfg.get('endpoint_url'),
+                self.provider.session_cfg.get('aws_access_key_id'))
+
+    def _fetch_vm_types(self):
         client = self.provider.ec2_conn.meta.client
         vmt_list_resp = client.describe_instance_type_offerings(
             LocationType='availability-zone',
@@ -874,17 +865,20 @@ class AWSVMTypeService(BaseVMTypeService):
 
         vmt_list_names = [x.get("InstanceType")
                           for x in vmt_list]
-        # describe_instance_types call can get at most 100 types at once
+        # describe_instance_types call can get at most 100 types at once,
+        # so the chunks are described concurrently
         chunks = [vmt_list_names[x:x + 100]
                   for x in range(0, len(vmt_list_names), 100)]
-        raw_types = []
-        for chunk in chunks:
-            raw_chunk = client.describe_instance_types(
-                InstanceTypes=chunk).get('InstanceTypes')
-            raw_types.extend(raw_chunk)
-        cb_types = [AWSVMType(self.provider, t) for t in raw_types]
-        return ClientPagedResultList(self.provider, cb_types,
-                                     limit=limit, marker=marker)
+        raw_chunks = self.provider.fan_out(
+            self._service_event_pattern + ".describe_instance_types",
+            lambda chunk: client.describe_instance_types(
+                InstanceTypes=chunk).get('InstanceTypes'),
+            chunks)
+        return [raw_type for raw_chunk in raw_chunks
+                for raw_type in raw_chunk]
+
+    def _to_vm_type(self, record):
+        return AWSVMType(self.provider, record)
 
 
 class AWSRegionService(BaseRegionService):
@@ -970,16 +964,9 @@ class AWSNetworkService(BaseNetworkService):
     @dispatch(event="provider.networking.networks.find",
               priority=BaseNetworkService.STANDARD_EVENT_PRIORITY)
     def find(self, **kwargs):
-        label = kwargs.pop('label', None)
-
-        # All kwargs should have been popped at this time.
-        if len(kwargs) > 0:
-            raise InvalidParamException(
-                "Unrecognised parameters for search: %s. Supported "
-                "attributes: %s" % (kwargs, 'label'))
-
-        log.debug("Searching for AWS Network Service %s", label)
-        return self.svc.find(filters={'tag:Name': label})
+        query = cb_helpers.FindQuery(['label'], kwargs)
+        log.debug("Searching for AWS Network Service %s", query.get('label'))
+        return self.svc.find_by_query(query, {'label': 'tag:Name'})
 
     @dispatch(event="provider.networking.networks.create",
               priority=BaseNetworkService.STANDARD_EVENT_PRIORITY)
@@ -1055,18 +1042,11 @@ class AWSSubnetService(BaseSubnetService):
     @dispatch(event="provider.networking.subnets.find",
               priority=BaseSubnetService.STANDARD_EVENT_PRIORITY)
     def find(self, network=None, **kwargs):
-        label = kwargs.pop('label', None)
-
-        # All kwargs should have been popped at this time.
-        if len(kwargs) > 0:
-            raise InvalidParamException(
-                "Unrecognised parameters for search: %s. Supported "
-                "attributes: %s" % (kwargs, 'label'))
-
-        log.debug("Searching for AWS Subnet Service %s", label)
-        return self.svc.find(
-            filters={'tag:Name': label,
-                     'availability-zone': self.provider.zone_name})
+        query = cb_helpers.FindQuery(['label'], kwargs)
+        log.debug("Searching for AWS Subnet Service %s", query.get('label'))
+        return self.svc.find_by_query(
+            query, {'label': 'tag:Name'},
+            filters={'availability-zone': self.provider.zone_name})
 
     @dispatch(event="provider.networking.subnets.create",
               priority=BaseSubnetService.STANDARD_EVENT_PRIORITY)
@@ -1207,16 +1187,9 @@ class AWSRouterService(BaseRouterService):
     @dispatch(event="provider.networking.routers.find",
               priority=BaseRouterService.STANDARD_EVENT_PRIORITY)
     def find(self, **kwargs):
-        label = kwargs.pop('label', None)
-
-        # All kwargs should have been popped at this time.
-        if len(kwargs) > 0:
-            raise InvalidParamException(
-                "Unrecognised parameters for search: %s. Supported "
-                "attributes: %s" % (kwargs, 'label'))
-
-        log.debug("Searching for AWS Router Service %s", label)
-        return self.svc.find(filters={'tag:Name': label})
+        query = cb_helpers.FindQuery(['label'], kwargs)
+        log.debug("Searching for AWS Router Service %s", query.get('label'))
+        return self.svc.find_by_query(query, {'label': 'tag:Name'})
 
     @dispatch(event="provider.networking.routers.list",
               priority=BaseRouterService.STANDARD_EVENT_PRIORITY)
@@ -1345,13 +1318,15 @@ class AWSDnsService(BaseDnsService):
 
     def __init__(self, provider):
         super(AWSDnsService, self).__init__(provider)
-        self.client = self._provider.session.client(
-            'route53', region_name=self._provider.region_name)
 
         # Initialize provider services
         self._zone_svc = AWSDnsZoneService(self.provider)
         self._record_svc = AWSDnsRecordService(self.provider)
 
+    @property
+    def client(self):
+        return self._provider.route53_conn
+
     @property
     def host_zones(self):
         return self._zone_svc
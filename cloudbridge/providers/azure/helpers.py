@@ -1,6 +1,25 @@
+from msrestazure.azure_exceptions import CloudError
+
 from cloudbridge.interfaces.exceptions import InvalidValueException
 
 
+def throttle_delay(exception):
+    """
+    Returns the number of seconds to wait, from the ``Retry-After`` header
+    or zero if there is none, if a ``CloudError`` is a 429 response from
+    Azure Resource Manager, and ``None`` otherwise.
+    """
+    if (isinstance(exception, CloudError) and
+            exception.status_code == 429):
+        response = getattr(exception, 'response', None)
+        headers = getattr(response, 'headers', None) or {}
+        try:
+            return float(headers.get('Retry-After', 0))
+        except ValueError:
+            return 0
+    return None
+
+
 # def filter_by_tag(list_items, filters):
 #     """
 #     This function filter items on the tags
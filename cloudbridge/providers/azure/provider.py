@@ -13,6 +13,7 @@ from cloudbridge.base.helpers import get_env
 from cloudbridge.interfaces.exceptions import ProviderConnectionException
 from cloudbridge.providers.azure.azure_client import AzureClient
 
+from .helpers import throttle_delay
 from .services import AzureComputeService
 from .services import AzureNetworkingService
 from .services import AzureSecurityService
@@ -138,6 +139,9 @@ class AzureCloudProvider(BaseCloudProvider):
             self._initialize()
         return self._azure_client
 
+    def _throttle_delay(self, exception):
+        return throttle_delay(exception)
+
     @tenacity.retry(stop=tenacity.stop_after_attempt(2),
                     retry=tenacity.retry_if_exception_type(CloudError),
                     reraise=True)
@@ -52,6 +52,10 @@ log = logging.getLogger(__name__)
 
 
 class AzureVMFirewall(BaseVMFirewall):
+    # Omit for consistency across cloud providers
+    JSON_EXCLUDED_FIELDS = (BaseVMFirewall.JSON_EXCLUDED_FIELDS +
+                            ('network_id',))
+
     def __init__(self, provider, vm_firewall):
         super(AzureVMFirewall, self).__init__(provider, vm_firewall)
         self._vm_firewall = vm_firewall
@@ -113,14 +117,6 @@ class AzureVMFirewall(BaseVMFirewall):
             log.exception(cloud_error.message)
             # The security group no longer exists and cannot be refreshed.
 
-    def to_json(self):
-        js = super(AzureVMFirewall, self).to_json()
-        json_rules = [r.to_json() for r in self.rules]
-        js['rules'] = json_rules
-        if js.get('network_id'):
-            js.pop('network_id')  # Omit for consistency across cloud providers
-        return js
-
 
 # Tuple for port range
 PortRange = collections.namedtuple('PortRange', ['from_port', 'to_port'])
@@ -907,6 +903,10 @@ class AzurePlacementZone(BasePlacementZone):
 
 
 class AzureSubnet(BaseSubnet):
+
+    # The subnet's name and label are derived from its parent network
+    JSON_REMOTE_FIELDS = (BaseSubnet.JSON_REMOTE_FIELDS +
+                          ('name', 'label', 'network_id', 'state'))
     _SUBNET_STATE_MAP = {
         'InProgress': SubnetState.PENDING,
         'Succeeded': SubnetState.AVAILABLE,
@@ -996,6 +996,9 @@ class AzureSubnet(BaseSubnet):
 
 class AzureInstance(BaseInstance):
 
+    JSON_REMOTE_FIELDS = (BaseInstance.JSON_REMOTE_FIELDS +
+                          ('public_ips', 'subnet_id'))
+
     INSTANCE_STATE_MAP = {
         'InProgress': InstanceState.PENDING,
         'Creating': InstanceState.PENDING,
@@ -1105,8 +1108,7 @@ class AzureInstance(BaseInstance):
         """
         Get the instance type.
         """
-        return self._provider.compute.vm_types.find(
-            name=self.vm_type_id)[0]
+        return self._provider.compute.vm_types.get(self.vm_type_id)
 
     def reboot(self):
         """
@@ -4,6 +4,7 @@ import uuid
 
 from azure.common import AzureException
 from azure.mgmt.compute.models import DiskCreateOption
+from azure.mgmt.compute.models import VirtualMachineSize
 
 from msrestazure.azure_exceptions import CloudError
 
@@ -1041,16 +1042,19 @@ class AzureVMTypeService(BaseVMTypeService):
         """
         Fetch info about the available instances.
         """
-        r = self.provider.azure_client.list_vm_types()
-        return r
+        return [VirtualMachineSize.deserialize(record)
+                for record in self._catalog_records()]
 
-    @dispatch(event="provider.compute.vm_types.list",
-              priority=BaseVMTypeService.STANDARD_EVENT_PRIORITY)
-    def list(self, limit=None, marker=None):
-        vm_types = [AzureVMType(self.provider, vm_type)
-                    for vm_type in self.instance_data]
-        return ClientPagedResultList(self.provider, vm_types,
-                                     limit=limit, marker=marker)
+    def _catalog_scope(self):
+        return (self.provider.subscription_id, self.provider.region_name)
+
+    def _fetch_vm_types(self):
+        return [vm_type.serialize()
+                for vm_type in self.provider.azure_client.list_vm_types()]
+
+    def _to_vm_type(self, record):
+        return AzureVMType(self.provider,
+                           VirtualMachineSize.deserialize(record))
 
 
 class AzureRegionService(BaseRegionService):
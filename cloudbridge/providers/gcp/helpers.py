@@ -1,9 +1,20 @@
+import bisect
+import copy
+import json
 import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from contextlib import contextmanager
+from datetime import datetime
 
 from googleapiclient.errors import HttpError
 
 import tenacity
 
+from cloudbridge.base.catalog import Catalog
+from cloudbridge.interfaces.exceptions import DuplicateResourceException
 from cloudbridge.interfaces.exceptions import ProviderInternalException
 
 
@@ -22,6 +33,408 @@ def iter_all(resource, **kwargs):
         token = response['nextPageToken']
 
 
+def is_filter_translatable(pattern):
+    """
+    Checks whether a ``find()`` glob pattern can be translated into a list
+    filter expression. Character sets are not translated, and are left for
+    client-side evaluation.
+    """
+    return isinstance(pattern, str) and '[' not in pattern
+
+
+def glob_to_filter_regex(pattern):
+    """
+    Translates a ``find()`` glob pattern into a regular expression for the
+    ``eq`` operator of list filter expressions, which must match the whole
+    of a field's value.
+    """
+    return ''.join('.*' if part == '*' else '.' if part == '?'
+                   else re.escape(part)
+                   for part in re.split(r'([*?])', pattern) if part)
+
+
+def push_down_filter(query, name, field):
+    """
+    Takes a criterion from a :class:`.FindQuery` for evaluation by GCP,
+    returning an ``eq`` filter expression on the given field, e.g.
+    ``labels.cblabel``. Returns ``None`` if the query does not filter on
+    the criterion, or it must be evaluated client-side.
+    """
+    value = query.push_down(name, is_filter_translatable)
+    if value:
+        return '{0} eq {1}'.format(field, glob_to_filter_regex(value))
+    return None
+
+
+# Error reasons returned by GCP APIs when requests are being throttled
+GCP_THROTTLING_REASONS = frozenset(['rateLimitExceeded',
+                                    'userRateLimitExceeded'])
+
+
+def _http_error_reasons(error):
+    try:
+        content = json.loads(error.content.decode('utf-8'))
+        return set(e.get('reason')
+                   for e in content['error'].get('errors', []))
+    except (ValueError, KeyError, TypeError, AttributeError):
+        return set()
+
+
+def throttle_delay(exception):
+    """
+    Returns the number of seconds to wait, from the ``Retry-After`` header
+    or zero if there is none, if an ``HttpError`` signals that requests are
+    being throttled, and ``None`` otherwise. GCP returns either a 429, or a
+    403 with a ``rateLimitExceeded`` reason.
+    """
+    if isinstance(exception, HttpError):
+        status = int(exception.resp.status)
+        if status == 429 or (
+                status == 403 and
+                _http_error_reasons(exception) & GCP_THROTTLING_REASONS):
+            try:
+                return float(exception.resp.get('retry-after', 0))
+            except ValueError:
+                return 0
+    return None
+
+
+# Number of names to match in a single list filter expression
+GCP_FILTER_NAME_LIMIT = 50
+
+
+def refresh_all(resources, gcp_resource, resource_attr, unknown_status):
+    """
+    Refreshes a list of zonal CloudBridge resources of the same type with
+    one filtered list request per zone (and chunk of names), instead of
+    fetching each resource individually. Resources that are no longer
+    returned by the cloud have their status set to ``unknown_status``.
+
+    :type gcp_resource: discovery resource
+    :param gcp_resource: The resource collection to list, e.g.
+                         ``provider.gcp_compute.instances()``
+
+    :type resource_attr: ``str``
+    :param resource_attr: Name of the attribute holding the resource dict,
+                          e.g. ``_gcp_instance``
+    """
+    # pylint:disable=protected-access
+    provider = resources[0]._provider
+    by_zone = {}
+    for resource in resources:
+        by_zone.setdefault(resource.zone_name, []).append(resource)
+    refreshed = set()
+    for zone, zone_resources in by_zone.items():
+        by_id = {resource.id: resource for resource in zone_resources}
+        names = [resource.name for resource in zone_resources]
+        for i in range(0, len(names), GCP_FILTER_NAME_LIMIT):
+            name_filter = " OR ".join(
+                '(name = "{0}")'.format(name)
+                for name in names[i:i + GCP_FILTER_NAME_LIMIT])
+            for item in iter_all(gcp_resource, project=provider.project_name,
+                                 zone=zone, filter=name_filter):
+                resource = by_id.get(item.get('selfLink'))
+                if resource:
+                    setattr(resource, resource_attr, item)
+                    refreshed.add(resource.id)
+    for resource in resources:
+        if resource.id not in refreshed:
+            # resource no longer exists
+            getattr(resource, resource_attr)['status'] = unknown_status
+
+
+def parse_timestamp(value):
+    """
+    Parses an RFC 3339 timestamp, such as a ``creationTimestamp``, e.g.
+    ``2017-10-13T12:53:17.445-07:00``.
+    """
+    for fmt in ('%Y-%m-%dT%H:%M:%S.%f%z', '%Y-%m-%dT%H:%M:%S%z'):
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            pass
+    raise ValueError("Unrecognised timestamp: %s" % value)
+
+
+def iter_images_since(provider, project, since=None):
+    """
+    Iterates over the images of a project, or only over those created after
+    the ``since`` timestamp if given. Images are listed newest first in the
+    latter case, so that listing stops at the first older image.
+    """
+    images = provider.gcp_compute.images()
+    if since is None:
+        for image in iter_all(images, project=project):
+            yield image
+        return
+    watermark = parse_timestamp(since)
+    for image in iter_all(images, project=project,
+                          orderBy='creationTimestamp desc'):
+        if parse_timestamp(image['creationTimestamp']) < watermark:
+            return
+        yield image
+
+
+# Public images are fully refetched at this interval, so that deleted images
+# are dropped. In between, only images newer than those held are fetched.
+DEFAULT_IMAGE_FULL_REFRESH_INTERVAL = 7 * 86400
+
+
+class GCPPublicImageCatalog(Catalog):
+    """
+    The images of GCP's public image projects, fetched one project per call.
+
+    For each project, the ``creationTimestamp`` of its newest image is kept
+    as a watermark, so that refreshing the catalog only fetches the images
+    created since, which is usually a single request per project. The whole
+    catalog is refetched every ``full_refresh_interval`` seconds.
+
+    The ``fetch`` function passed to the catalog's methods is called with a
+    list of ``(project, watermark)`` pairs, where the watermark may be
+    ``None``, and returns, in order, the images of each project created
+    since its watermark, e.g. by fetching the projects concurrently.
+    """
+
+    kind = 'gcp-public-images'
+
+    def __init__(self, key, projects, path=None, ttl=None,
+                 full_refresh_interval=DEFAULT_IMAGE_FULL_REFRESH_INTERVAL):
+        """
+        :type projects: ``list`` of ``str``
+        :param projects: The public image projects.
+        """
+        super(GCPPublicImageCatalog, self).__init__(key, path=path, ttl=ttl)
+        self.projects = list(projects)
+        self.full_refresh_interval = full_refresh_interval
+        self._index = None
+
+    def get_index(self, fetch):
+        """
+        Returns the :class:`GCPImageIndex` over the current version of the
+        catalog, fetching the catalog if it has not been fetched yet.
+        """
+        self.get(fetch)
+        with self._lock:
+            if self._index is None or self._index.version != self._version:
+                self._index = GCPImageIndex(self._records, self._version)
+            return self._index
+
+    @staticmethod
+    def image_project(image):
+        # selfLink is .../projects/<project>/global/images/<name>
+        return image['selfLink'].split('/projects/', 1)[1].split('/', 1)[0]
+
+    def _fetch_records(self, fetch):
+        full_refreshed_at = self.meta.get('full_refreshed_at')
+        full = (self._records is None or full_refreshed_at is None or
+                time.time() - full_refreshed_at >= self.full_refresh_interval)
+        watermarks = {} if full else dict(self.meta.get('watermarks', {}))
+        fetched = fetch([(project, watermarks.get(project))
+                         for project in self.projects])
+        images = OrderedDict() if full else OrderedDict(
+            (image['selfLink'], image) for image in self._records)
+        for project_images in fetched:
+            for image in project_images:
+                images[image['selfLink']] = image
+        for image in images.values():
+            project = self.image_project(image)
+            watermark = watermarks.get(project)
+            if (watermark is None or
+                    parse_timestamp(image['creationTimestamp']) >
+                    parse_timestamp(watermark)):
+                watermarks[project] = image['creationTimestamp']
+        self.meta = {'watermarks': watermarks,
+                     'full_refreshed_at': (time.time() if full
+                                           else full_refreshed_at)}
+        return list(images.values())
+
+
+class GCPImageIndex(object):
+    """
+    Indexes of a version of the public image catalog by name and label.
+    """
+
+    def __init__(self, images, version=None):
+        self.images = images
+        self.version = version
+        self.by_name = {}
+        self.by_label = {}
+        for image in images:
+            self.by_name.setdefault(image['name'], image)
+            label = (image.get('labels') or {}).get('cblabel', '')
+            self.by_label.setdefault(label, []).append(image)
+
+
+# Seconds after which the cached firewalls of a project are refetched
+DEFAULT_FIREWALL_CACHE_TTL = 60
+
+
+class GCPFirewallIndex(object):
+    """
+    Indexes of the firewalls of a project that CloudBridge manages, i.e.
+    those with a single target tag and a single allowed entry. Firewalls are
+    indexed by id, by the (tag, network name) pair they belong to, and by the
+    id of each pair.
+
+    :type network_name: ``callable``
+    :param network_name: Returns the name of a firewall's network.
+
+    :type tag_network_id: ``callable``
+    :param tag_network_id: Returns the id of a (tag, network name) pair.
+    """
+
+    def __init__(self, firewalls, network_name, tag_network_id):
+        self._network_name = network_name
+        self._tag_network_id = tag_network_id
+        self.fetched_at = time.time()
+        self.by_id = OrderedDict()
+        self.pairs = {}
+        self.by_tag_network = OrderedDict()
+        self.by_tag_network_id = {}
+        for firewall in firewalls:
+            self.add(firewall)
+
+    def expired(self, ttl):
+        return ttl is not None and time.time() - self.fetched_at > ttl
+
+    def add(self, firewall):
+        """
+        Add a firewall, replacing any firewall with the same id.
+        """
+        if ('targetTags' not in firewall or
+                len(firewall['targetTags']) != 1):
+            return
+        if 'allowed' not in firewall or len(firewall['allowed']) != 1:
+            return
+        self.remove(firewall['id'])
+        pair = (firewall['targetTags'][0], self._network_name(firewall))
+        self.by_id[firewall['id']] = firewall
+        self.pairs[firewall['id']] = pair
+        if pair not in self.by_tag_network:
+            self.by_tag_network[pair] = OrderedDict()
+            self.by_tag_network_id[self._tag_network_id(*pair)] = pair
+        self.by_tag_network[pair][firewall['id']] = firewall
+
+    def remove(self, firewall_id):
+        self.by_id.pop(firewall_id, None)
+        pair = self.pairs.pop(firewall_id, None)
+        if pair is None:
+            return
+        rules = self.by_tag_network[pair]
+        rules.pop(firewall_id)
+        if not rules:
+            del self.by_tag_network[pair]
+            del self.by_tag_network_id[self._tag_network_id(*pair)]
+
+    def select(self, tag=None, network_name=None):
+        """
+        Returns the firewalls with a given tag and/or in a network.
+        """
+        if tag is not None and network_name is not None:
+            return list(self.by_tag_network.get(
+                (tag, network_name), {}).values())
+        return [firewall for firewall_id, firewall in self.by_id.items()
+                if tag in (None, self.pairs[firewall_id][0]) and
+                network_name in (None, self.pairs[firewall_id][1])]
+
+
+class _PathNode(object):
+
+    __slots__ = ('literals', 'wildcard', 'templates')
+
+    def __init__(self):
+        self.literals = {}
+        self.wildcard = None
+        self.templates = []
+
+
+class ResourcePathTrie(object):
+    """
+    Matches resource paths, such as
+    ``projects/galaxy-on-gcp/zones/us-central1-a/instances/vm-1``, against
+    the ``get`` path templates of a discovery document.
+
+    Templates are stored in a trie of path segments. Literal segments such
+    as ``zones`` are followed by a dictionary lookup, and segments holding
+    parameters are followed through a single wildcard edge, so a path is
+    matched in one walk over its segments. The parameter values are then
+    checked against the patterns from the discovery document. Where both a
+    literal and a wildcard edge match a segment, the literal edge wins.
+    """
+
+    def __init__(self):
+        self._root = _PathNode()
+
+    def add(self, resource, path, parameters):
+        """
+        Add a resource's path template, e.g.
+        ``projects/{project}/zones/{zone}/instances/{instance}``.
+        ``parameters`` maps each parameter name to the regex its values must
+        match, or to ``None`` when any value is valid.
+        """
+        node = self._root
+        checks = []
+        names = []
+        for position, segment in enumerate(path.split('/')):
+            if '{' not in segment:
+                node = node.literals.setdefault(segment, _PathNode())
+                continue
+            node.wildcard = node.wildcard or _PathNode()
+            node = node.wildcard
+            # A segment may hold a parameter with a prefix or suffix, or
+            # several parameters, so each is checked with its own regex.
+            segment_names = re.findall(r'{([^}]+)}', segment)
+            regex = ''
+            first = len(names)
+            for literal, name in zip(re.split(r'{[^}]+}', segment),
+                                     segment_names + [None]):
+                regex += re.escape(literal)
+                if name:
+                    # Named groups, since discovery patterns may hold
+                    # groups of their own.
+                    regex += '(?P<p%d>%s)' % (
+                        len(names), parameters.get(name) or '[^/]+')
+                    names.append(name)
+            checks.append((position, re.compile(regex + r'\Z'),
+                           range(first, len(names))))
+        node.templates.append((resource, names, checks))
+
+    def _walk(self, node, segments, position):
+        # Yields the templates matching the literal segments of the path,
+        # trying literal edges before wildcard edges.
+        if position == len(segments):
+            for template in node.templates:
+                yield template
+            return
+        segment = segments[position]
+        child = node.literals.get(segment)
+        if child:
+            for template in self._walk(child, segments, position + 1):
+                yield template
+        if node.wildcard and segment:
+            for template in self._walk(node.wildcard, segments,
+                                       position + 1):
+                yield template
+
+    def match(self, path):
+        """
+        Returns a ``(resource, parameters)`` tuple for the first template
+        matching ``path``, or ``None``.
+        """
+        segments = path.split('/')
+        for resource, names, checks in self._walk(self._root, segments, 0):
+            parameters = {}
+            for position, check, indexes in checks:
+                m = check.match(segments[position])
+                if not m:
+                    break
+                for index in indexes:
+                    parameters[names[index]] = m.group('p%d' % index)
+            else:
+                return resource, parameters
+        return None
+
+
 def get_common_metadata(provider):
     """
     Get a project's commonInstanceMetadata entry
@@ -31,7 +444,7 @@ def get_common_metadata(provider):
     return metadata["commonInstanceMetadata"]
 
 
-def __if_fingerprint_differs(e):
+def _if_fingerprint_differs(e):
     # return True if the CloudError exception is due to subnet being in use
     if isinstance(e, HttpError):
         expected_message = 'Supplied fingerprint does not match current ' \
@@ -42,31 +455,238 @@ def __if_fingerprint_differs(e):
     return False
 
 
-@tenacity.retry(stop=tenacity.stop_after_attempt(10),
-                retry=tenacity.retry_if_exception(__if_fingerprint_differs),
-                wait=tenacity.wait_exponential(max=10),
-                reraise=True)
+# Seconds for which reads of the project metadata are served from the cache.
+# Other clients may change the metadata at any time, so reads are not cached
+# unless a provider opts in.
+DEFAULT_METADATA_CACHE_TTL = 0
+
+
+def regex_literal_prefix(pattern):
+    """
+    Returns the literal prefix of a regex anchored with ``^``, which every
+    matching string starts with, or an empty string if there is none.
+    """
+    pattern = getattr(pattern, 'pattern', pattern)
+    if not pattern.startswith('^'):
+        return ''
+    prefix = re.match(r'[^.^$*+?{}\[\]\\|()]*', pattern[1:]).group(0)
+    if pattern[1 + len(prefix):1 + len(prefix) + 1] in ('*', '?', '{'):
+        # the last character is quantified, so may be absent
+        prefix = prefix[:-1]
+    return prefix
+
+
+class GCPMetadataStore(object):
+    """
+    A cache of a project's ``commonInstanceMetadata``, in which CloudBridge
+    stores key pairs and the labels of firewalls, networks and subnets.
+
+    Items are indexed by key, and reads are served from the cache until it
+    is older than ``ttl`` seconds, or never if ``ttl`` is zero. Changes are
+    made by queuing mutations, i.e. callables that modify the metadata
+    document in place. Mutations queued before a flush, whether by
+    concurrent threads or inside :meth:`deferred`, are applied in order and
+    saved with a single write. GCP rejects writes made with an outdated
+    fingerprint, in which case the document is refetched and the mutations
+    are applied again.
+    """
+
+    def __init__(self, provider, ttl=DEFAULT_METADATA_CACHE_TTL):
+        self._provider = provider
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._fetch_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._local = threading.local()
+        self._pending = []
+        self._metadata = None
+        self._fetched_at = 0
+        # whether the cached fingerprint is known to be outdated
+        self._stale = True
+        self._by_key = {}
+        self._keys = []
+
+    def _set(self, metadata, stale=False):
+        by_key = {}
+        for position, item in enumerate(metadata.get('items', [])):
+            by_key.setdefault(item['key'], []).append((position, item))
+        keys = sorted(by_key)
+        with self._lock:
+            self._metadata = metadata
+            self._by_key = by_key
+            self._keys = keys
+            self._fetched_at = time.time()
+            self._stale = stale
+        return metadata, by_key, keys
+
+    def _cached(self):
+        # Returns the cached metadata, index and keys, or None if they
+        # must be fetched again. Must be called with the lock held.
+        if self._metadata is None or (
+                self._ttl is not None and
+                time.time() - self._fetched_at >= self._ttl):
+            return None
+        return self._metadata, self._by_key, self._keys
+
+    def _current(self):
+        with self._lock:
+            cached = self._cached()
+        if cached:
+            return cached
+        if not self._ttl:
+            # nothing is cached, so there is no fetch to share
+            return self._set(get_common_metadata(self._provider))
+        with self._fetch_lock:
+            # another thread may have fetched the metadata in the meantime
+            with self._lock:
+                cached = self._cached()
+            if cached:
+                return cached
+            return self._set(get_common_metadata(self._provider))
+
+    @property
+    def metadata(self):
+        return self._current()[0]
+
+    def get(self, key):
+        """
+        Returns the value of the last item with a given key, or ``None``.
+        """
+        items = self._current()[1].get(key)
+        return items[-1][1]['value'] if items else None
+
+    def find(self, key_regex):
+        """
+        Returns the items whose keys match a regex, in document order. Only
+        keys starting with the literal prefix of an anchored regex are
+        searched.
+        """
+        _, by_key, keys = self._current()
+        prefix = regex_literal_prefix(key_regex)
+        matches = []
+        for key in keys[bisect.bisect_left(keys, prefix):]:
+            if not key.startswith(prefix):
+                break
+            if re.search(key_regex, key):
+                matches.extend(by_key[key])
+        return [item for _, item in sorted(matches, key=lambda m: m[0])]
+
+    def update(self, mutation):
+        """
+        Queues a mutation of the metadata document and, unless inside
+        :meth:`deferred`, saves it along with any other queued mutations.
+
+        :return: The return value of the mutation, or ``None`` if deferred.
+        """
+        future = Future()
+        with self._lock:
+            self._pending.append((mutation, future))
+        if getattr(self._local, 'depth', 0):
+            self._local.futures.append(future)
+            return None
+        self.flush()
+        return future.result()
+
+    @contextmanager
+    def deferred(self):
+        """
+        Saves the mutations queued by the current thread inside the ``with``
+        block once it exits, with a single write. The mutations are dropped
+        if the block raises an exception. Reads inside the block do not
+        reflect the queued mutations.
+        """
+        depth = getattr(self._local, 'depth', 0)
+        if not depth:
+            self._local.futures = []
+        self._local.depth = depth + 1
+        try:
+            yield self
+        except Exception:
+            if not depth:
+                futures = set(self._local.futures)
+                with self._lock:
+                    self._pending = [entry for entry in self._pending
+                                     if entry[1] not in futures]
+            raise
+        finally:
+            self._local.depth = depth
+        if not depth:
+            self.flush()
+            for future in self._local.futures:
+                # raise the first error
+                future.result()
+
+    def flush(self):
+        """
+        Saves all queued mutations with a single write. The outcome of each
+        mutation is set on the future it was queued with.
+        """
+        with self._write_lock:
+            with self._lock:
+                pending, self._pending = self._pending, []
+            if not pending:
+                return
+            try:
+                results = self._write(pending)
+            except Exception as e:
+                # the state of the metadata is unknown
+                with self._lock:
+                    self._metadata = None
+                for _, future in pending:
+                    future.set_exception(e)
+                return
+            for (_, future), (value, error) in zip(pending, results):
+                if error:
+                    future.set_exception(error)
+                else:
+                    future.set_result(value)
+
+    @tenacity.retry(stop=tenacity.stop_after_attempt(10),
+                    retry=tenacity.retry_if_exception(
+                        _if_fingerprint_differs),
+                    wait=tenacity.wait_exponential(max=10),
+                    reraise=True)
+    def _write(self, pending):
+        with self._lock:
+            original, stale = self._metadata, self._stale
+        if original is None or stale:
+            # get the latest metadata (so we get the latest fingerprint)
+            original = self._set(get_common_metadata(self._provider))[0]
+        metadata = original
+        results = []
+        for mutation, _ in pending:
+            # A failing mutation must not leave partial changes behind
+            candidate = copy.deepcopy(metadata)
+            try:
+                results.append((mutation(candidate), None))
+                metadata = candidate
+            except Exception as e:
+                results.append((None, e))
+        if metadata == original:
+            return results
+        try:
+            operation = gcp_projects(self._provider).setCommonInstanceMetadata(
+                project=self._provider.project_name, body=metadata).execute()
+        except HttpError:
+            with self._lock:
+                self._stale = True
+            raise
+        self._provider.wait_for_operation(operation)
+        # The write changed the fingerprint, which is only known after the
+        # metadata is fetched again.
+        self._set(metadata, stale=True)
+        return results
+
+
 def gcp_metadata_save_op(provider, callback):
     """
     Carries out a metadata save operation. In GCP, a fingerprint based
-    locking mechanism is used to prevent lost updates. A new fingerprint
-    is returned each time metadata is retrieved. Therefore, this method
-    retrieves the metadata, invokes the provided callback with that
-    metadata, and saves the metadata using the original fingerprint
-    immediately afterwards, ensuring that update conflicts can be detected.
-    """
-    def _save_common_metadata(provider):
-        # get the latest metadata (so we get the latest fingerprint)
-        metadata = get_common_metadata(provider)
-        # allow callback to do processing on it
-        callback(metadata)
-        # save the metadata
-        operation = gcp_projects(provider).setCommonInstanceMetadata(
-            project=provider.project_name, body=metadata).execute()
-        provider.wait_for_operation(operation)
-
-    # Retry a few times if the fingerprints conflict
-    _save_common_metadata(provider)
+    locking mechanism is used to prevent lost updates. The callback is
+    invoked with the latest metadata, which is then saved with the
+    fingerprint it was retrieved with, through the provider's
+    :class:`GCPMetadataStore`.
+    """
+    return provider.metadata_store.update(callback)
 
 
 def modify_or_add_metadata_item(provider, key, value):
@@ -85,14 +705,16 @@ def modify_or_add_metadata_item(provider, key, value):
     gcp_metadata_save_op(provider, _update_metadata_key)
 
 
-# This function will raise an HttpError with message containing
-# "Metadata has duplicate key" if it's not unique, unlike the previous
-# method which either adds or updates the value corresponding to that key
+# This function will raise a DuplicateResourceException if the key is not
+# unique, unlike the previous method which either adds or updates the value
+# corresponding to that key
 def add_metadata_item(provider, key, value):
     def _add_metadata_key(metadata):
-        entry = {'key': key, 'value': value}
         entries = metadata.get('items', [])
-        entries.append(entry)
+        if any(item['key'] == key for item in entries):
+            raise DuplicateResourceException(
+                "Metadata has duplicate key {0}".format(key))
+        entries.append({'key': key, 'value': value})
         # Reassign explicitly in case the original get returned [] although
         # if not it will be already updated
         metadata['items'] = entries
@@ -101,22 +723,11 @@ def add_metadata_item(provider, key, value):
 
 
 def find_matching_metadata_items(provider, key_regex):
-    metadata = get_common_metadata(provider)
-    items = metadata.get('items', [])
-    if not items:
-        return []
-    return [item for item in items
-            if re.search(key_regex, item['key'])]
+    return provider.metadata_store.find(key_regex)
 
 
 def get_metadata_item_value(provider, key):
-    metadata = get_common_metadata(provider)
-    entries = [item['value'] for item in metadata.get('items', [])
-               if item['key'] == key]
-    if entries:
-        return entries[-1]
-    else:
-        return None
+    return provider.metadata_store.get(key)
 
 
 def remove_metadata_item(provider, key):
@@ -141,8 +752,8 @@ def remove_metadata_item(provider, key):
             else:
                 metadata['items'] = entries
 
-    gcp_metadata_save_op(provider, _remove_metadata_by_key)
-    return True
+    return gcp_metadata_save_op(
+        provider, _remove_metadata_by_key) is not False
 
 
 def __if_label_fingerprint_differs(e):
@@ -163,7 +774,9 @@ def __if_label_fingerprint_differs(e):
                 reraise=True)
 def change_label(resource, key, value, res_att, request):
     resource.assert_valid_resource_label(value)
-    labels = getattr(resource, res_att).get("labels", {})
+    # Labels are changed in place, so that successive changes queued in a
+    # batch are merged into the last request
+    labels = getattr(resource, res_att).setdefault("labels", {})
     # The returned value from above command yields a unicode dict key, which
     # cannot be simply cast into a str for py2 so pop the key and re-add it
     # The casting needs to be done for all labels, as to support both
@@ -177,11 +790,15 @@ def change_label(resource, key, value, res_att, request):
         "labelFingerprint":
             str(getattr(resource, res_att).get('labelFingerprint')),
     }
+    request.body = str(request_body)
+    request.body_size = len(str(request_body))
+    # pylint:disable=protected-access
+    batch = resource._provider.current_batch
+    if batch:
+        batch.change_labels(resource, request)
+        return
     try:
-        request.body = str(request_body)
-        request.body_size = len(str(request_body))
         response = request.execute()
-        # pylint:disable=protected-access
         resource._provider.wait_for_operation(
             response, zone=getattr(resource, 'zone_name', None))
     finally:
@@ -2,12 +2,15 @@
 Provider implementation based on google-api-python-client library
 for GCP.
 """
+import functools
 import json
 import logging
 import os
 import re
+import threading
 import time
-from string import Template
+from collections import OrderedDict
+from contextlib import contextmanager
 
 import googleapiclient
 from googleapiclient import discovery
@@ -22,8 +25,21 @@ from google.auth.credentials import with_scopes_if_required
 from google.oauth2.service_account import Credentials
 
 from cloudbridge.base import BaseCloudProvider
+from cloudbridge.base.middleware import RateLimitMiddleware
+from cloudbridge.base.middleware import cache_bypassed
+from cloudbridge.base.polling import PollSchedule
 from cloudbridge.interfaces.exceptions import ProviderConnectionException
-
+from cloudbridge.interfaces.exceptions import ProviderInternalException
+from cloudbridge.interfaces.exceptions import WaitStateException
+
+from .helpers import DEFAULT_METADATA_CACHE_TTL
+from .helpers import GCPMetadataStore
+from .helpers import ResourcePathTrie
+from .helpers import throttle_delay
+from .resources import GCPInstance
+from .resources import GCPMachineImage
+from .resources import GCPSnapshot
+from .resources import GCPVolume
 from .services import GCPComputeService
 from .services import GCPDnsService
 from .services import GCPNetworkingService
@@ -34,6 +50,29 @@ log = logging.getLogger(__name__)
 
 CLOUD_SCOPES = ['https://www.googleapis.com/auth/cloud-platform']
 
+# Schedules for polling operations, keyed on the type of resource the
+# operation targets. Firewall changes typically complete within a second or
+# two, while snapshots and images can take several minutes.
+DEFAULT_OPERATION_POLL_SCHEDULE = PollSchedule(initial_interval=0.5,
+                                               max_interval=5)
+OPERATION_POLL_SCHEDULES = {
+    'firewalls': PollSchedule(initial_interval=0.25, max_interval=2),
+    'snapshots': PollSchedule(initial_interval=2, max_interval=30),
+    'images': PollSchedule(initial_interval=2, max_interval=30),
+}
+
+# The number of parsed resource URLs remembered by each GCPResources object.
+URL_MEMO_SIZE = 4096
+
+# The maximum number of requests that GCP accepts in a single batch.
+GCP_BATCH_LIMIT = 1000
+
+# The number of times a batched request is sent while it is throttled or
+# fails with a server error. Unlike single requests, the parts of a batch
+# are not retried by the Google API client.
+GCP_BATCH_MAX_ATTEMPTS = 5
+
+
 class GCPResourceUrl(object):
 
     def __init__(self, resource, connection):
@@ -64,8 +103,15 @@ class GCPResourceUrl(object):
                      'https://www.googleapis.com/compute/v1/projects/galaxy-on-gcp/regions/us-central1/subnetworks/testsubnet-2',
              'privateIpGoogleAccess': false}
         """
+        return self.request().execute()
+
+    def request(self, method='get'):
+        """
+        Build, but do not execute, a request calling the given method of the
+        resource, e.g. ``get`` or ``delete``.
+        """
         discovery_object = getattr(self._connection, self._resource)()
-        return discovery_object.get(**self.parameters).execute()
+        return getattr(discovery_object, method)(**self.parameters)
 
 
 class GCPResources(object):
@@ -116,6 +162,10 @@ class GCPResources(object):
             r"(https://.*\.googleapis\.com/{0})(.*)".format(
                 desc['servicePath']))
         self._resources = {}
+        self._paths = ResourcePathTrie()
+        self._memo = OrderedDict()
+        self._memo_size = URL_MEMO_SIZE
+        self._memo_lock = threading.Lock()
 
         # We will not mutate self._desc; it's OK to use items() in Python 2.x.
         for resource, resource_desc in desc['resources'].items():
@@ -125,22 +175,13 @@ class GCPResources(object):
             method = methods['get']
             parameters = method['parameterOrder']
 
-            # We would like to change a path like
-            # {project}/regions/{region}/addresses/{address} to a pattern like
-            # (PROJECT REGEX)/regions/(REGION REGEX)/addresses/(ADDRESS REGEX).
-            template = Template('${'.join(method['path'].split('{')))
-            mapping = {}
-            for parameter in parameters:
-                parameter_desc = method['parameters'][parameter]
-                if 'pattern' in parameter_desc:
-                    mapping[parameter] = '(%s)' % parameter_desc['pattern']
-                else:
-                    mapping[parameter] = '([^/]+)'
-            pattern = template.substitute(**mapping)
-
-            # Store the parameters and the regex pattern of this resource.
-            self._resources[resource] = {'parameters': parameters,
-                                         'pattern': re.compile(pattern)}
+            # A path like {project}/regions/{region}/addresses/{address} is
+            # added to a trie of path segments, along with the pattern of
+            # each parameter.
+            self._paths.add(resource, method['path'], {
+                parameter: method['parameters'][parameter].get('pattern')
+                for parameter in parameters})
+            self._resources[resource] = {'parameters': parameters}
 
     def parse_url(self, url):
         """
@@ -159,20 +200,30 @@ class GCPResources(object):
             {'project': 'galaxy-on-gcp',
              'region': 'us-central1',
              'subnetwork': 'testsubnet-2'}
-        """
-        url = url.strip()
-        m = self.RESOURCE_REGEX.match(url)
-        if m:
-            url = m.group(2)
 
-        for resource, desc in self._resources.items():
-            m = re.match(desc['pattern'], url)
-            if m is None or len(m.group(0)) < len(url):
-                continue
-            out = GCPResourceUrl(resource, self._connection)
-            for index, parameter in enumerate(desc['parameters']):
-                out.parameters[parameter] = m.group(index + 1)
-            return out
+        The parameters of recently parsed URLs are remembered, since the
+        same URLs, such as a network shared by many firewalls, are parsed
+        repeatedly.
+        """
+        with self._memo_lock:
+            match = self._memo.get(url, self._memo)
+            if match is not self._memo:
+                self._memo.move_to_end(url)
+        if match is self._memo:
+            path = url.strip()
+            m = self.RESOURCE_REGEX.match(path)
+            if m:
+                path = m.group(2)
+            match = self._paths.match(path)
+            with self._memo_lock:
+                self._memo[url] = match
+                if len(self._memo) > self._memo_size:
+                    self._memo.popitem(last=False)
+        if match is None:
+            return None
+        out = GCPResourceUrl(match[0], self._connection)
+        out.parameters.update(match[1])
+        return out
 
     def get_resource_url_with_default(self, resource, url_or_name, **kwargs):
         """
@@ -200,6 +251,324 @@ class GCPResources(object):
         return parsed_url
 
 
+class GCPHttpTransport(object):
+    """
+    An HTTP transport that sends each request through an authorized
+    ``httplib2.Http`` object belonging to the calling thread. Since
+    ``httplib2.Http`` objects are not thread safe, they are never shared
+    between threads, but each thread keeps its connections alive across
+    requests, instead of opening a new connection for every request. All
+    threads share the same credentials, so a token refreshed by one thread
+    is used by all.
+
+    Requests hold on to the transport rather than to a thread's Http object,
+    so a request can be built in one thread and executed in another, e.g.
+    in a worker pool.
+    """
+
+    def __init__(self, credentials, http_factory=httplib2.Http):
+        self.credentials = credentials
+        self._http_factory = http_factory
+        self._local = threading.local()
+
+    @property
+    def http(self):
+        """
+        The authorized Http object of the current thread.
+        """
+        http = getattr(self._local, 'http', None)
+        if http is None:
+            http = google_auth_httplib2.AuthorizedHttp(
+                self.credentials, http=self._http_factory())
+            self._local.http = http
+        return http
+
+    def request(self, *args, **kwargs):
+        return self.http.request(*args, **kwargs)
+
+    def __getattr__(self, name):
+        # Other attributes, e.g. redirect_codes, come from the thread's Http
+        return getattr(self.http, name)
+
+
+def _fetch_discovery_document(service_name, version):
+    """
+    Fetches the discovery document of a Google API, e.g. ``compute`` ``v1``,
+    as JSON text. Discovery documents are public, so are fetched without
+    credentials.
+    """
+    uri = discovery.DISCOVERY_URI.format(api=service_name,
+                                         apiVersion=version)
+    request = googleapiclient.http.HttpRequest(
+        httplib2.Http(), googleapiclient.http.HttpRequest.null_postproc, uri)
+    _, content = request.execute(num_retries=3)
+    return content.decode('utf-8') if isinstance(content, bytes) else content
+
+
+def _is_not_found(error):
+    return (isinstance(error, googleapiclient.errors.HttpError) and
+            error.resp.status == 404)
+
+
+def _batch_retry_delay(error):
+    # The number of seconds to wait before resending a batched request, or
+    # None if it failed for good
+    delay = throttle_delay(error)
+    if (delay is None and
+            isinstance(error, googleapiclient.errors.HttpError) and
+            int(error.resp.status) >= 500):
+        delay = 0
+    return delay
+
+
+class GCPBatchResult(object):
+    """
+    The outcome of a request queued in a :class:`GCPBatch`, which is
+    available once the batch has been sent.
+    """
+
+    def __init__(self):
+        self.done = False
+        self.value = None
+        self.error = None
+
+    def result(self):
+        """
+        Returns the CloudBridge object fetched by the request, or ``None`` if
+        the object does not exist. Raises the error the request failed with,
+        if any.
+        """
+        if not self.done:
+            raise ProviderInternalException(
+                "The batch holding this request has not been sent yet.")
+        if self.error:
+            raise self.error
+        return self.value
+
+
+class GCPBatch(object):
+    """
+    Queues requests to the compute API, and sends them in multipart batches
+    of up to ``GCP_BATCH_LIMIT`` requests when executed. Batches are created
+    through :meth:`GCPCloudProvider.batch`, inside of which the services
+    queue deletes, label changes and refreshes of instances, volumes,
+    snapshots and images here instead of sending them one at a time.
+    """
+
+    # The CloudBridge types of the resources that can be fetched in batches
+    RESOURCE_TYPES = {'instances': GCPInstance,
+                      'disks': GCPVolume,
+                      'snapshots': GCPSnapshot,
+                      'images': GCPMachineImage}
+
+    def __init__(self, provider):
+        self._provider = provider
+        self._queued = OrderedDict()
+        self._operations = []
+        self._errors = []
+
+    def _url(self, resource, url_or_name):
+        # pylint:disable=protected-access
+        url = self._provider._compute_resources.get_resource_url_with_default(
+            resource, url_or_name)
+        if url is None:
+            raise ProviderInternalException(
+                "Unknown resource: {0}".format(resource))
+        return url
+
+    def _add(self, request, handler, key=None, raise_errors=True):
+        # A request replaces any queued request with the same key, e.g.
+        # successive label changes to a resource, or deletes of a resource.
+        result = GCPBatchResult()
+        key = key or id(result)
+        self._queued.pop(key, None)
+        self._queued[key] = (request, handler, result, raise_errors)
+        return result
+
+    def get(self, resource, url_or_name):
+        """
+        Queues a request fetching a resource, e.g. ``instances``, by its URL
+        or name.
+
+        :rtype: :class:`GCPBatchResult`
+        :return: The pending result, whose ``result()`` is the CloudBridge
+                 object, or ``None`` if it does not exist.
+        """
+        resource_type = self.RESOURCE_TYPES[resource]
+
+        def handler(response, error):
+            if _is_not_found(error):
+                return None
+            if error:
+                raise error
+            return resource_type(self._provider, response)
+
+        return self._add(self._url(resource, url_or_name).request(), handler,
+                         raise_errors=False)
+
+    def delete(self, resource, url_or_name):
+        """
+        Queues a request deleting a resource by its URL or name. Resources
+        that do not exist are ignored.
+        """
+        url = self._url(resource, url_or_name)
+
+        def handler(response, error):
+            if error and not _is_not_found(error):
+                raise error
+
+        return self._add(
+            url.request('delete'), handler,
+            key=('delete', resource, tuple(sorted(url.parameters.items()))))
+
+    def refresh(self, resource, res_att, unknown_status):
+        """
+        Queues a request refreshing a CloudBridge resource, whose resource
+        dict is held in its ``res_att`` attribute.
+        """
+        url = self._provider.parse_url(resource.id)
+
+        def handler(response, error):
+            if _is_not_found(error):
+                # resource no longer exists
+                getattr(resource, res_att)['status'] = unknown_status
+            elif error:
+                raise error
+            else:
+                setattr(resource, res_att, response)
+
+        return self._add(url.request(), handler,
+                         key=('refresh', id(resource)))
+
+    def change_labels(self, resource, request):
+        """
+        Queues a request setting the labels of a resource. Once the
+        operation completes, the resource is refreshed.
+        """
+        def handler(response, error):
+            if error:
+                resource.refresh()
+                raise error
+            self._operations.append((response, resource.refresh))
+
+        return self._add(request, handler, key=('labels', id(resource)))
+
+    def _poll(self, then, response, error):
+        if error:
+            raise error
+        if response['status'] != 'DONE':
+            self._operations.append((response, then))
+            return
+        then()
+        if 'error' in response:
+            error = ProviderInternalException(
+                "Operation {0} failed: {1}".format(response.get('name'),
+                                                   response['error']))
+            # The operation's error, as returned by the compute API
+            error.operation_error = response['error']
+            raise error
+
+    def _answer(self, entry, retries, request_id, response, error):
+        if error is not None and retries is not None:
+            delay = _batch_retry_delay(error)
+            if delay is not None:
+                # sent again in the next round
+                retries.append((entry, delay))
+                return
+        _, handler, result, raise_errors = entry
+        try:
+            result.value = handler(response, error)
+        except Exception as e:
+            result.error = e
+            if raise_errors:
+                self._errors.append(e)
+        result.done = True
+
+    def _rate_limit(self, count):
+        # Batched requests bypass the middleware, so each of them is
+        # charged to the provider's rate limits here
+        delay = 0
+        for middleware in self._provider.middleware.middleware_list:
+            limiter = getattr(middleware, 'obj_to_discover', middleware)
+            if isinstance(limiter, RateLimitMiddleware):
+                for _ in range(count):
+                    delay = max(delay,
+                                limiter.reserve("provider.compute.batch"))
+        if delay:
+            time.sleep(delay)
+
+    def _send(self, entries):
+        service = self._provider.gcp_compute
+        attempt = 1
+        delay = self._provider.retries.base_delay
+        while entries:
+            # Throttled requests, and those which failed with a server
+            # error, are retried until the last attempt
+            retries = [] if attempt < GCP_BATCH_MAX_ATTEMPTS else None
+            for i in range(0, len(entries), GCP_BATCH_LIMIT):
+                chunk = entries[i:i + GCP_BATCH_LIMIT]
+                self._rate_limit(len(chunk))
+                batch_request = service.new_batch_http_request()
+                for entry in chunk:
+                    batch_request.add(entry[0], callback=functools.partial(
+                        self._answer, entry, retries))
+                error = None
+                start = time.perf_counter()
+                try:
+                    batch_request.execute()
+                except Exception as e:
+                    error = e
+                    raise
+                finally:
+                    self._provider.metrics.record(
+                        "provider.compute.batch",
+                        time.perf_counter() - start, error)
+            if not retries:
+                return
+            delay = self._provider.retries.next_delay(delay)
+            wait = max([delay] + [hint for _, hint in retries])
+            log.debug("%s batched request(s) throttled, retrying in %.2f "
+                      "seconds", len(retries), wait)
+            time.sleep(wait)
+            entries = [entry for entry, _ in retries]
+            attempt += 1
+
+    def execute(self):
+        """
+        Sends the queued requests, along with any requests that their
+        responses lead to, such as polls of the operations started by label
+        changes. If any of the requests that are not gets fail, the first
+        error is raised once all requests have been sent.
+        """
+        wait = None
+        while self._queued or self._operations:
+            if not self._queued:
+                # Only operations are left, so poll them all in one batch
+                if not wait:
+                    wait = self._provider.poll_schedule(
+                        DEFAULT_OPERATION_POLL_SCHEDULE).start(
+                            self._provider.config.default_wait_timeout)
+                if not wait.sleep():
+                    raise WaitStateException(
+                        "Waited too long for {0} operation(s) to complete."
+                        .format(len(self._operations)))
+                operations, self._operations = self._operations, []
+                for operation, then in operations:
+                    self._add(
+                        self._provider.parse_url(
+                            operation['selfLink']).request(),
+                        functools.partial(self._poll, then))
+            queued, self._queued = list(self._queued.values()), OrderedDict()
+            self._send(queued)
+        if wait:
+            wait.finish()
+        errors, self._errors = self._errors, []
+        for error in errors[1:]:
+            log.warning("Batched request failed: %s", error)
+        if errors:
+            raise errors[0]
+
+
 class GCPCloudProvider(BaseCloudProvider):
 
     PROVIDER_ID = 'gcp'
@@ -241,6 +610,10 @@ class GCPCloudProvider(BaseCloudProvider):
         else:
             self.project_name = os.environ.get('GCP_PROJECT_NAME')
 
+        # Credentials objects supplied by the caller are kept when the
+        # connections are invalidated
+        self._credentials_supplied = bool(self.credentials_obj)
+
         # service connections, lazily initialized
         self._gcp_compute = None
         self._gcp_storage = None
@@ -248,6 +621,9 @@ class GCPCloudProvider(BaseCloudProvider):
         self._compute_resources_cache = None
         self._storage_resources_cache = None
         self._dns_resources_cache = None
+        # holds the batch of the current thread, see batch()
+        self._batch_local = threading.local()
+        self._metadata_store = None
 
         # Initialize provider services
         self._compute = GCPComputeService(self)
@@ -328,12 +704,14 @@ class GCPCloudProvider(BaseCloudProvider):
     def _credentials(self):
         if not self.credentials_obj:
             if self.credentials_dict:
-                self.credentials_obj = (
-                        ServiceAccountCredentials.from_json_keyfile_dict(
-                                self.credentials_dict))
+                self.credentials_obj = self._get_pooled(
+                    'credentials',
+                    lambda: ServiceAccountCredentials.from_json_keyfile_dict(
+                        self.credentials_dict),
+                    self.credentials_dict)
             else:
-                self.credentials_obj = (
-                        GoogleCredentials.get_application_default())
+                self.credentials_obj = self._get_pooled(
+                    'credentials', GoogleCredentials.get_application_default)
         return self.credentials_obj
 
     def sign_blob(self, string_to_sign):
@@ -344,34 +722,64 @@ class GCPCloudProvider(BaseCloudProvider):
         return self._credentials.service_account_email
 
     def _get_build_request(self):
-        credentials = Credentials.from_service_account_info(self.credentials_dict)
+        credentials = Credentials.from_service_account_info(
+            self.credentials_dict)
         credentials = with_scopes_if_required(credentials, list(CLOUD_SCOPES))
-        # FROM: https://github.com/googleapis/google-api-python-client/blob/master/docs/thread_safety.md
-        # Create a new Http() object for every request
+        # httplib2.Http objects are not thread safe. See:
+        # https://github.com/googleapis/google-api-python-client/blob/master/docs/thread_safety.md
+        # Instead of creating a new Http() object, with a new connection, for
+        # every request, each thread reuses its own.
+        transport = GCPHttpTransport(credentials)
+
         def build_request(http, *args, **kwargs):
-          new_http = google_auth_httplib2.AuthorizedHttp(credentials, http=httplib2.Http())
-          return googleapiclient.http.HttpRequest(new_http, *args, **kwargs)
+            return googleapiclient.http.HttpRequest(transport, *args, **kwargs)
         return build_request
 
+    def _throttle_delay(self, exception):
+        return throttle_delay(exception)
+
+    def _build_service(self, service_name, version):
+        # Discovery documents do not depend on the credentials, so each is
+        # only fetched once per process. Every provider builds its own
+        # service from the document, with its own credentials and request
+        # builder. build_from_document adds to the parsed document as it
+        # creates methods, so each service is built from its own parse of
+        # the document, rather than from a shared one.
+        document = self._get_pooled(
+            'discovery',
+            lambda: _fetch_discovery_document(service_name, version),
+            service_name, version)
+        return discovery.build_from_document(
+            document, credentials=self._credentials,
+            requestBuilder=self._get_build_request())
+
     def _connect_gcp_storage(self):
-        return discovery.build('storage', 'v1', credentials=self._credentials,
-                               cache_discovery=False,
-                               requestBuilder=self._get_build_request()
-                               )
+        return self._build_service('storage', 'v1')
 
     def _connect_gcp_compute(self):
-        return discovery.build('compute', 'v1', credentials=self._credentials,
-                               cache_discovery=False,
-                               requestBuilder=self._get_build_request()
-                               )
+        return self._build_service('compute', 'v1')
 
     def _connect_gcp_dns(self):
-        return discovery.build('dns', 'v1', credentials=self._credentials,
-                               cache_discovery=False,
-                               requestBuilder=self._get_build_request()
-                               )
+        return self._build_service('dns', 'v1')
 
-    def wait_for_operation(self, operation, region=None, zone=None):
+    def invalidate_connections(self):
+        super(GCPCloudProvider, self).invalidate_connections()
+        if not self._credentials_supplied:
+            self.credentials_obj = None
+        self._gcp_compute = None
+        self._gcp_storage = None
+        self._gcp_dns = None
+        self._compute_resources_cache = None
+        self._storage_resources_cache = None
+        self._dns_resources_cache = None
+
+    def wait_for_operation(self, operation, region=None, zone=None,
+                           schedule=None):
+        """
+        Polls an operation till it is done, following the given poll
+        schedule or, if none is given, the schedule registered for the type
+        of resource targeted by the operation in OPERATION_POLL_SCHEDULES.
+        """
         args = {'project': self.project_name, 'operation': operation['name']}
         if not region and not zone:
             operations = self.gcp_compute.globalOperations()
@@ -382,14 +790,93 @@ class GCPCloudProvider(BaseCloudProvider):
             operations = self.gcp_compute.regionOperations()
             args['region'] = region
 
+        if not schedule:
+            # targetLinks end in .../<resource type>/<resource name>
+            target_type = operation.get('targetLink', '').split('/')[-2:-1]
+            schedule = self.poll_schedule(OPERATION_POLL_SCHEDULES.get(
+                target_type[0] if target_type else None,
+                DEFAULT_OPERATION_POLL_SCHEDULE))
+        wait = schedule.start(self.config.default_wait_timeout)
         while True:
             result = operations.get(**args).execute()
             if result['status'] == 'DONE':
+                wait.finish()
                 if 'error' in result:
                     raise Exception(result['error'])
                 return result
 
-            time.sleep(0.5)
+            if not wait.sleep():
+                raise WaitStateException(
+                    "Waited too long for operation: {0} to complete. It's "
+                    "still in state: {1}".format(operation['name'],
+                                                 result['status']))
+
+    @property
+    def metadata_store(self):
+        """
+        The :class:`GCPMetadataStore` caching the project's common instance
+        metadata. Reads are cached for ``metadata_cache_ttl`` seconds, and
+        are not cached by default.
+        """
+        if not self._metadata_store:
+            self._metadata_store = GCPMetadataStore(
+                self, ttl=self.config.get('metadata_cache_ttl',
+                                          DEFAULT_METADATA_CACHE_TTL))
+        return self._metadata_store
+
+    @property
+    def current_batch(self):
+        """
+        The :class:`GCPBatch` that requests made by the current thread are
+        queued in, or ``None`` outside of :meth:`batch`.
+        """
+        return getattr(self._batch_local, 'batch', None)
+
+    @property
+    def refresh_batch(self):
+        """
+        The :class:`GCPBatch` that refreshes made by the current thread are
+        queued in, or ``None`` if they must be sent straight away. Refreshes
+        are never queued within :func:`.bypass_cache`, in which waits poll
+        resources, since they must see the latest state at once.
+        """
+        return None if cache_bypassed() else self.current_batch
+
+    @contextmanager
+    def batch(self):
+        """
+        Queues the deletes, label changes and refreshes of instances,
+        volumes, snapshots and images made by the current thread inside the
+        ``with`` block, and sends them in batches when the block exits.
+        Requests are not sent if the block raises an exception. Resources
+        can be fetched in the same batches through ``batch.get()``. Waits
+        are not batched, and poll straight away, but cannot see the outcome
+        of queued changes until the block exits.
+
+        Example:
+
+        .. code-block:: python
+
+            with provider.batch() as batch:
+                for vol in provider.storage.volumes.find(label='scratch'):
+                    vol.delete()
+                pending = [batch.get('instances', name) for name in names]
+            instances = [p.result() for p in pending]
+        """
+        if self.current_batch:
+            # Nested batches are sent with the outermost batch
+            yield self.current_batch
+            return
+        batch = GCPBatch(self)
+        self._batch_local.batch = batch
+        try:
+            # Changes to the project metadata, such as key pairs and the
+            # labels of firewalls and networks, are not batched, as their
+            # callers need the outcome straight away
+            yield batch
+            batch.execute()
+        finally:
+            self._batch_local.batch = None
 
     def parse_url(self, url):
         out = self._compute_resources.parse_url(url)
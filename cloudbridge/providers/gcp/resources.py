@@ -4,7 +4,6 @@ DataTypes used by this provider
 import base64
 import calendar
 import hashlib
-import inspect
 import io
 import logging
 import math
@@ -15,6 +14,7 @@ from collections import namedtuple
 
 import googleapiclient
 
+from cloudbridge.base.middleware import bypass_cache
 from cloudbridge.base.resources import BaseAttachmentInfo
 from cloudbridge.base.resources import BaseBucket
 from cloudbridge.base.resources import BaseBucketObject
@@ -209,7 +209,7 @@ class GCPFirewallsDelegate(object):
 
     def __init__(self, provider):
         self._provider = provider
-        self._list_response = None
+        self._index = None
 
     @staticmethod
     def tag_network_id(tag, network_name):
@@ -224,17 +224,25 @@ class GCPFirewallsDelegate(object):
     def provider(self):
         return self._provider
 
+    @property
+    def index(self):
+        """
+        The index of all firewalls, which is refetched once it is older than
+        the ``firewall_cache_ttl`` config value.
+        """
+        ttl = self._provider.config.get('firewall_cache_ttl',
+                                        helpers.DEFAULT_FIREWALL_CACHE_TTL)
+        if self._index is None or self._index.expired(ttl):
+            self._update_list_response()
+        return self._index
+
     @property
     def tag_networks(self):
         """
         List all (tag, network name) pairs that are in at least one firewall.
         """
-        out = set()
-        for firewall in self.iter_firewalls():
-            network_name = self.network_name(firewall)
-            if network_name is not None:
-                out.add((firewall['targetTags'][0], network_name))
-        return out
+        return set(pair for pair in self.index.by_tag_network
+                   if pair[1] is not None)
 
     def network_name(self, firewall):
         """
@@ -249,11 +257,10 @@ class GCPFirewallsDelegate(object):
         """
         Map an ID back to the (tag, network name) pair.
         """
-        for tag, network_name in self.tag_networks:
-            current_id = GCPFirewallsDelegate.tag_network_id(tag, network_name)
-            if current_id == tag_network_id:
-                return (tag, network_name)
-        return (None, None)
+        pair = self.index.by_tag_network_id.get(tag_network_id)
+        if pair is None or pair[1] is None:
+            return (None, None)
+        return pair
 
     def delete_tag_network_with_id(self, tag_network_id):
         """
@@ -264,7 +271,6 @@ class GCPFirewallsDelegate(object):
             return
         for firewall in self.iter_firewalls(tag, network_name):
             self._delete_firewall(firewall)
-        self._update_list_response()
 
     def add_firewall(self, tag, direction, protocol, priority, port,
                      src_dest_range, src_dest_tag, description, network_name):
@@ -314,8 +320,17 @@ class GCPFirewallsDelegate(object):
                             .execute())
             self._provider.wait_for_operation(response)
             # TODO: process the response and handle errors.
-        finally:
-            self._update_list_response()
+            self.index.add(self._provider
+                               .gcp_compute
+                               .firewalls()
+                               .get(project=project_name,
+                                    firewall=firewall['name'])
+                               .execute())
+        except Exception:
+            # The state of the firewall is unknown, so refetch all firewalls
+            # when next needed
+            self._index = None
+            raise
         return True
 
     def find_firewall(self, tag, direction, protocol, port, src_dest_range,
@@ -349,9 +364,8 @@ class GCPFirewallsDelegate(object):
         Extract firewall properties to into a dictionary for easy of use.
         """
         info = {}
-        for firewall in self.iter_firewalls():
-            if firewall['id'] != firewall_id:
-                continue
+        firewall = self.index.by_id.get(firewall_id)
+        if firewall is not None:
             if ('sourceRanges' in firewall and
                     len(firewall['sourceRanges']) == 1):
                 info['src_dest_range'] = firewall['sourceRanges'][0]
@@ -367,44 +381,28 @@ class GCPFirewallsDelegate(object):
             if ('ports' in firewall['allowed'][0] and
                     len(firewall['allowed'][0]['ports']) == 1):
                 info['port'] = firewall['allowed'][0]['ports'][0]
-            info['network_name'] = self.network_name(firewall)
+            info['network_name'] = self.index.pairs[firewall_id][1]
             if 'direction' in firewall:
                 info['direction'] = firewall['direction']
             if 'priority' in firewall:
                 info['priority'] = firewall['priority']
-            return info
         return info
 
     def delete_firewall_id(self, firewall_id):
         """
         Delete a firewall with a given ID.
         """
-        for firewall in self.iter_firewalls():
-            if firewall['id'] == firewall_id:
-                self._delete_firewall(firewall)
-        self._update_list_response()
+        firewall = self.index.by_id.get(firewall_id)
+        if firewall is not None:
+            self._delete_firewall(firewall)
 
     def iter_firewalls(self, tag=None, network_name=None):
         """
         Iterate through all firewalls. Can optionally iterate through firewalls
         with a given tag and/or in a network.
         """
-        if self._list_response is None:
-            self._update_list_response()
-        for firewall in self._list_response:
-            if ('targetTags' not in firewall or
-                    len(firewall['targetTags']) != 1):
-                continue
-            if 'allowed' not in firewall or len(firewall['allowed']) != 1:
-                continue
-            if tag is not None and firewall['targetTags'][0] != tag:
-                continue
-            if network_name is None:
-                yield firewall
-                continue
-            firewall_network_name = self.network_name(firewall)
-            if firewall_network_name == network_name:
-                yield firewall
+        for firewall in self.index.select(tag, network_name):
+            yield firewall
 
     def _delete_firewall(self, firewall):
         """
@@ -412,14 +410,19 @@ class GCPFirewallsDelegate(object):
         """
         project_name = self._provider.project_name
         name = firewall['name']
-        response = (self._provider
-                        .gcp_compute
-                        .firewalls()
-                        .delete(project=project_name,
-                                firewall=name)
-                        .execute())
-        self._provider.wait_for_operation(response)
-        # TODO: process the response and handle errors.
+        try:
+            response = (self._provider
+                            .gcp_compute
+                            .firewalls()
+                            .delete(project=project_name,
+                                    firewall=name)
+                            .execute())
+            self._provider.wait_for_operation(response)
+            # TODO: process the response and handle errors.
+        except Exception:
+            self._index = None
+            raise
+        self.index.remove(firewall['id'])
         tag_name = "_".join(["firewall", name, "label"])
         if not helpers.remove_metadata_item(self._provider, tag_name):
             log.warning('No label was found associated with this firewall '
@@ -430,9 +433,10 @@ class GCPFirewallsDelegate(object):
         """
         Sync the local cache of all firewalls with the server.
         """
-        self._list_response = list(
-                helpers.iter_all(self._provider.gcp_compute.firewalls(),
-                                 project=self._provider.project_name))
+        self._index = helpers.GCPFirewallIndex(
+            helpers.iter_all(self._provider.gcp_compute.firewalls(),
+                             project=self._provider.project_name),
+            self.network_name, GCPFirewallsDelegate.tag_network_id)
 
     def _check_list_in_dict(self, dictionary, field_name, value):
         """
@@ -533,13 +537,6 @@ class GCPVMFirewall(BaseVMFirewall):
     def rules(self):
         return self._rule_container
 
-    def to_json(self):
-        attr = inspect.getmembers(self, lambda a: not(inspect.isroutine(a)))
-        js = {k: v for(k, v) in attr if not k.startswith('_')}
-        json_rules = [r.to_json() for r in self.rules]
-        js['rules'] = json_rules
-        return js
-
     def refresh(self):
         fw = self._provider.security.vm_firewalls.get(self.id)
         # restore all internal state
@@ -762,6 +759,10 @@ class GCPMachineImage(BaseMachineImage):
         Refreshes the state of this instance by re-querying the cloud provider
         for its latest state.
         """
+        batch = self._provider.refresh_batch
+        if batch:
+            batch.refresh(self, '_gcp_image', MachineImageState.UNKNOWN)
+            return
         image = self._provider.compute.images.get(self.id)
         if image:
             # pylint:disable=protected-access
@@ -772,6 +773,13 @@ class GCPMachineImage(BaseMachineImage):
 
 
 class GCPInstance(BaseInstance):
+
+    JSON_REMOTE_FIELDS = (BaseInstance.JSON_REMOTE_FIELDS +
+                          ('image_id', 'key_pair_id'))
+    # Reading the gateway creates it when it does not exist
+    JSON_EXCLUDED_FIELDS = (BaseInstance.JSON_EXCLUDED_FIELDS +
+                            ('inet_gateway',))
+
     # https://cloud.google.com/compute/docs/reference/latest/instances
     # The status of the instance. One of the following values:
     # PROVISIONING, STAGING, RUNNING, STOPPING, SUSPENDING, SUSPENDED,
@@ -882,8 +890,7 @@ class GCPInstance(BaseInstance):
         machine_type_uri = self._gcp_instance.get('machineType')
         if machine_type_uri is None:
             return None
-        parsed_uri = self._provider.parse_url(machine_type_uri)
-        return GCPVMType(self._provider, parsed_uri.get_resource())
+        return self._provider.compute.vm_types.get(machine_type_uri)
 
     @property
     def subnet_id(self):
@@ -1236,6 +1243,10 @@ class GCPInstance(BaseInstance):
         Refreshes the state of this instance by re-querying the cloud provider
         for its latest state.
         """
+        batch = self._provider.refresh_batch
+        if batch:
+            batch.refresh(self, '_gcp_instance', InstanceState.UNKNOWN)
+            return
         inst = self._provider.compute.instances.get(self.id)
         if inst:
             # pylint:disable=protected-access
@@ -1244,6 +1255,13 @@ class GCPInstance(BaseInstance):
             # instance no longer exists
             self._gcp_instance['status'] = InstanceState.UNKNOWN
 
+    @classmethod
+    def _refresh_all(cls, resources):
+        # pylint:disable=protected-access
+        helpers.refresh_all(resources,
+                            resources[0]._provider.gcp_compute.instances(),
+                            '_gcp_instance', InstanceState.UNKNOWN)
+
     def add_vm_firewall(self, sg):
         tag = sg.name if isinstance(sg, GCPVMFirewall) else sg
         tags = self._gcp_instance.get('tags', {}).get('items', [])
@@ -1258,8 +1276,10 @@ class GCPInstance(BaseInstance):
             self._set_tags(tags)
 
     def _set_tags(self, tags):
-        # Refresh to make sure we are using the most recent tags fingerprint.
-        self.refresh()
+        # Refresh to make sure we are using the most recent tags fingerprint,
+        # which must be done straight away, even within a batch
+        with bypass_cache():
+            self.refresh()
         fingerprint = self._gcp_instance.get('tags', {}).get('fingerprint', '')
         response = (self._provider
                         .gcp_compute
@@ -1418,6 +1438,8 @@ class GCPFloatingIP(BaseFloatingIP):
 
 class GCPRouter(BaseRouter):
 
+    JSON_REMOTE_FIELDS = BaseRouter.JSON_REMOTE_FIELDS + ('network_id',)
+
     def __init__(self, provider, router):
         super(GCPRouter, self).__init__(provider)
         self._router = router
@@ -1777,6 +1799,10 @@ class GCPVolume(BaseVolume):
         Refreshes the state of this volume by re-querying the cloud provider
         for its latest state.
         """
+        batch = self._provider.refresh_batch
+        if batch:
+            batch.refresh(self, '_volume', VolumeState.UNKNOWN)
+            return
         vol = self._provider.storage.volumes.get(self.id)
         if vol:
             # pylint:disable=protected-access
@@ -1785,6 +1811,13 @@ class GCPVolume(BaseVolume):
             # volume no longer exists
             self._volume['status'] = VolumeState.UNKNOWN
 
+    @classmethod
+    def _refresh_all(cls, resources):
+        # pylint:disable=protected-access
+        helpers.refresh_all(resources,
+                            resources[0]._provider.gcp_compute.disks(),
+                            '_volume', VolumeState.UNKNOWN)
+
 
 class GCPSnapshot(BaseSnapshot):
 
@@ -1865,6 +1898,10 @@ class GCPSnapshot(BaseSnapshot):
         Refreshes the state of this snapshot by re-querying the cloud provider
         for its latest state.
         """
+        batch = self._provider.refresh_batch
+        if batch:
+            batch.refresh(self, '_snapshot', SnapshotState.UNKNOWN)
+            return
         snap = self._provider.storage.snapshots.get(self.id)
         if snap:
             # pylint:disable=protected-access
@@ -8,6 +8,7 @@ import uuid
 import googleapiclient
 
 from cloudbridge.base import helpers as cb_helpers
+from cloudbridge.base.catalog import DEFAULT_CATALOG_TTL
 from cloudbridge.base.middleware import dispatch
 from cloudbridge.base.resources import ClientPagedResultList
 from cloudbridge.base.resources import ServerPagedResultList
@@ -152,6 +153,9 @@ class GCPKeyPairService(BaseKeyPairService):
                                       GCPKeyPair.KP_TAG_PREFIX + name,
                                       metadata_value)
             return GCPKeyPair(self.provider, kp_info, private_key)
+        except DuplicateResourceException:
+            raise DuplicateResourceException(
+                'A KeyPair with name {0} already exists'.format(name))
         except googleapiclient.errors.HttpError as err:
             if err.resp.get('content-type', '').startswith('application/json'):
                 message = (json.loads(err.content).get('error', {})
@@ -320,6 +324,12 @@ class GCPVMTypeService(BaseVMTypeService):
 
     @property
     def instance_data(self):
+        return self._catalog_records()
+
+    def _catalog_scope(self):
+        return (self.provider.project_name, self.provider.zone_name)
+
+    def _fetch_vm_types(self):
         response = (self.provider
                         .gcp_compute
                         .machineTypes()
@@ -328,9 +338,16 @@ class GCPVMTypeService(BaseVMTypeService):
                         .execute())
         return response['items']
 
+    def _to_vm_type(self, record):
+        return GCPVMType(self.provider, record)
+
     @dispatch(event="provider.compute.vm_types.get",
               priority=BaseVMTypeService.STANDARD_EVENT_PRIORITY)
     def get(self, vm_type_id):
+        # the catalog is indexed by url, other ids are looked up
+        cb_vm_type = self.index.get(vm_type_id)
+        if cb_vm_type:
+            return cb_vm_type
         vm_type = self.provider.get_resource('machineTypes', vm_type_id)
         return GCPVMType(self.provider, vm_type) if vm_type else None
 
@@ -352,14 +369,6 @@ class GCPVMTypeService(BaseVMTypeService):
                     GCPVMType(self.provider, inst_type))
         return matched_inst_types
 
-    @dispatch(event="provider.compute.vm_types.list",
-              priority=BaseVMTypeService.STANDARD_EVENT_PRIORITY)
-    def list(self, limit=None, marker=None):
-        inst_types = [GCPVMType(self.provider, inst_type)
-                      for inst_type in self.instance_data]
-        return ClientPagedResultList(self.provider, inst_types,
-                                     limit=limit, marker=marker)
-
 
 class GCPRegionService(BaseRegionService):
 
@@ -402,33 +411,70 @@ class GCPImageService(BaseImageService):
 
     def __init__(self, provider):
         super(GCPImageService, self).__init__(provider)
-        self._public_images = None
+        self._public_catalog = None
 
     _PUBLIC_IMAGE_PROJECTS = ['centos-cloud', 'coreos-cloud', 'debian-cloud',
                               'opensuse-cloud', 'ubuntu-os-cloud', 'cos-cloud']
 
-    def _retrieve_public_images(self):
-        if self._public_images is not None:
-            return
-        self._public_images = []
-        for project in GCPImageService._PUBLIC_IMAGE_PROJECTS:
-            for image in helpers.iter_all(
-                    self.provider.gcp_compute.images(), project=project):
-                self._public_images.append(
-                    GCPMachineImage(self.provider, image))
+    @property
+    def public_catalog(self):
+        """
+        The catalog of public images, which is shared by all GCP providers,
+        and saved to disk if a path is configured.
+        """
+        if not self._public_catalog:
+            projects = tuple(GCPImageService._PUBLIC_IMAGE_PROJECTS)
+            path = self.provider.config.get('image_catalog_path')
+            ttl = self.provider.config.get('image_catalog_ttl',
+                                           DEFAULT_CATALOG_TTL)
+            # Public images are the same for all credentials, and each
+            # provider fetches the catalog through its own connections
+            # pylint:disable=protected-access
+            self._public_catalog = self.provider._get_pooled(
+                'public_image_catalog',
+                lambda: helpers.GCPPublicImageCatalog(
+                    ('gcp',) + projects, projects, path=path, ttl=ttl),
+                projects, path, ttl)
+        return self._public_catalog
+
+    def _fetch_public_images(self, requests):
+        # fetches the images of each (project, watermark) pair concurrently
+        return self.provider.fan_out(
+            self._service_event_pattern + ".list_public",
+            lambda request: list(helpers.iter_images_since(
+                self.provider, *request)),
+            requests)
+
+    @property
+    def _public_index(self):
+        return self.public_catalog.get_index(self._fetch_public_images)
 
     def get(self, image_id):
         """
         Returns an Image given its id
         """
+        # Images are always fetched from the cloud, rather than the public
+        # catalog, which may be stale
         image = self.provider.get_resource('images', image_id)
-        if image:
-            return GCPMachineImage(self.provider, image)
-        self._retrieve_public_images()
-        for public_image in self._public_images:
-            if public_image.id == image_id or public_image.name == image_id:
-                return public_image
-        return None
+        if not image and image_id and '/' not in image_id:
+            # Public images may be referred to by name alone, in which case
+            # the catalog tells which public project to fetch the image from
+            public_image = self._public_index.by_name.get(image_id)
+            if public_image:
+                image = self.provider.get_resource(
+                    'images', image_id,
+                    project=helpers.GCPPublicImageCatalog.image_project(
+                        public_image))
+        return GCPMachineImage(self.provider, image) if image else None
+
+    def _project_images(self):
+        if (self.provider.project_name in
+                GCPImageService._PUBLIC_IMAGE_PROJECTS):
+            return []
+        return [GCPMachineImage(self.provider, image)
+                for image in helpers.iter_all(
+                    self.provider.gcp_compute.images(),
+                    project=self.provider.project_name)]
 
     def find(self, limit=None, marker=None, **kwargs):
         """
@@ -442,8 +488,11 @@ class GCPImageService(BaseImageService):
                 "Unrecognised parameters for search: %s. Supported "
                 "attributes: %s" % (kwargs, 'label'))
 
-        # Retrieve all available images by setting limit to sys.maxsize
-        images = [image for image in self if image.label == label]
+        images = [image for image in self._project_images()
+                  if image.label == label]
+        images.extend(
+            GCPMachineImage(self.provider, image)
+            for image in self._public_index.by_label.get(label, []))
         return ClientPagedResultList(self.provider, images,
                                      limit=limit, marker=marker)
 
@@ -451,15 +500,9 @@ class GCPImageService(BaseImageService):
         """
         List all images.
         """
-        self._retrieve_public_images()
-        images = []
-        if (self.provider.project_name not in
-                GCPImageService._PUBLIC_IMAGE_PROJECTS):
-            for image in helpers.iter_all(
-                    self.provider.gcp_compute.images(),
-                    project=self.provider.project_name):
-                images.append(GCPMachineImage(self.provider, image))
-        images.extend(self._public_images)
+        images = self._project_images()
+        images.extend(GCPMachineImage(self.provider, image)
+                      for image in self._public_index.images)
         return ClientPagedResultList(self.provider, images,
                                      limit=limit, marker=marker)
 
@@ -638,17 +681,15 @@ class GCPInstanceService(BaseInstanceService):
         Searches for instances by instance label.
         :return: a list of Instance objects
         """
-        label = kwargs.pop('label', None)
-
-        # All kwargs should have been popped at this time.
-        if len(kwargs) > 0:
-            raise InvalidParamException(
-                "Unrecognised parameters for search: %s. Supported "
-                "attributes: %s" % (kwargs, 'label'))
-
-        instances = [instance for instance in self.list()
-                     if instance.label == label]
-        return ClientPagedResultList(self.provider, instances,
+        query = cb_helpers.FindQuery(['label'], kwargs)
+        filtr = helpers.push_down_filter(query, 'label', 'labels.cblabel')
+        instances = [GCPInstance(self.provider, inst)
+                     for inst in helpers.iter_all(
+                         self.provider.gcp_compute.instances(),
+                         project=self.provider.project_name,
+                         zone=self.provider.zone_name,
+                         filter=filtr)]
+        return ClientPagedResultList(self.provider, query.filter(instances),
                                      limit=limit, marker=marker)
 
     @dispatch(event="provider.compute.instances.list",
@@ -680,6 +721,11 @@ class GCPInstanceService(BaseInstanceService):
     @dispatch(event="provider.compute.instances.delete",
               priority=BaseInstanceService.STANDARD_EVENT_PRIORITY)
     def delete(self, instance):
+        if self.provider.current_batch:
+            self.provider.current_batch.delete(
+                'instances', instance.id if isinstance(instance, GCPInstance)
+                else instance)
+            return
         instance = (instance if isinstance(instance, GCPInstance) else
                     self.get(instance))
         if instance:
@@ -770,10 +816,16 @@ class GCPNetworkService(BaseNetworkService):
         GCP networks are global. There is at most one network with a given
         name.
         """
-        obj_list = self
-        filters = ['name', 'label']
-        matches = cb_helpers.generic_find(filters, kwargs, obj_list)
-        return ClientPagedResultList(self._provider, list(matches),
+        query = cb_helpers.FindQuery(['name', 'label'], kwargs)
+        # Network labels are kept in project metadata, so only names can
+        # be filtered on server-side
+        filtr = helpers.push_down_filter(query, 'name', 'name')
+        networks = [GCPNetwork(self.provider, network)
+                    for network in helpers.iter_all(
+                        self.provider.gcp_compute.networks(),
+                        project=self.provider.project_name,
+                        filter=filtr)]
+        return ClientPagedResultList(self._provider, query.filter(networks),
                                      limit=limit, marker=marker)
 
     @dispatch(event="provider.networking.networks.list",
@@ -1131,15 +1183,8 @@ class GCPVolumeService(BaseVolumeService):
         """
         Searches for a volume by a given list of attributes.
         """
-        label = kwargs.pop('label', None)
-
-        # All kwargs should have been popped at this time.
-        if len(kwargs) > 0:
-            raise InvalidParamException(
-                "Unrecognised parameters for search: %s. Supported "
-                "attributes: %s" % (kwargs, 'label'))
-
-        filtr = 'labels.cblabel eq ' + label
+        query = cb_helpers.FindQuery(['label'], kwargs)
+        filtr = helpers.push_down_filter(query, 'label', 'labels.cblabel')
         max_result = limit if limit is not None and limit < 500 else 500
         response = (self.provider
                         .gcp_compute
@@ -1157,7 +1202,7 @@ class GCPVolumeService(BaseVolumeService):
                         max_result, len(gcp_vols))
         return ServerPagedResultList('nextPageToken' in response,
                                      response.get('nextPageToken'),
-                                     False, data=gcp_vols)
+                                     False, data=query.filter(gcp_vols))
 
     @dispatch(event="provider.storage.volumes.list",
               priority=BaseVolumeService.STANDARD_EVENT_PRIORITY)
@@ -1221,6 +1266,11 @@ class GCPVolumeService(BaseVolumeService):
     @dispatch(event="provider.storage.volumes.delete",
               priority=BaseVolumeService.STANDARD_EVENT_PRIORITY)
     def delete(self, volume):
+        if self.provider.current_batch:
+            self.provider.current_batch.delete(
+                'disks', volume.id if isinstance(volume, GCPVolume)
+                else volume)
+            return
         volume = volume if isinstance(volume, GCPVolume) else self.get(volume)
         if volume:
             (self._provider.gcp_compute
@@ -1245,15 +1295,8 @@ class GCPSnapshotService(BaseSnapshotService):
     @dispatch(event="provider.storage.snapshots.find",
               priority=BaseSnapshotService.STANDARD_EVENT_PRIORITY)
     def find(self, limit=None, marker=None, **kwargs):
-        label = kwargs.pop('label', None)
-
-        # All kwargs should have been popped at this time.
-        if len(kwargs) > 0:
-            raise InvalidParamException(
-                "Unrecognised parameters for search: %s. Supported "
-                "attributes: %s" % (kwargs, 'label'))
-
-        filtr = 'labels.cblabel eq ' + label
+        query = cb_helpers.FindQuery(['label'], kwargs)
+        filtr = helpers.push_down_filter(query, 'label', 'labels.cblabel')
         max_result = limit if limit is not None and limit < 500 else 500
         response = (self.provider
                         .gcp_compute
@@ -1270,7 +1313,7 @@ class GCPSnapshotService(BaseSnapshotService):
                         max_result, len(snapshots))
         return ServerPagedResultList('nextPageToken' in response,
                                      response.get('nextPageToken'),
-                                     False, data=snapshots)
+                                     False, data=query.filter(snapshots))
 
     @dispatch(event="provider.storage.snapshots.list",
               priority=BaseSnapshotService.STANDARD_EVENT_PRIORITY)
@@ -1323,6 +1366,11 @@ class GCPSnapshotService(BaseSnapshotService):
     @dispatch(event="provider.storage.snapshots.delete",
               priority=BaseSnapshotService.STANDARD_EVENT_PRIORITY)
     def delete(self, snapshot):
+        if self.provider.current_batch:
+            self.provider.current_batch.delete(
+                'snapshots', snapshot.id if isinstance(snapshot, GCPSnapshot)
+                else snapshot)
+            return
         snapshot = (snapshot if isinstance(snapshot, GCPSnapshot)
                     else self.get(snapshot))
         if snapshot:
@@ -1472,9 +1520,16 @@ class GCPBucketObjectService(BaseBucketObjectService):
                                      False, data=objects)
 
     def find(self, bucket, limit=None, marker=None, **kwargs):
-        filters = ['name']
-        matches = cb_helpers.generic_find(filters, kwargs, bucket.objects)
-        return ClientPagedResultList(self._provider, list(matches),
+        query = cb_helpers.FindQuery(['name'], kwargs)
+        name = query.get('name')
+        # Only list the objects sharing the pattern's literal prefix
+        prefix = (cb_helpers.glob_literal_prefix(name)
+                  if isinstance(name, str) else None)
+        objects = [GCPBucketObject(self.provider, bucket, obj)
+                   for obj in helpers.iter_all(
+                       self.provider.gcp_storage.objects(),
+                       bucket=bucket.name, prefix=prefix or None)]
+        return ClientPagedResultList(self._provider, query.filter(objects),
                                      limit=limit, marker=marker)
 
     def _create_object_with_media_body(self, bucket, name, media_body):
@@ -4,9 +4,28 @@ Helper functions
 import itertools
 import logging as log
 
+from novaclient import exceptions as nova_exceptions
+
 from cloudbridge.base.resources import ServerPagedResultList
 
 
+def throttle_delay(exception):
+    """
+    Returns the number of seconds to wait, as hinted at by the cloud or
+    zero if there is no hint, if an exception signals that requests are
+    being throttled, and ``None`` otherwise. Nova signals this with a 413
+    ``OverLimit`` or a 429 ``RateLimit``, and other services with a 429.
+    """
+    if isinstance(exception, (nova_exceptions.OverLimit,
+                              nova_exceptions.RateLimit)):
+        return exception.retry_after or 0
+    status = (getattr(exception, 'http_status', None) or
+              getattr(exception, 'status_code', None))
+    if status == 429:
+        return getattr(exception, 'retry_after', None) or 0
+    return None
+
+
 def os_result_limit(provider, requested_limit=None):
     """
     Calculates the limit for OpenStack.
@@ -18,6 +18,7 @@ from swiftclient import client as swift_client
 from cloudbridge.base import BaseCloudProvider
 from cloudbridge.base.helpers import get_env
 
+from .helpers import throttle_delay
 from .services import OpenStackComputeService
 from .services import OpenStackDnsService
 from .services import OpenStackNetworkingService
@@ -94,7 +95,10 @@ class OpenStackCloudProvider(BaseCloudProvider):
         :rtype: ``int``
         :return: Keystone version as an int (currently, 2 or 3).
         """
-        ks_version = keystone_client.Client(auth_url=self.auth_url).version
+        ks_version = self._get_pooled(
+            'keystone_version',
+            lambda: keystone_client.Client(auth_url=self.auth_url).version,
+            self.auth_url)
         if ks_version == 'v3':
             return 3
         return 2
@@ -107,9 +111,19 @@ class OpenStackCloudProvider(BaseCloudProvider):
         :rtype: :class:`keystoneauth1.session.Session`
         :return: A Keystone session object.
         """
-        if self._cached_keystone_session:
-            return self._cached_keystone_session
+        if not self._cached_keystone_session:
+            # keystoneauth sessions hold per-request state and are not
+            # thread-safe, so each provider has its own. The authentication
+            # plugin, which holds the token and re-authenticates when it
+            # expires, and the results of version discovery are shared by
+            # all providers with the same credentials.
+            auth, discovery_cache = self._get_pooled(
+                'keystone_auth', self._create_keystone_auth, self._auth_key)
+            self._cached_keystone_session = session.Session(
+                auth=auth, discovery_cache=discovery_cache)
+        return self._cached_keystone_session
 
+    def _create_keystone_auth(self):
         if self._keystone_version == 3:
             from keystoneauth1.identity import v3
             auth = v3.Password(auth_url=self.auth_url,
@@ -119,27 +133,26 @@ class OpenStackCloudProvider(BaseCloudProvider):
                                project_domain_id=self.project_domain_id,
                                project_domain_name=self.project_domain_name,
                                project_name=self.project_name)
-            self._cached_keystone_session = session.Session(auth=auth)
         else:
             from keystoneauth1.identity import v2
             auth = v2.Password(self.auth_url, username=self.username,
                                password=self.password,
                                tenant_name=self.project_name)
-            self._cached_keystone_session = session.Session(auth=auth)
-        return self._cached_keystone_session
+        return auth, {}
+
+    @property
+    def _auth_key(self):
+        return (self.auth_url, self.username, self.password,
+                self.project_name, self.user_domain_name,
+                self.project_domain_id, self.project_domain_name)
 
     def _connect_openstack(self):
+        # Built on this provider's own session, and therefore on the shared
+        # authentication, rather than authenticating separately
         return connection.Connection(
+            session=self._keystone_session,
             region_name=self.region_name,
-            user_agent='cloudbridge',
-            auth_url=self.auth_url,
-            project_name=self.project_name,
-            username=self.username,
-            password=self.password,
-            user_domain_name=self.user_domain_name,
-            project_domain_id=self.project_domain_id,
-            project_domain_name=self.project_domain_name
-        )
+            app_name='cloudbridge')
 
     @property
     def swift(self):
@@ -179,14 +192,14 @@ class OpenStackCloudProvider(BaseCloudProvider):
     def dns(self):
         return self._dns
 
+    def _throttle_delay(self, exception):
+        return throttle_delay(exception)
+
     def _connect_nova(self):
         return self._connect_nova_region(self.region_name)
 
     def _connect_nova_region(self, region_name):
         """Get an OpenStack Nova (compute) client object."""
-        # Force reauthentication with Keystone
-        self._cached_keystone_session = None
-
         api_version = self._get_config_value(
             'os_compute_api_version',
             get_env('OS_COMPUTE_API_VERSION', 2))
@@ -293,6 +306,15 @@ class OpenStackCloudProvider(BaseCloudProvider):
                                      session=self._keystone_session,
                                      region_name=self.region_name)
 
+    def invalidate_connections(self):
+        super(OpenStackCloudProvider, self).invalidate_connections()
+        self._cached_keystone_session = None
+        self._nova = None
+        self._keystone = None
+        self._swift = None
+        self._neutron = None
+        self._os_conn = None
+
     def service_zone_name(self, service):
         service_name = service._service_event_pattern
         if "networking" in service_name:
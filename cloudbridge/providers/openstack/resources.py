@@ -1,7 +1,6 @@
 """
 DataTypes used by this provider
 """
-import inspect
 import ipaddress
 import logging
 import os
@@ -62,6 +61,10 @@ from .subservices import OpenStackVMFirewallRuleSubService
 
 ONE_GIG = 1048576000  # in bytes
 FIVE_GIG = ONE_GIG * 5  # in bytes
+# Instance sets up to this size are refreshed with one get per server
+OS_REFRESH_GET_LIMIT = 10
+# Maximum number of server names matched by a single listing filter
+OS_FILTER_NAME_LIMIT = 50
 
 log = logging.getLogger(__name__)
 
@@ -261,6 +264,8 @@ class OpenStackVMType(BaseVMType):
 
 class OpenStackInstance(BaseInstance):
 
+    JSON_REMOTE_FIELDS = BaseInstance.JSON_REMOTE_FIELDS + ('subnet_id',)
+
     # ref: http://docs.openstack.org/developer/nova/v2/2.0_server_concepts.html
     # and http://developer.openstack.org/api-ref-compute-v2.html
     INSTANCE_STATE_MAP = {
@@ -357,8 +362,13 @@ class OpenStackInstance(BaseInstance):
         """
         Get the VM type object.
         """
-        flavor = self._provider.nova.flavors.get(
-            self._os_instance.flavor.get('id'))
+        flavor_id = self._os_instance.flavor.get('id')
+        # flavors that are no longer listed, e.g. private flavors of
+        # another project, are fetched individually
+        vm_type = self._provider.compute.vm_types.get(flavor_id)
+        if vm_type:
+            return vm_type
+        flavor = self._provider.nova.flavors.get(flavor_id)
         return OpenStackVMType(self._provider, flavor)
 
     def reboot(self):
@@ -505,6 +515,47 @@ class OpenStackInstance(BaseInstance):
             # set the status to unknown
             self._os_instance.status = 'unknown'
 
+    @classmethod
+    def _refresh_all(cls, resources):
+        """
+        Refreshes all instances, fetching small sets of servers individually
+        and larger sets with one server listing per chunk of names, instead
+        of fetching each server individually.
+        """
+        # pylint:disable=protected-access
+        provider = resources[0]._provider
+        os_instances = {}
+        if len(resources) <= OS_REFRESH_GET_LIMIT:
+            for resource in resources:
+                try:
+                    os_instances[resource.id] = provider.nova.servers.get(
+                        resource.id)
+                except novaex.NotFound:
+                    pass
+        else:
+            zone = provider.service_zone_name(provider.compute.instances)
+            names = sorted(set(resource._os_instance.name
+                               for resource in resources))
+            for i in range(0, len(names), OS_FILTER_NAME_LIMIT):
+                chunk = names[i:i + OS_FILTER_NAME_LIMIT]
+                # Nova matches the name filter as a regular expression
+                search_opts = {
+                    'availability_zone': zone,
+                    'name': '^(%s)$' % '|'.join(re.escape(name)
+                                                for name in chunk)}
+                # A limit of -1 fetches every page of the listing
+                for os_instance in provider.nova.servers.list(
+                        search_opts=search_opts, limit=-1):
+                    os_instances[os_instance.id] = os_instance
+        for resource in resources:
+            os_instance = os_instances.get(resource.id)
+            if os_instance:
+                resource._os_instance = os_instance
+            else:
+                # The instance no longer exists and cannot be refreshed.
+                # set the status to unknown
+                resource._os_instance.status = 'unknown'
+
 
 class OpenStackRegion(BaseRegion):
 
@@ -948,6 +999,8 @@ class OpenStackFloatingIP(BaseFloatingIP):
 
 class OpenStackRouter(BaseRouter):
 
+    JSON_REMOTE_FIELDS = BaseRouter.JSON_REMOTE_FIELDS + ('network_id',)
+
     def __init__(self, provider, router):
         super(OpenStackRouter, self).__init__(provider)
         self._router = router
@@ -1159,13 +1212,6 @@ class OpenStackVMFirewall(BaseVMFirewall):
         self._vm_firewall = self._provider.os_conn.network.get_security_group(
             self.id)
 
-    def to_json(self):
-        attr = inspect.getmembers(self, lambda a: not(inspect.isroutine(a)))
-        js = {k: v for(k, v) in attr if not k.startswith('_')}
-        json_rules = [r.to_json() for r in self.rules]
-        js['rules'] = json_rules
-        return js
-
 
 class OpenStackVMFirewallRule(BaseVMFirewallRule):
 
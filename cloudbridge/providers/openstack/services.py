@@ -2,11 +2,13 @@
 Services implemented by the OpenStack provider.
 """
 import logging
+import re
 
 from neutronclient.common.exceptions import NeutronClientException
 from neutronclient.common.exceptions import PortNotFoundClient
 
 from novaclient.exceptions import NotFound as NovaNotFound
+from novaclient.v2.flavors import Flavor
 
 from openstack.exceptions import BadRequestException
 from openstack.exceptions import HttpException
@@ -632,12 +634,16 @@ class OpenStackBucketObjectService(BaseBucketObjectService):
             limit)
 
     def find(self, bucket, **kwargs):
-        _, obj_list = self.provider.swift.get_container(bucket.name)
+        query = cb_helpers.FindQuery(['name'], kwargs)
+        name = query.get('name')
+        # Only list the objects sharing the pattern's literal prefix
+        prefix = (cb_helpers.glob_literal_prefix(name)
+                  if isinstance(name, str) else None)
+        _, obj_list = self.provider.swift.get_container(
+            bucket.name, prefix=prefix or None)
         cb_objs = [OpenStackBucketObject(self.provider, bucket, obj)
                    for obj in obj_list]
-        filters = ['name']
-        matches = cb_helpers.generic_find(filters, kwargs, cb_objs)
-        return ClientPagedResultList(self.provider, list(matches))
+        return ClientPagedResultList(self.provider, query.filter(cb_objs))
 
     def create(self, bucket, object_name):
         self.provider.swift.put_object(bucket.name, object_name, None)
@@ -865,24 +871,22 @@ class OpenStackInstanceService(BaseInstanceService):
     @dispatch(event="provider.compute.instances.find",
               priority=BaseInstanceService.STANDARD_EVENT_PRIORITY)
     def find(self, **kwargs):
-        label = kwargs.pop('label', None)
-
-        # All kwargs should have been popped at this time.
-        if len(kwargs) > 0:
-            raise InvalidParamException(
-                "Unrecognised parameters for search: %s. Supported "
-                "attributes: %s" % (kwargs, 'label'))
-
-        search_opts = {'name': label,
-                       'availability_zone': self.provider
+        query = cb_helpers.FindQuery(['label'], kwargs)
+        label = query.get('label')
+        search_opts = {'availability_zone': self.provider
                                                 .service_zone_name(self)}
+        prefix = cb_helpers.glob_literal_prefix(label) if label else None
+        if prefix:
+            # Nova matches names against a regular expression anywhere in
+            # the name, so it is only used to narrow down the listing
+            search_opts['name'] = '^' + re.escape(prefix)
+        # The label is filtered client-side, so all matching servers are
+        # listed and filtered before the results are paged
         cb_insts = [
             OpenStackInstance(self.provider, inst)
             for inst in self.provider.nova.servers.list(
-                search_opts=search_opts,
-                limit=oshelpers.os_result_limit(self.provider),
-                marker=None)]
-        return oshelpers.to_server_paged_list(self.provider, cb_insts)
+                search_opts=search_opts, limit=-1)]
+        return ClientPagedResultList(self.provider, query.filter(cb_insts))
 
     @dispatch(event="provider.compute.instances.list",
               priority=BaseInstanceService.STANDARD_EVENT_PRIORITY)
@@ -947,16 +951,18 @@ class OpenStackVMTypeService(BaseVMTypeService):
     def __init__(self, provider):
         super(OpenStackVMTypeService, self).__init__(provider)
 
-    @dispatch(event="provider.compute.vm_types.list",
-              priority=BaseVMTypeService.STANDARD_EVENT_PRIORITY)
-    def list(self, limit=None, marker=None):
-        cb_itypes = [
-            OpenStackVMType(self.provider, obj)
-            for obj in self.provider.nova.flavors.list(
-                limit=oshelpers.os_result_limit(self.provider, limit),
-                marker=marker)]
+    def _catalog_scope(self):
+        return (self.provider.auth_url, self.provider.project_name,
+                self.provider.region_name)
+
+    def _fetch_vm_types(self):
+        return [flavor.to_dict()
+                for flavor in self.provider.nova.flavors.list()]
 
-        return oshelpers.to_server_paged_list(self.provider, cb_itypes, limit)
+    def _to_vm_type(self, record):
+        return OpenStackVMType(
+            self.provider,
+            Flavor(self.provider.nova.flavors, record, loaded=True))
 
 
 class OpenStackRegionService(BaseRegionService):
@@ -1050,24 +1056,28 @@ class OpenStackNetworkService(BaseNetworkService):
     @dispatch(event="provider.networking.networks.list",
               priority=BaseNetworkService.STANDARD_EVENT_PRIORITY)
     def list(self, limit=None, marker=None):
-        networks = [OpenStackNetwork(self.provider, network)
-                    for network in self.provider.neutron.list_networks()
-                    .get('networks') if network
-                    # If there are no availability zones, keep the network
-                    # in the results list
-                    and (not network.get('availability_zones')
-                         or self.provider.service_zone_name(self)
-                         in network.get('availability_zones'))]
-        return ClientPagedResultList(self.provider, networks,
+        return ClientPagedResultList(self.provider, self._list_networks(),
                                      limit=limit, marker=marker)
 
+    def _list_networks(self, **filters):
+        return [OpenStackNetwork(self.provider, network)
+                for network in self.provider.neutron.list_networks(**filters)
+                .get('networks') if network
+                # If there are no availability zones, keep the network
+                # in the results list
+                and (not network.get('availability_zones')
+                     or self.provider.service_zone_name(self)
+                     in network.get('availability_zones'))]
+
     @dispatch(event="provider.networking.networks.find",
               priority=BaseNetworkService.STANDARD_EVENT_PRIORITY)
     def find(self, **kwargs):
-        obj_list = self
-        filters = ['label']
-        matches = cb_helpers.generic_find(filters, kwargs, obj_list)
-        return ClientPagedResultList(self._provider, list(matches))
+        query = cb_helpers.FindQuery(['label'], kwargs)
+        # Neutron only matches names exactly
+        label = query.push_down('label', cb_helpers.is_glob_literal)
+        networks = (self._list_networks(name=label) if label
+                    else self._list_networks())
+        return ClientPagedResultList(self._provider, query.filter(networks))
 
     @dispatch(event="provider.networking.networks.create",
               priority=BaseNetworkService.STANDARD_EVENT_PRIORITY)
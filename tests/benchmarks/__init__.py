@@ -0,0 +1,5 @@
+"""
+Benchmarks which track the performance of cloudbridge. These are not run as
+part of the test suite, but can be run individually, e.g.
+``python -m tests.benchmarks.import_time``.
+"""
@@ -0,0 +1,127 @@
+"""
+Measures the cost of parsing GCP resource URLs, as done by
+``GCPCloudProvider.parse_url``, over a corpus of selfLinks. Compares a
+linear scan over the resource regexes with the path trie, both with and
+without the URL memo, and checks that they agree.
+
+The corpus defaults to ``tests/fixtures/gcp_self_links.txt``. A corpus can
+also be collected from a project, one URL per line, e.g. with::
+
+    gcloud compute instances list --format='value(selfLink,zone,disks.source)'
+
+Usage::
+
+    python -m tests.benchmarks.gcp_parse_url [--repeat N] [corpus ...]
+"""
+import argparse
+import json
+import os
+import re
+import timeit
+from string import Template
+
+from cloudbridge.providers.gcp import provider as gcp_provider
+
+FIXTURES = os.path.join(os.path.dirname(os.path.dirname(__file__)),
+                        'fixtures')
+
+
+class Connection(object):
+
+    def __init__(self, desc):
+        self._resourceDesc = desc
+
+
+class RegexScanResources(object):
+    """
+    Parses URLs by trying the regex of each resource in turn.
+    """
+
+    def __init__(self, desc):
+        self.RESOURCE_REGEX = re.compile(
+            r"(https://.*\.googleapis\.com/{0})(.*)".format(
+                desc['servicePath']))
+        self._resources = {}
+        for resource, resource_desc in desc['resources'].items():
+            method = resource_desc.get('methods', {}).get('get')
+            if not method:
+                continue
+            template = Template('${'.join(method['path'].split('{')))
+            mapping = {}
+            for parameter in method['parameterOrder']:
+                mapping[parameter] = '(%s)' % method['parameters'][
+                    parameter].get('pattern', '[^/]+')
+            self._resources[resource] = {
+                'parameters': method['parameterOrder'],
+                'pattern': re.compile(template.substitute(**mapping))}
+
+    def parse_url(self, url):
+        url = url.strip()
+        m = self.RESOURCE_REGEX.match(url)
+        if m:
+            url = m.group(2)
+        for resource, desc in self._resources.items():
+            m = re.match(desc['pattern'], url)
+            if m is None or len(m.group(0)) < len(url):
+                continue
+            return resource, dict(
+                (parameter, m.group(index + 1))
+                for index, parameter in enumerate(desc['parameters']))
+
+
+def parse_all(compute, storage, corpus):
+    out = []
+    for url in corpus:
+        parsed = compute.parse_url(url) or storage.parse_url(url)
+        if parsed is not None and not isinstance(parsed, tuple):
+            parsed = parsed._resource, parsed.parameters
+        out.append(parsed)
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('corpus', nargs='*', default=[
+        os.path.join(FIXTURES, 'gcp_self_links.txt')])
+    parser.add_argument('--discovery',
+                        default=os.path.join(FIXTURES, 'gcp_discovery.json'))
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    with open(args.discovery) as f:
+        discovery = json.load(f)
+    corpus = []
+    for path in args.corpus:
+        with open(path) as f:
+            corpus.extend(line.strip() for line in f if line.strip())
+
+    def trie(memo):
+        resources = [gcp_provider.GCPResources(Connection(discovery[api]))
+                     for api in ('compute', 'storage')]
+        if not memo:
+            # A memo too small to hit, so that every URL is parsed.
+            for r in resources:
+                r._memo_size = 0
+        return resources
+
+    parsers = [
+        ('regex scan', [RegexScanResources(discovery[api])
+                        for api in ('compute', 'storage')]),
+        ('trie', trie(memo=False)),
+        ('trie + memo', trie(memo=True))]
+
+    expected = parse_all(parsers[0][1][0], parsers[0][1][1], corpus)
+    print("{0} URLs, {1} parsed".format(
+        len(corpus), sum(1 for e in expected if e is not None)))
+    print("{0:<12} {1:>12} {2:>8}".format('parser', 'us per URL', 'agrees'))
+    for name, (compute, storage) in parsers:
+        agrees = parse_all(compute, storage, corpus) == expected
+        times = timeit.repeat(lambda: parse_all(compute, storage, corpus),
+                              number=1, repeat=args.repeat)
+        print("{0:<12} {1:>12.2f} {2:>8}".format(
+            name, sorted(times)[len(times) // 2] * 1e6 / len(corpus),
+            'yes' if agrees else 'NO'))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""
+Measures the cost of importing cloudbridge and creating a provider class,
+for each provider. Each measurement is made in a fresh interpreter, so that
+modules imported by one provider do not affect another.
+
+Usage::
+
+    python -m tests.benchmarks.import_time [--repeat N] [provider ...]
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+from cloudbridge.factory import BUILTIN_PROVIDERS
+
+# Run in a child interpreter. Reports the time taken, the number of modules
+# imported and the peak resident memory in KB (on Linux).
+_MEASURE = """
+import json, resource, sys, time
+start = time.perf_counter()
+from cloudbridge.factory import CloudProviderFactory
+cls = CloudProviderFactory().get_provider_class({provider!r})
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    'found': cls is not None,
+    'seconds': elapsed,
+    'modules': len(sys.modules),
+    'max_rss': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}}))
+"""
+
+
+def measure(provider):
+    output = subprocess.check_output(
+        [sys.executable, '-c', _MEASURE.format(provider=provider)])
+    return json.loads(output.decode('utf-8').strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('providers', nargs='*',
+                        default=sorted(BUILTIN_PROVIDERS))
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print("{0:<10} {1:>10} {2:>8} {3:>12}".format(
+        'provider', 'median ms', 'modules', 'max rss KB'))
+    for provider in args.providers:
+        results = [measure(provider) for _ in range(args.repeat)]
+        if not results[0]['found']:
+            print("{0:<10} {1:>10}".format(provider, 'unavailable'))
+            continue
+        times = sorted(r['seconds'] for r in results)
+        print("{0:<10} {1:>10.1f} {2:>8} {3:>12}".format(
+            provider, times[len(times) // 2] * 1000,
+            results[-1]['modules'], results[-1]['max_rss']))
+
+
+if __name__ == '__main__':
+    main()
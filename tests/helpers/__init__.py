@@ -270,6 +270,9 @@ class ProviderTestBase(unittest.TestCase):
             'default_wait_interval': self.get_provider_wait_interval(
                 provider_class),
             'default_result_limit': 5,
+            # Keep catalogs in memory, rather than in the user's cache
+            'vm_type_catalog_path': None,
+            'image_catalog_path': None,
             zone_cfg_key: get_provider_test_data(provider_name, 'placement')
         }
         return provider_class(config)
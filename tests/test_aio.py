@@ -0,0 +1,93 @@
+import asyncio
+import gc
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from cloudbridge.base.aio import AsyncServiceProxy
+from cloudbridge.interfaces.resources import Region
+
+from tests import helpers
+from tests.helpers import ProviderTestBase
+
+
+class CloudAsyncFacadeTestCase(ProviderTestBase):
+
+    _multiprocess_can_split_ = True
+
+    @helpers.skipIfNoService(['compute.regions'])
+    def test_service_methods_are_awaitable(self):
+        async def get_regions():
+            regions = self.provider.aio.compute.regions
+            region_list = await regions.list()
+            region = await regions.get(region_list[0].id)
+            found = await asyncio.gather(
+                *[regions.find(name=r.name) for r in region_list[:3]])
+            return region_list, region, found
+
+        region_list, region, found = asyncio.run(get_regions())
+        self.assertIsInstance(region, Region)
+        self.assertEqual(region.id, region_list[0].id)
+        self.assertListEqual([r[0].name for r in found],
+                             [r.name for r in region_list[:3]])
+
+    @helpers.skipIfNoService(['compute.regions'])
+    def test_async_iteration(self):
+        async def iterate():
+            return [region.id async for region
+                    in self.provider.aio.compute.regions]
+
+        self.assertListEqual(
+            asyncio.run(iterate()),
+            [region.id for region in self.provider.compute.regions])
+
+    def assert_shut_down(self, executor):
+        # Executors that are shut down accept no further calls
+        with self.assertRaises(RuntimeError):
+            executor.submit(int)
+
+    def test_executors_are_shut_down(self):
+        with self.create_provider_instance() as provider:
+            aio_executor = provider.aio.executor
+            fan_out_executor = provider.fan_out_executor
+        self.assert_shut_down(aio_executor)
+        self.assert_shut_down(fan_out_executor)
+
+        # as are those of providers that are discarded without being closed
+        provider = self.create_provider_instance()
+        aio_executor = provider.aio.executor
+        fan_out_executor = provider.fan_out_executor
+        del provider
+        gc.collect()
+        self.assert_shut_down(aio_executor)
+        self.assert_shut_down(fan_out_executor)
+
+
+class AsyncServiceProxyTestCase(unittest.TestCase):
+
+    _multiprocess_can_split_ = True
+
+    def test_aclose_closes_service_iterator(self):
+        closed = threading.Event()
+
+        class Service(object):
+
+            def iter(self):
+                try:
+                    yield 1
+                    yield 2
+                finally:
+                    closed.set()
+
+        executor = ThreadPoolExecutor(max_workers=1)
+        self.addCleanup(executor.shutdown)
+        proxy = AsyncServiceProxy(Service(), executor)
+
+        async def take_first():
+            results = proxy.iter()
+            first = await results.__anext__()
+            await results.aclose()
+            return first
+
+        self.assertEqual(asyncio.run(take_first()), 1)
+        self.assertTrue(closed.is_set())
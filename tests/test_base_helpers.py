@@ -100,3 +100,45 @@ class BaseHelpersTestCase(unittest.TestCase):
 
         with self.assertRaises(InvalidParamException):
             custom_func(new_param="world", old_param="hello")
+
+    def test_find_query(self):
+        class Obj(object):
+            def __init__(self, name, size):
+                self.name = name
+                self.size = size
+
+        objs = [Obj("cb-one", 1), Obj("cb-two", 2), Obj("xcb-one", 1),
+                Obj(None, 1)]
+
+        query = cb_helpers.FindQuery(['name', 'size'],
+                                     {'name': 'cb-*', 'size': 1})
+        self.assertEqual(query.residual, ['name', 'size'])
+        # Globs match whole values only
+        self.assertEqual([o.name for o in query.filter(objs)], ["cb-one"])
+
+        # A pushed down criterion is no longer evaluated client-side
+        self.assertEqual(query.push_down('size'), 1)
+        self.assertEqual(query.residual, ['name'])
+        self.assertEqual([o.name for o in query.filter(objs)],
+                         ["cb-one", "cb-two"])
+
+        # Unless the provider cannot evaluate it exactly
+        self.assertIsNone(
+            query.push_down('name', cb_helpers.is_glob_literal))
+        self.assertEqual(query.residual, ['name'])
+
+        # Falsy values are matched like any other
+        objs.append(Obj("cb-zero", 0))
+        query = cb_helpers.FindQuery(['size'], {'size': 0})
+        self.assertEqual([o.name for o in query.filter(objs)], ["cb-zero"])
+
+        with self.assertRaises(InvalidParamException):
+            cb_helpers.FindQuery(['name'], {'notaparameter': 'x'})
+
+    def test_glob_literal_prefix(self):
+        self.assertEqual(cb_helpers.glob_literal_prefix("logs/2019-*.gz"),
+                         "logs/2019-")
+        self.assertEqual(cb_helpers.glob_literal_prefix("a?c[de]"), "a")
+        self.assertEqual(cb_helpers.glob_literal_prefix("abc"), "abc")
+        self.assertTrue(cb_helpers.is_glob_literal("abc"))
+        self.assertFalse(cb_helpers.is_glob_literal("a[bc]"))
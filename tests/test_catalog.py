@@ -0,0 +1,192 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from cloudbridge.base.catalog import VMTypeCatalog
+from cloudbridge.base.catalog import VMTypeIndex
+from cloudbridge.interfaces.exceptions import InvalidParamException
+
+
+class VMTypeCatalogTestCase(unittest.TestCase):
+
+    _multiprocess_can_split_ = True
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.path)
+        self.fetches = []
+
+    def fetch(self):
+        self.fetches.append(1)
+        return [{'InstanceType': 't2.micro', 'VCpuInfo': {'DefaultVCpus': 1}}]
+
+    def test_records_are_fetched_once(self):
+        catalog = VMTypeCatalog(('aws', 'us-east-1'), path=self.path)
+        self.assertIsNone(catalog.records)
+        records = catalog.get(self.fetch)
+        self.assertEqual(records[0]['InstanceType'], 't2.micro')
+        self.assertEqual(catalog.get(self.fetch), records)
+        self.assertEqual(catalog.records, records)
+        self.assertEqual(len(self.fetches), 1)
+        self.assertTrue(os.path.exists(catalog.file_name))
+
+    def test_warm_start_from_disk(self):
+        catalog = VMTypeCatalog(('aws', 'us-east-1'), path=self.path)
+        records = catalog.get(self.fetch)
+        version = catalog.version
+
+        def offline():
+            raise IOError("offline")
+
+        warm = VMTypeCatalog(('aws', 'us-east-1'), path=self.path)
+        self.assertEqual(warm.get(offline), records)
+        self.assertEqual(warm.version, version)
+        # A catalog with another key does not read the file
+        other = VMTypeCatalog(('aws', 'us-west-2'), path=self.path)
+        self.assertNotEqual(other.file_name, catalog.file_name)
+        self.assertFalse(other.load())
+
+    def test_expired_catalog_is_refreshed_in_background(self):
+        catalog = VMTypeCatalog(('aws', 'us-east-1'), path=self.path, ttl=60)
+        catalog.get(self.fetch)
+        catalog._fetched_at = time.time() - 120
+        self.assertTrue(catalog.expired)
+        # stale records are served while the catalog is refreshed
+        self.assertTrue(catalog.get(self.fetch))
+        catalog.refresh_async(self.fetch).join(5)
+        self.assertEqual(len(self.fetches), 2)
+        self.assertFalse(catalog.expired)
+
+    def test_failed_refresh_keeps_catalog(self):
+        catalog = VMTypeCatalog(('aws', 'us-east-1'), ttl=None)
+        records = catalog.get(self.fetch)
+        catalog.refresh_async(lambda: 1 / 0).join(5)
+        self.assertEqual(catalog.records, records)
+
+    def test_catalog_is_fetched_by_caller(self):
+        # Catalogs are shared, so are fetched through whichever caller
+        # needs them, rather than the one that created the catalog
+        catalog = VMTypeCatalog(('aws', 'us-east-1'), ttl=None)
+        catalog.get(self.fetch)
+        other_fetches = []
+        catalog.refresh(lambda: other_fetches.append(1) or [])
+        self.assertEqual((len(self.fetches), len(other_fetches)), (1, 1))
+        self.assertEqual(catalog.records, [])
+
+    def test_invalidate(self):
+        catalog = VMTypeCatalog(('aws', 'us-east-1'), path=self.path)
+        catalog.get(self.fetch)
+        catalog.invalidate()
+        self.assertFalse(os.path.exists(catalog.file_name))
+        self.assertIsNone(catalog.records)
+        catalog.get(self.fetch)
+        self.assertEqual(len(self.fetches), 2)
+
+
+class FakeVMType(object):
+
+    def __init__(self, name, vcpus, ram, ephemeral=0, family=None):
+        self.id = self.name = name
+        self.vcpus = vcpus
+        self.ram = ram
+        self.size_root_disk = 0
+        self.size_ephemeral_disks = ephemeral
+        self.family = family
+
+
+class VMTypeIndexTestCase(unittest.TestCase):
+
+    _multiprocess_can_split_ = True
+
+    def setUp(self):
+        self.index = VMTypeIndex([
+            FakeVMType('large', 4, 16, family='general'),
+            FakeVMType('small', 1, 2, family='general'),
+            FakeVMType('storage', 2, 8, ephemeral=500, family='storage'),
+            FakeVMType('medium', 2, 4, family='general'),
+            FakeVMType('unknown', None, None)], version='v1')
+
+    def names(self, vm_types):
+        return [vm_type.name for vm_type in vm_types]
+
+    def test_get_by_id(self):
+        self.assertEqual(self.index.get('medium').vcpus, 2)
+        self.assertIsNone(self.index.get('missing'))
+
+    def test_select_orders_by_fit(self):
+        self.assertEqual(self.names(self.index.select(min_vcpus=2)),
+                         ['medium', 'storage', 'large'])
+        self.assertEqual(self.names(self.index.select(
+            min_vcpus=2, max_ram=8)), ['medium', 'storage'])
+        self.assertEqual(self.names(self.index.select(
+            min_ram=4, family='general')), ['medium', 'large'])
+        self.assertEqual(self.names(self.index.select(
+            min_ephemeral=100)), ['storage'])
+        self.assertEqual(self.index.select(min_vcpus=64), [])
+        self.assertEqual(len(self.index.select()), 5)
+
+    def test_select_invalid_bound(self):
+        with self.assertRaises(InvalidParamException):
+            self.index.select(min_gpus=1)
+
+
+class GCPPublicImageCatalogTestCase(unittest.TestCase):
+
+    _multiprocess_can_split_ = True
+
+    def setUp(self):
+        try:
+            from cloudbridge.providers.gcp import helpers as gcp_helpers
+        except ImportError:
+            raise unittest.SkipTest("GCP libraries are not installed")
+        self.catalog_class = gcp_helpers.GCPPublicImageCatalog
+        self.images = {'debian-cloud': [self.image('debian-cloud', 'd-1', 1)],
+                       'cos-cloud': [self.image('cos-cloud', 'c-1', 2)]}
+        self.requests = []
+
+    def image(self, project, name, day, label=None):
+        return {'selfLink': 'https://www.googleapis.com/compute/v1/projects/'
+                            '{0}/global/images/{1}'.format(project, name),
+                'name': name,
+                'labels': {'cblabel': label} if label else {},
+                'creationTimestamp':
+                    '2020-01-{0:02d}T10:00:00.000-08:00'.format(day)}
+
+    def fetch(self, requests):
+        self.requests.extend(requests)
+        return [[image for image in self.images[project]
+                 if since is None or image['creationTimestamp'] >= since]
+                for project, since in requests]
+
+    def test_incremental_refresh(self):
+        catalog = self.catalog_class(('gcp', 'test'),
+                                     ['debian-cloud', 'cos-cloud'])
+        self.assertEqual(len(catalog.get(self.fetch)), 2)
+        self.assertEqual(
+            catalog.meta['watermarks'],
+            {'debian-cloud': '2020-01-01T10:00:00.000-08:00',
+             'cos-cloud': '2020-01-02T10:00:00.000-08:00'})
+
+        self.images['debian-cloud'].append(
+            self.image('debian-cloud', 'd-2', 3, label='new'))
+        catalog.refresh(self.fetch)
+        # only images since each project's watermark were requested
+        self.assertEqual(self.requests[-2:], [
+            ('debian-cloud', '2020-01-01T10:00:00.000-08:00'),
+            ('cos-cloud', '2020-01-02T10:00:00.000-08:00')])
+        self.assertListEqual([image['name'] for image in catalog.records],
+                             ['d-1', 'c-1', 'd-2'])
+        index = catalog.get_index(self.fetch)
+        self.assertEqual(index.by_name['d-2']['name'], 'd-2')
+        self.assertEqual([image['name'] for image in index.by_label['new']],
+                         ['d-2'])
+
+        # deleted images are dropped by a full refresh
+        del self.images['debian-cloud'][0]
+        catalog.full_refresh_interval = 0
+        catalog.refresh(self.fetch)
+        self.assertListEqual([image['name'] for image in catalog.records],
+                             ['d-2', 'c-1'])
+        self.assertIsNot(catalog.get_index(self.fetch), index)
@@ -84,3 +84,30 @@ class CloudFactoryTestCase(unittest.TestCase):
         factory.register_provider_class(DummyClass)
         self.assertTrue(DummyClass not in
                         factory.get_all_provider_classes())
+
+    def test_get_provider_class_is_lazy(self):
+        # Requesting a provider should only import that provider
+        factory = CloudProviderFactory()
+        factory.get_provider_class("aws")
+        self.assertEqual(list(factory.provider_list), ["aws"])
+
+    def test_register_provider_path(self):
+        factory = CloudProviderFactory()
+        factory.register_provider_path("bad", "no.such.module:Provider")
+        self.assertIsNone(factory.get_provider_class("bad"))
+        self.assertNotIn("bad", factory.list_providers())
+
+    def test_provider_entry_points(self):
+        class DummyProvider(CloudProvider):
+            PROVIDER_ID = 'dummy'
+
+        class DummyEntryPoint(object):
+            name = 'dummy'
+
+            def load(self):
+                return DummyProvider
+
+        factory = CloudProviderFactory()
+        factory._entry_points = {'dummy': DummyEntryPoint()}
+        self.assertIs(factory.get_provider_class('dummy'), DummyProvider)
+        self.assertIn(DummyProvider, factory.get_all_provider_classes())
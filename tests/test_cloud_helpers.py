@@ -1,8 +1,14 @@
+import io
 import itertools
+import json
+import threading
+import time
 
 import six
 
 from cloudbridge.base.helpers import get_env
+from cloudbridge.base.helpers import to_jsonl
+from cloudbridge.base.resources import BasePageableObjectMixin
 from cloudbridge.base.resources import ClientPagedResultList
 from cloudbridge.base.resources import ServerPagedResultList
 
@@ -19,6 +25,47 @@ class DummyResult(object):
         return "%s (%s)" % (self.id, self.name)
 
 
+class CountedResult(DummyResult):
+
+    def __init__(self, objid, name):
+        super(CountedResult, self).__init__(objid, name)
+        self.reads = 0
+
+    @property
+    def id(self):
+        self.reads += 1
+        return self._id
+
+    @id.setter
+    def id(self, value):
+        self._id = value
+
+    @staticmethod
+    def id_reads(objects):
+        return sum(obj.reads for obj in objects)
+
+
+class DummyServerPagedService(BasePageableObjectMixin):
+
+    def __init__(self, objects, page_size):
+        self.objects = objects
+        self.page_size = page_size
+        self.pages_fetched = 0
+        self.fetched = threading.Condition()
+        self.fetcher = None
+
+    def list(self, limit=None, marker=None):
+        with self.fetched:
+            self.pages_fetched += 1
+            self.fetcher = threading.current_thread()
+            self.fetched.notify_all()
+        start = 0 if marker is None else marker
+        end = start + self.page_size
+        return ServerPagedResultList(is_truncated=end < len(self.objects),
+                                     marker=end, supports_total=False,
+                                     data=self.objects[start:end])
+
+
 class CloudHelpersTestCase(ProviderTestBase):
 
     _multiprocess_can_split_ = True
@@ -62,6 +109,44 @@ class CloudHelpersTestCase(ProviderTestBase):
         self.assertFalse(results.supports_server_paging, "Client paged result"
                          " lists should return False for server paging.")
 
+        # A list with a marker that does not exist
+        results = ClientPagedResultList(self.provider, objects, 2, 5)
+        self.assertListEqual(results, [])
+        self.assertFalse(results.is_truncated)
+
+    def test_client_paged_cursor(self):
+        objects = [DummyResult(i, str(i)) for i in range(7)]
+        results = ClientPagedResultList(self.provider, objects, 3)
+        pages = [list(results)]
+        while results.next_page():
+            results = results.next_page()
+            # Pages share the cursor over the original result set
+            self.assertIs(results.data, objects)
+            pages.append(list(results))
+        self.assertListEqual(pages, [objects[0:3], objects[3:6], objects[6:]])
+
+        cursor = results.cursor
+        results = ClientPagedResultList(self.provider, cursor, 2, marker=1)
+        self.assertListEqual(results, objects[2:4])
+        self.assertEqual(results.marker, 3)
+        self.assertEqual(results.total_results, 7)
+
+        # A result set paged once, as by a plain list(marker=...) call, is
+        # scanned rather than indexed, so only the ids up to the marker are
+        # read, besides that of the page's own marker
+        objects = [CountedResult(i, str(i)) for i in range(7)]
+        results = ClientPagedResultList(self.provider, objects, 2, marker=1)
+        self.assertListEqual(results, objects[2:4])
+        self.assertEqual(CountedResult.id_reads(objects), 2 + 1)
+
+        # Once the cursor is reused, every id is read once to index it, and
+        # further pages are located without reading any
+        results = results.next_page()
+        self.assertListEqual(results, objects[4:6])
+        self.assertEqual(CountedResult.id_reads(objects), 3 + 7 + 1)
+        self.assertListEqual(results.next_page(), objects[6:])
+        self.assertEqual(CountedResult.id_reads(objects), 3 + 7 + 1)
+
     def test_server_paged_result_list(self):
 
         objects = list(itertools.islice(self.objects, 2))
@@ -105,3 +190,70 @@ class CloudHelpersTestCase(ProviderTestBase):
         int_value = self.provider._get_config_value(
             'default_result_limit', None)
         self.assertIsInstance(int_value, int)
+
+    def test_prefetching_iterator(self):
+        objects = [DummyResult(i, str(i)) for i in range(10)]
+        service = DummyServerPagedService(objects, page_size=3)
+        self.assertListEqual(list(service.iter(prefetch=2)), objects)
+        self.assertEqual(service.pages_fetched, 4)
+
+        # At most two pages, including the one being consumed, should be
+        # held, and closing the iterator should stop fetching further pages
+        service = DummyServerPagedService(objects, page_size=1)
+        results = service.iter(prefetch=2)
+        self.assertEqual(next(results), objects[0])
+        # consuming the first page frees a slot for the third
+        self.assertEqual(next(results), objects[1])
+        with service.fetched:
+            self.assertTrue(service.fetched.wait_for(
+                lambda: service.pages_fetched == 3, timeout=10))
+        results.close()
+        service.fetcher.join(timeout=10)
+        self.assertFalse(service.fetcher.is_alive())
+        self.assertEqual(service.pages_fetched, 3)
+
+    def test_to_jsonl(self):
+        regions = list(self.provider.compute.regions)[:3]
+        stream = io.StringIO()
+        self.assertEqual(to_jsonl(regions, stream), len(regions))
+        lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+        self.assertListEqual([js['id'] for js in lines],
+                             [region.id for region in regions])
+        # Related resources are referred to by id
+        self.assertListEqual(lines[0]['zones'],
+                             [zone.id for zone in regions[0].zones])
+
+        # Fields which require a further request are omitted when cheap
+        stream = io.StringIO()
+        to_jsonl(regions, stream, cheap=True)
+        js = json.loads(stream.getvalue().splitlines()[0])
+        self.assertEqual(js['name'], regions[0].name)
+        self.assertNotIn('zones', js)
+        self.assertNotIn('default_zone', js)
+
+    def test_fan_out(self):
+        def slow_square(x):
+            # later items finish first
+            time.sleep(0.01 * (5 - x))
+            return x * x
+
+        event = "provider.test.fan_out"
+        self.provider.metrics.reset()
+        self.assertListEqual(
+            self.provider.fan_out(event, slow_square, range(5)),
+            [0, 1, 4, 9, 16])
+        self.assertEqual(self.provider.metrics.snapshot()[event]['count'], 5)
+
+        # Nested fan outs run in the calling worker thread
+        self.assertListEqual(
+            self.provider.fan_out(
+                event,
+                lambda x: self.provider.fan_out(event, slow_square, [x, x]),
+                range(3)),
+            [[0, 0], [1, 1], [4, 4]])
+
+        with self.assertRaises(ZeroDivisionError):
+            self.provider.fan_out(event, lambda x: 1 / x, [1, 0, 2])
+        self.assertEqual(
+            self.provider.metrics.snapshot()[event]['errors'],
+            {'ZeroDivisionError': 1})
@@ -1,4 +1,8 @@
 import ipaddress
+from contextlib import contextmanager
+from unittest import mock
+
+import botocore.client
 
 import six
 
@@ -21,6 +25,25 @@ class CloudComputeServiceTestCase(ProviderTestBase):
 
     _multiprocess_can_split_ = True
 
+    @contextmanager
+    def _assert_no_service_calls(self):
+        events = []
+        handler = self.provider.middleware.events.observe(
+            "*", 100, lambda event_args, *args, **kwargs: events.append(
+                event_args.get("event")))
+        try:
+            if self.provider.PROVIDER_ID in ('aws', 'mock'):
+                # Also catch boto resources loading their attributes lazily
+                with mock.patch.object(
+                        botocore.client.BaseClient, '_make_api_call',
+                        side_effect=AssertionError("Unexpected AWS call")):
+                    yield
+            else:
+                yield
+        finally:
+            handler.unsubscribe()
+        self.assertListEqual(events, [])
+
     @helpers.skipIfNoService(['compute.instances'])
     def test_storage_services_event_pattern(self):
         # pylint:disable=protected-access
@@ -170,6 +193,14 @@ class CloudComputeServiceTestCase(ProviderTestBase):
                              "Instance's placement zone could not be "
                              " found in zones list")
 
+            # Cheap JSON representations are built without calling the cloud
+            with self._assert_no_service_calls():
+                for resource in (test_instance, fw, subnet, net):
+                    js = resource.to_json(cheap=True)
+                    self.assertEqual(js['id'], resource.id)
+                    self.assertNotIn('vm_type', js)
+                    self.assertNotIn('rules', js)
+
     @helpers.skipIfNoService(['compute.instances', 'compute.images',
                               'compute.vm_types'])
     def test_block_device_mapping_launch_config(self):
@@ -0,0 +1,437 @@
+import json
+import os
+import re
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from cloudbridge.base.pool import connection_pool
+from cloudbridge.interfaces.exceptions import DuplicateResourceException
+from cloudbridge.interfaces.exceptions import ProviderInternalException
+
+from tests import helpers
+
+
+class GCPTestCase(unittest.TestCase):
+    """
+    Base class for tests of the GCP provider which run against mocked HTTP
+    responses, rather than a cloud. The tests are skipped if the GCP
+    libraries are not installed.
+    """
+
+    _multiprocess_can_split_ = True
+
+    CONFIG = {'gcp_service_creds_dict': {'project_id': 'cb-test'},
+              'gcp_zone_name': 'us-central1-a'}
+
+    def setUp(self):
+        try:
+            from googleapiclient import discovery
+            from googleapiclient.http import HttpMockSequence
+            from cloudbridge.providers.gcp import helpers as gcp_helpers
+            from cloudbridge.providers.gcp import provider as gcp_provider
+        except ImportError:
+            raise unittest.SkipTest("GCP libraries are not installed")
+        with open(os.path.join(helpers.get_test_fixtures_folder(),
+                               'gcp_discovery.json')) as f:
+            self.discovery = json.load(f)['compute']
+        self.build = discovery.build_from_document
+        self.http_mock = HttpMockSequence
+        self.gcp_helpers = gcp_helpers
+        self.gcp_provider = gcp_provider
+        self.provider = gcp_provider.GCPCloudProvider(dict(self.CONFIG))
+
+    def respond(self, *responses):
+        """
+        Serves the provider's compute API from the given ``(status, body)``
+        responses, in order.
+        """
+        # pylint:disable=protected-access
+        self.provider._gcp_compute = self.build(
+            self.discovery, http=self.http_mock(
+                [({'status': str(status)}, json.dumps(body))
+                 for status, body in responses]))
+
+
+class GCPServiceBuildTestCase(GCPTestCase):
+
+    def test_discovery_document_is_shared(self):
+        from google.auth.credentials import AnonymousCredentials
+        from googleapiclient.http import HttpRequest
+        fetched = []
+
+        def fetch(service_name, version):
+            fetched.append((service_name, version))
+            return json.dumps(self.discovery)
+
+        connection_pool.invalidate('gcp', 'discovery')
+        self.addCleanup(connection_pool.invalidate, 'gcp', 'discovery')
+        config = dict(self.CONFIG, gcp_credentials_obj=AnonymousCredentials())
+        provider_class = self.gcp_provider.GCPCloudProvider
+        with mock.patch.object(self.gcp_provider,
+                               '_fetch_discovery_document', fetch), \
+                mock.patch.object(provider_class, '_get_build_request',
+                                  lambda provider: HttpRequest):
+            compute = provider_class(config).gcp_compute
+            other = provider_class(config).gcp_compute
+        # The document is fetched once, but each provider builds its own
+        # service from it
+        self.assertEqual(fetched, [('compute', 'v1')])
+        self.assertIsNot(other, compute)
+        self.assertTrue(other.instances())
+
+
+class GCPResourceUrlTestCase(GCPTestCase):
+
+    def setUp(self):
+        super(GCPResourceUrlTestCase, self).setUp()
+        discovery = self.discovery
+
+        class Connection(object):
+            _resourceDesc = discovery
+
+        self.resources = self.gcp_provider.GCPResources(Connection())
+
+    def test_parse_url(self):
+        url = ('https://www.googleapis.com/compute/v1/projects/galaxy-on-gcp'
+               '/regions/us-central1/subnetworks/testsubnet-2')
+        parsed = self.resources.parse_url(url)
+        self.assertEqual(parsed._resource, 'subnetworks')
+        self.assertDictEqual(parsed.parameters,
+                             {'project': 'galaxy-on-gcp',
+                              'region': 'us-central1',
+                              'subnetwork': 'testsubnet-2'})
+        self.assertEqual(
+            self.resources.parse_url(
+                'projects/galaxy-on-gcp/zones/us-central1-a')._resource,
+            'zones')
+        # Values must match the parameter patterns
+        self.assertIsNone(self.resources.parse_url(
+            'projects/galaxy-on-gcp/global/networks/Not_Valid'))
+        self.assertIsNone(self.resources.parse_url(
+            'projects/galaxy-on-gcp/global/networks/'))
+        self.assertIsNone(self.resources.parse_url('testsubnet-2'))
+
+    def test_parse_url_memo(self):
+        url = 'projects/galaxy-on-gcp/global/networks/testnet'
+        first = self.resources.parse_url(url)
+        first.parameters['network'] = 'changed'
+        self.assertEqual(self.resources.parse_url(url).parameters['network'],
+                         'testnet')
+        self.assertIn(url, self.resources._memo)
+
+        self.resources._memo_size = 2
+        for name in ('a', 'b', 'c'):
+            self.resources.parse_url(
+                'projects/galaxy-on-gcp/global/networks/' + name)
+        self.assertListEqual(
+            list(self.resources._memo),
+            ['projects/galaxy-on-gcp/global/networks/' + name
+             for name in ('b', 'c')])
+
+
+class GCPBatchTestCase(GCPTestCase):
+
+    ZONE_URL = ('https://www.googleapis.com/compute/v1/projects/cb-test'
+                '/zones/us-central1-a')
+
+    def respond_batches(self, *batches):
+        # Each batch is a list of (status, body) parts
+        responses = []
+        for parts in batches:
+            body = ''
+            for index, (status, part) in enumerate(parts):
+                body += ('--batch\r\nContent-Type: application/http\r\n'
+                         'Content-ID: <response-test + {0}>\r\n\r\n'
+                         'HTTP/1.1 {1} Status\r\n'
+                         'Content-Type: application/json\r\n\r\n{2}\r\n'
+                         .format(index + 1, status, json.dumps(part)))
+            responses.append(
+                ({'status': '200',
+                  'content-type': 'multipart/mixed; boundary="batch"'},
+                 body + '--batch--'))
+        # pylint:disable=protected-access
+        self.provider._gcp_compute = self.build(
+            self.discovery, http=self.http_mock(responses))
+
+    def resource(self, collection, name, **extra):
+        extra.update({'name': name, 'zone': self.ZONE_URL,
+                      'selfLink': '{0}/{1}/{2}'.format(
+                          self.ZONE_URL, collection, name)})
+        return extra
+
+    def test_batch_get_and_delete(self):
+        not_found = {'error': {'code': 404, 'message': 'Not found'}}
+        self.respond_batches([(200, {'name': 'op-1', 'status': 'RUNNING'}),
+                              (200, self.resource('instances', 'vm-2',
+                                                  status='RUNNING')),
+                              (404, not_found),
+                              (404, not_found)])
+        self.provider.metrics.reset()
+        with self.provider.batch() as batch:
+            self.provider.compute.instances.delete('vm-1')
+            pending = [batch.get('instances', 'vm-2'),
+                       batch.get('instances', 'vm-3')]
+            # deleting a missing volume is not an error
+            self.provider.storage.volumes.delete('vol-1')
+            # nested batches are sent with the outer batch
+            with self.provider.batch() as nested:
+                self.assertIs(nested, batch)
+            self.assertFalse(pending[0].done)
+        self.assertEqual(pending[0].result().name, 'vm-2')
+        self.assertIsNone(pending[1].result())
+        self.assertIsNone(self.provider.current_batch)
+        self.assertEqual(
+            self.provider.metrics.snapshot()[
+                'provider.compute.batch']['count'], 1)
+
+    def test_batch_label_changes(self):
+        from cloudbridge.providers.gcp.resources import GCPVolume
+        volume = GCPVolume(self.provider, self.resource(
+            'disks', 'vol-1', labelFingerprint='abc'))
+        operation = {'name': 'op-1', 'selfLink': self.ZONE_URL +
+                     '/operations/op-1'}
+        # Successive label changes are sent as a single request, and the
+        # volume is refreshed once its operation is done
+        self.respond_batches(
+            [(200, dict(operation, status='RUNNING'))],
+            [(200, dict(operation, status='DONE'))],
+            [(200, self.resource('disks', 'vol-1', labels={
+                'cblabel': 'new-label', 'description': 'new-description'}))])
+        with self.provider.batch():
+            volume.label = 'new-label'
+            volume.description = 'new-description'
+        self.assertEqual(volume.label, 'new-label')
+        self.assertEqual(volume.description, 'new-description')
+
+    def test_batch_failed_operation(self):
+        from cloudbridge.providers.gcp.resources import GCPVolume
+        volume = GCPVolume(self.provider, self.resource(
+            'disks', 'vol-1', labelFingerprint='abc'))
+        operation = {'name': 'op-1', 'selfLink': self.ZONE_URL +
+                     '/operations/op-1'}
+        operation_error = {'errors': [{'code': 'CONDITION_NOT_MET'}]}
+        self.respond_batches(
+            [(200, dict(operation, status='RUNNING'))],
+            [(200, dict(operation, status='DONE', error=operation_error))],
+            [(200, self.resource('disks', 'vol-1'))])
+        with self.assertRaises(ProviderInternalException) as context:
+            with self.provider.batch():
+                volume.label = 'new-label'
+        self.assertEqual(context.exception.operation_error, operation_error)
+
+    def test_throttled_requests_are_retried(self):
+        from cloudbridge.base.middleware import RateLimitMiddleware
+        limiter = RateLimitMiddleware({'provider.compute.*': 1000})
+        self.provider.middleware.add(limiter)
+        retries = self.provider.retries
+        retries.base_delay, retries.max_delay = 0.001, 0.01
+        throttled = {'error': {'code': 429, 'message': 'Too many requests'}}
+        unavailable = {'error': {'code': 503, 'message': 'Unavailable'}}
+        self.respond_batches(
+            [(200, self.resource('instances', 'vm-1')), (429, throttled),
+             (503, unavailable)],
+            # only the failed requests are sent again
+            [(200, self.resource('instances', 'vm-2')),
+             (200, self.resource('instances', 'vm-3'))])
+        with self.provider.batch() as batch:
+            pending = [batch.get('instances', name)
+                       for name in ('vm-1', 'vm-2', 'vm-3')]
+        self.assertEqual([p.result().name for p in pending],
+                         ['vm-1', 'vm-2', 'vm-3'])
+        # each batched request is charged to the rate limits
+        self.assertEqual(limiter.stats['provider.compute.*']['acquired'], 5)
+
+    def test_waits_are_not_batched(self):
+        from cloudbridge.providers.gcp.resources import GCPVolume
+        volume = GCPVolume(self.provider, self.resource(
+            'disks', 'vol-1', status='CREATING'))
+        # The wait polls the volume straight away, rather than queueing
+        # refreshes that are only sent once the batch exits
+        self.respond((200, self.resource('disks', 'vol-1', status='READY')))
+        with self.provider.batch():
+            volume.wait_till_ready(timeout=10, interval=0.01)
+            self.assertEqual(volume.state, 'available')
+
+
+class GCPFirewallIndexTestCase(GCPTestCase):
+
+    def firewall(self, fw_id, tag, network, **extra):
+        firewall = {'id': fw_id, 'name': 'fw-' + fw_id, 'network': network,
+                    'targetTags': [tag], 'allowed': [{'IPProtocol': 'tcp'}]}
+        firewall.update(extra)
+        return firewall
+
+    def test_firewall_index(self):
+        firewalls = [self.firewall('1', 'web', 'net-a'),
+                     self.firewall('2', 'web', 'net-b'),
+                     self.firewall('3', 'web', 'net-a'),
+                     # not managed by CloudBridge
+                     self.firewall('4', 'db', 'net-a', targetTags=[])]
+        index = self.gcp_helpers.GCPFirewallIndex(
+            firewalls, lambda fw: fw['network'],
+            lambda tag, net: tag + '/' + net)
+        self.assertListEqual(list(index.by_id), ['1', '2', '3'])
+        self.assertListEqual(
+            [fw['id'] for fw in index.select('web', 'net-a')], ['1', '3'])
+        self.assertListEqual(
+            [fw['id'] for fw in index.select(network_name='net-b')], ['2'])
+        self.assertEqual(index.by_tag_network_id['web/net-b'],
+                         ('web', 'net-b'))
+        self.assertFalse(index.expired(60))
+        self.assertFalse(index.expired(None))
+
+        index.remove('2')
+        index.remove('2')
+        self.assertNotIn('web/net-b', index.by_tag_network_id)
+        index.add(self.firewall('5', 'db', 'net-b'))
+        # a firewall is replaced when re-added
+        index.add(self.firewall('1', 'web', 'net-b'))
+        self.assertListEqual(
+            sorted(index.by_tag_network),
+            [('db', 'net-b'), ('web', 'net-a'), ('web', 'net-b')])
+        self.assertListEqual(
+            [fw['id'] for fw in index.select('web', 'net-a')], ['3'])
+
+
+class GCPMetadataStoreTestCase(GCPTestCase):
+
+    CONFIG = dict(GCPTestCase.CONFIG, metadata_cache_ttl=30)
+
+    def project(self, fingerprint, *keys):
+        return (200, {'commonInstanceMetadata': {
+            'fingerprint': fingerprint,
+            'items': [{'key': key, 'value': key + '-value'}
+                      for key in keys]}})
+
+    def operation(self):
+        return (200, {'name': 'op-1', 'status': 'DONE'})
+
+    def test_regex_literal_prefix(self):
+        prefix = self.gcp_helpers.regex_literal_prefix
+        self.assertEqual(prefix(re.compile('^cb_key_pair_.*')),
+                         'cb_key_pair_')
+        self.assertEqual(prefix('^firewall_a?'), 'firewall_')
+        self.assertEqual(prefix('firewall_'), '')
+
+    def test_coalesced_writes(self):
+        conflict = {'error': {'code': 412, 'message': 'Supplied fingerprint '
+                              'does not match current metadata fingerprint.'}}
+        self.respond(self.project('f1', 'cb_key_pair_a', 'label_b'),
+                     # the first write conflicts with another client
+                     (412, conflict),
+                     self.project('f2', 'cb_key_pair_a', 'label_b', 'x'),
+                     # the write, and the poll of its operation
+                     self.operation(), self.operation())
+        store = self.provider.metadata_store
+        self.assertEqual(
+            [item['key'] for item in store.find('^cb_key_pair_')],
+            ['cb_key_pair_a'])
+        # A failing mutation is reported once the others are written
+        with self.assertRaises(DuplicateResourceException):
+            with store.deferred():
+                self.gcp_helpers.add_metadata_item(
+                    self.provider, 'cb_key_pair_c', 'c')
+                self.gcp_helpers.modify_or_add_metadata_item(
+                    self.provider, 'label_b', 'new')
+                self.gcp_helpers.add_metadata_item(
+                    self.provider, 'cb_key_pair_a', 'a')
+                self.assertIsNone(store.get('cb_key_pair_c'))
+        # Reads are served from the written document
+        self.assertEqual(store.get('label_b'), 'new')
+        self.assertEqual(store.get('x'), 'x-value')
+        self.assertEqual(
+            [item['key'] for item in store.find(re.compile('^cb_key_pair_'))],
+            ['cb_key_pair_a', 'cb_key_pair_c'])
+        # Removing a missing item does not write
+        self.respond(self.project('f3', 'x'))
+        self.assertFalse(
+            self.gcp_helpers.remove_metadata_item(self.provider, 'missing'))
+
+    def test_reads_are_not_cached_by_default(self):
+        provider = self.gcp_provider.GCPCloudProvider(
+            dict(GCPTestCase.CONFIG))
+        self.provider = provider
+        self.respond(self.project('f1', 'label_a'),
+                     self.project('f2', 'label_a', 'label_b'))
+        self.assertIsNone(provider.metadata_store.get('label_b'))
+        self.assertEqual(provider.metadata_store.get('label_b'),
+                         'label_b-value')
+
+    def test_metadata_writes_are_not_batched(self):
+        self.respond(self.project('f1'), self.operation(), self.operation(),
+                     self.project('f2', 'label_a'))
+        store = self.provider.metadata_store
+        with self.provider.batch():
+            self.gcp_helpers.add_metadata_item(self.provider, 'label_a', 'a')
+            self.assertEqual(store.get('label_a'), 'a')
+            with self.assertRaises(DuplicateResourceException):
+                self.gcp_helpers.add_metadata_item(
+                    self.provider, 'label_a', 'b')
+
+
+class GCPImageServiceTestCase(GCPTestCase):
+
+    IMAGE_URL = ('https://www.googleapis.com/compute/v1/projects/'
+                 'debian-cloud/global/images/debian-9')
+
+    def fetch_public_images(self, requests):
+        return [[{'name': 'debian-9', 'selfLink': self.IMAGE_URL,
+                  'creationTimestamp': '2020-01-01T10:00:00.000-08:00'}]
+                if project == 'debian-cloud' else []
+                for project, _ in requests]
+
+    def test_get_is_not_served_from_catalog(self):
+        images = self.provider.compute.images
+        images.public_catalog.refresh(self.fetch_public_images)
+        self.addCleanup(images.public_catalog.invalidate)
+        not_found = {'error': {'code': 404, 'message': 'Not found'}}
+        # Public images may be referred to by name, and are fetched from
+        # the public project that the catalog lists them in
+        self.respond((404, not_found),
+                     (200, {'name': 'debian-9', 'selfLink': self.IMAGE_URL}),
+                     (404, not_found), (404, not_found))
+        self.assertEqual(images.get('debian-9').id, self.IMAGE_URL)
+        # Images missing from the catalog are only looked up in the
+        # provider's project
+        self.assertIsNone(images.get('missing'))
+        # The catalog may be stale, so deleted images are not found
+        self.assertIsNone(images.get(self.IMAGE_URL))
+
+    def test_public_catalog_is_shared(self):
+        catalog = self.provider.compute.images.public_catalog
+        self.assertIs(self.provider.clone().compute.images.public_catalog,
+                      catalog)
+        # Public images are the same for all credentials
+        other = self.gcp_provider.GCPCloudProvider(
+            {'gcp_service_creds_dict': {'project_id': 'cb-test',
+                                        'client_email': 'other'}})
+        self.assertIs(other.compute.images.public_catalog, catalog)
+
+
+class GCPHttpTransportTestCase(GCPTestCase):
+
+    def setUp(self):
+        super(GCPHttpTransportTestCase, self).setUp()
+        from google.auth.credentials import AnonymousCredentials
+        self.created = []
+
+        def http_factory():
+            self.created.append(object())
+            return self.created[-1]
+
+        self.transport = self.gcp_provider.GCPHttpTransport(
+            AnonymousCredentials(), http_factory=http_factory)
+
+    def test_http_per_thread(self):
+        http = self.transport.http
+        self.assertIs(self.transport.http, http)
+        self.assertIs(http.http, self.created[0])
+        self.assertIs(http.credentials, self.transport.credentials)
+
+        executor = ThreadPoolExecutor(max_workers=2)
+        others = list(executor.map(lambda _: self.transport.http, range(2)))
+        executor.shutdown()
+        self.assertNotIn(http, others)
+        # Each worker thread keeps its own Http object
+        self.assertEqual(len(self.created), 1 + len(set(map(id, others))))
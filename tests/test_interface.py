@@ -96,6 +96,40 @@ class CloudInterfaceTestCase(ProviderTestBase):
         if self.provider.PROVIDER_ID != 'gcp':
             self.assertIsNotNone(cloned_provider.zone_name)
 
+    def test_aws_connections_are_lazy(self):
+        if self.provider.PROVIDER_ID not in ('aws', 'mock'):
+            raise unittest.SkipTest("Only AWS connections are checked")
+        cloned_provider = CloudProviderFactory().create_provider(
+                self.provider.PROVIDER_ID, self.provider.config.copy())
+        # Neither constructing the provider nor its services should connect
+        self.assertIsNotNone(cloned_provider.storage.buckets)
+        self.assertIsNone(cloned_provider._ec2_conn)
+        self.assertIsNone(cloned_provider._s3_conn)
+        # An S3 only workload should never connect to EC2
+        list(cloned_provider.storage.buckets)
+        self.assertIsNotNone(cloned_provider._s3_conn)
+        self.assertIsNone(cloned_provider._ec2_conn)
+
+    def test_aws_sessions_are_not_shared(self):
+        if self.provider.PROVIDER_ID not in ('aws', 'mock'):
+            raise unittest.SkipTest("Only AWS connections are checked")
+        cloned_provider = self.provider.clone()
+        # boto3 sessions and resources are not thread-safe, so are never
+        # shared between providers, unlike low-level clients
+        self.assertIsNot(cloned_provider.session, self.provider.session)
+        self.assertIsNot(cloned_provider.ec2_conn, self.provider.ec2_conn)
+        self.assertIsNot(cloned_provider.s3_conn, self.provider.s3_conn)
+        self.assertIs(cloned_provider.route53_conn,
+                      self.provider.route53_conn)
+        # but resources are built on shared clients and models
+        self.assertIs(cloned_provider.ec2_conn.meta.client,
+                      self.provider.ec2_conn.meta.client)
+        self.assertIs(cloned_provider.s3_conn.meta.client,
+                      self.provider.s3_conn.meta.client)
+        self.assertIs(
+            cloned_provider.session._session.get_component('data_loader'),
+            self.provider.session._session.get_component('data_loader'))
+
     def test_clone_provider_zone(self):
         for zone in list(self.provider.compute.regions.current.zones)[:2]:
             cloned_provider = self.provider.clone(zone=zone)
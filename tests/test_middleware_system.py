@@ -1,11 +1,21 @@
+import threading
+import time
 import unittest
 
 from pyeventsystem.events import SimpleEventDispatcher
 from pyeventsystem.middleware import SimpleMiddlewareManager
 from pyeventsystem.middleware import implement
 
+from cloudbridge.base.middleware import CachingMiddleware
 from cloudbridge.base.middleware import EventDebugLoggingMiddleware
 from cloudbridge.base.middleware import ExceptionWrappingMiddleware
+from cloudbridge.base.middleware import MetricsMiddleware
+from cloudbridge.base.middleware import RateLimitMiddleware
+from cloudbridge.base.middleware import RetryMiddleware
+from cloudbridge.base.middleware import SingleFlightMiddleware
+from cloudbridge.base.middleware import TokenBucket
+from cloudbridge.base.resources import BaseCloudResource
+from cloudbridge.base.resources import BaseObjectLifeCycleMixin
 from cloudbridge.interfaces.exceptions import CloudBridgeBaseException
 from cloudbridge.interfaces.exceptions import \
     InvalidConfigurationException
@@ -93,3 +103,397 @@ class EventDebugLoggingMiddlewareTestCase(unittest.TestCase):
         self.assertTrue(
             "hello world" in cm.output[1],
             "Log output {0} does not contain result".format(cm.output[1]))
+
+
+class CachingMiddlewareTestCase(unittest.TestCase):
+
+    _multiprocess_can_split_ = True
+
+    class DummyService(object):
+
+        def __init__(self):
+            self.call_count = 0
+
+        @implement(event_pattern="provider.dummy.things.get", priority=2500)
+        def get(self, thing_id):
+            self.call_count += 1
+            return "thing-{0}-{1}".format(thing_id, self.call_count)
+
+        @implement(event_pattern="provider.dummy.things.select",
+                   priority=2500)
+        def select(self, **filters):
+            return ["thing-a"]
+
+        @implement(event_pattern="provider.dummy.things.delete",
+                   priority=2500)
+        def delete(self, thing_id):
+            return True
+
+    def _setup(self, **kwargs):
+        dispatcher = SimpleEventDispatcher()
+        manager = SimpleMiddlewareManager(dispatcher)
+        middleware = CachingMiddleware(**kwargs)
+        manager.add(middleware)
+        service = self.DummyService()
+        manager.add(service)
+        return dispatcher, middleware, service
+
+    def test_read_events_are_cached(self):
+        dispatcher, middleware, service = self._setup()
+        first = dispatcher.dispatch(self, "provider.dummy.things.get", "a")
+        second = dispatcher.dispatch(self, "provider.dummy.things.get", "a")
+        self.assertEqual(first, second)
+        self.assertEqual(service.call_count, 1)
+        dispatcher.dispatch(self, "provider.dummy.things.get", "b")
+        self.assertEqual(service.call_count, 2)
+        self.assertEqual((middleware.hits, middleware.misses), (1, 2))
+
+    def test_write_events_invalidate_cache(self):
+        dispatcher, _, service = self._setup()
+        dispatcher.dispatch(self, "provider.dummy.things.get", "a")
+        dispatcher.dispatch(self, "provider.dummy.things.delete", "a")
+        dispatcher.dispatch(self, "provider.dummy.things.get", "a")
+        self.assertEqual(service.call_count, 2)
+
+    def test_select_events_are_reads(self):
+        dispatcher, middleware, service = self._setup()
+        dispatcher.dispatch(self, "provider.dummy.things.get", "a")
+        dispatcher.dispatch(self, "provider.dummy.things.select", size=1)
+        dispatcher.dispatch(self, "provider.dummy.things.select", size=1)
+        dispatcher.dispatch(self, "provider.dummy.things.get", "a")
+        self.assertEqual(service.call_count, 1)
+        self.assertEqual(middleware.hits, 2)
+
+    def test_refreshes_bypass_cache(self):
+        dispatcher, _, service = self._setup()
+
+        class DummyThing(BaseCloudResource, BaseObjectLifeCycleMixin):
+
+            def __init__(self):
+                super(DummyThing, self).__init__(None)
+                self._state = dispatcher.dispatch(
+                    service, "provider.dummy.things.get", "a")
+
+            @property
+            def id(self):
+                return "a"
+
+            @property
+            def name(self):
+                return "a"
+
+            @property
+            def state(self):
+                return self._state
+
+            def refresh(self):
+                self._state = dispatcher.dispatch(
+                    service, "provider.dummy.things.get", self.id)
+
+            def wait_till_ready(self, timeout=None, interval=None):
+                pass
+
+        thing = DummyThing()
+        self.assertEqual(thing.state, "thing-a-1")
+        # Each poll fetches the thing again, even though it is cached
+        thing.wait_for(["thing-a-3"], timeout=1, interval=0)
+        self.assertEqual(service.call_count, 3)
+        # and the cache holds the latest result
+        self.assertEqual(
+            dispatcher.dispatch(service, "provider.dummy.things.get", "a"),
+            "thing-a-3")
+
+    def test_expired_entries_are_refetched(self):
+        dispatcher, _, service = self._setup(ttl=0)
+        dispatcher.dispatch(self, "provider.dummy.things.get", "a")
+        dispatcher.dispatch(self, "provider.dummy.things.get", "a")
+        self.assertEqual(service.call_count, 2)
+
+    def test_least_recently_used_entries_are_evicted(self):
+        dispatcher, _, service = self._setup(max_entries=2)
+        for thing_id in ("a", "b", "a", "c"):
+            dispatcher.dispatch(self, "provider.dummy.things.get", thing_id)
+        self.assertEqual(service.call_count, 3)
+        # "b" was the least recently used entry and should be refetched
+        dispatcher.dispatch(self, "provider.dummy.things.get", "a")
+        dispatcher.dispatch(self, "provider.dummy.things.get", "b")
+        self.assertEqual(service.call_count, 4)
+
+
+class MetricsMiddlewareTestCase(unittest.TestCase):
+
+    _multiprocess_can_split_ = True
+
+    class DummyService(object):
+
+        @implement(event_pattern="provider.dummy.things.get", priority=2500)
+        def get(self, thing_id):
+            if thing_id is None:
+                raise ValueError("No thing")
+            return thing_id
+
+    def _setup(self):
+        dispatcher = SimpleEventDispatcher()
+        manager = SimpleMiddlewareManager(dispatcher)
+        middleware = MetricsMiddleware("dummy", buckets=(0.5, 0.1))
+        manager.add(middleware)
+        manager.add(self.DummyService())
+        return dispatcher, middleware
+
+    def test_calls_and_errors_are_counted(self):
+        dispatcher, middleware = self._setup()
+        dispatcher.dispatch(self, "provider.dummy.things.get", "a")
+        dispatcher.dispatch(self, "provider.dummy.things.get", "b")
+        with self.assertRaises(ValueError):
+            dispatcher.dispatch(self, "provider.dummy.things.get", None)
+
+        stats = middleware.snapshot()["provider.dummy.things.get"]
+        self.assertEqual(stats["provider"], "dummy")
+        self.assertEqual(stats["service"], "dummy.things")
+        self.assertEqual(stats["operation"], "get")
+        self.assertEqual(stats["count"], 3)
+        self.assertEqual(stats["errors"], {"ValueError": 1})
+        self.assertEqual([bound for bound, _ in stats["latency_buckets"]],
+                         [0.1, 0.5, float("inf")])
+        self.assertEqual(stats["latency_buckets"][-1][1], 3)
+
+        middleware.reset()
+        self.assertEqual(middleware.snapshot(), {})
+
+    def test_prometheus_rendering(self):
+        dispatcher, middleware = self._setup()
+        dispatcher.dispatch(self, "provider.dummy.things.get", "a")
+        with self.assertRaises(ValueError):
+            dispatcher.dispatch(self, "provider.dummy.things.get", None)
+
+        text = middleware.to_prometheus()
+        labels = 'provider="dummy",service="dummy.things",operation="get"'
+        self.assertIn("cloudbridge_calls_total{%s} 2" % labels, text)
+        self.assertIn('cloudbridge_errors_total{%s,exception="ValueError"} 1'
+                      % labels, text)
+        self.assertIn('cloudbridge_call_duration_seconds_bucket{%s,le="+Inf"}'
+                      ' 2' % labels, text)
+        self.assertIn("cloudbridge_call_duration_seconds_count{%s} 2"
+                      % labels, text)
+        self.assertIn("# TYPE cloudbridge_call_duration_seconds histogram",
+                      text)
+
+
+class RateLimitMiddlewareTestCase(unittest.TestCase):
+
+    _multiprocess_can_split_ = True
+
+    class DummyService(object):
+
+        @implement(event_pattern="provider.dummy.things.get", priority=2500)
+        def get(self, thing_id):
+            return thing_id
+
+        @implement(event_pattern="provider.other.things.get", priority=2500)
+        def get_other(self, thing_id):
+            return thing_id
+
+    def test_token_bucket(self):
+        bucket = TokenBucket(rate=10, burst=2)
+        self.assertEqual(bucket.reserve(), 0)
+        self.assertEqual(bucket.reserve(), 0)
+        # the bucket is empty, so each further token is due 1/rate later
+        self.assertAlmostEqual(bucket.reserve(), 0.1, delta=0.01)
+        self.assertAlmostEqual(bucket.reserve(), 0.2, delta=0.01)
+        stats = bucket.stats
+        self.assertEqual(stats['acquired'], 4)
+        self.assertEqual(stats['waits'], 2)
+        self.assertAlmostEqual(stats['wait_time'], 0.3, delta=0.02)
+
+    def test_events_are_limited_by_pattern(self):
+        dispatcher = SimpleEventDispatcher()
+        manager = SimpleMiddlewareManager(dispatcher)
+        middleware = RateLimitMiddleware({"provider.dummy.*": (20, 1),
+                                          "provider.*": 1000})
+        manager.add(middleware)
+        manager.add(self.DummyService())
+
+        for thing_id in range(3):
+            self.assertEqual(
+                dispatcher.dispatch(self, "provider.dummy.things.get",
+                                    thing_id), thing_id)
+        dispatcher.dispatch(self, "provider.other.things.get", "a")
+
+        stats = middleware.stats
+        self.assertEqual(stats["provider.dummy.*"]["acquired"], 3)
+        self.assertEqual(stats["provider.dummy.*"]["waits"], 2)
+        self.assertGreater(stats["provider.dummy.*"]["wait_time"], 0.05)
+        # the wider budget applies to events of both services
+        self.assertEqual(stats["provider.*"]["acquired"], 4)
+        self.assertEqual(stats["provider.*"]["waits"], 0)
+
+
+class RetryMiddlewareTestCase(unittest.TestCase):
+
+    _multiprocess_can_split_ = True
+
+    class Throttled(Exception):
+        pass
+
+    class DummyService(object):
+
+        def __init__(self, failures):
+            self.failures = failures
+            self.call_count = 0
+
+        def _call(self, thing_id):
+            self.call_count += 1
+            if self.call_count <= self.failures:
+                raise RetryMiddlewareTestCase.Throttled()
+            return thing_id
+
+        @implement(event_pattern="provider.dummy.things.get", priority=2500)
+        def get(self, thing_id):
+            return self._call(thing_id)
+
+        @implement(event_pattern="provider.dummy.things.create",
+                   priority=2500)
+        def create(self, thing_id):
+            return self._call(thing_id)
+
+        @implement(event_pattern="provider.dummy.things.find", priority=2500)
+        def find(self, thing_id):
+            return self.dispatcher.dispatch(
+                self, "provider.dummy.things.get", thing_id)
+
+    def _setup(self, failures, max_attempts=3):
+        dispatcher = SimpleEventDispatcher()
+        manager = SimpleMiddlewareManager(dispatcher)
+        middleware = RetryMiddleware(
+            lambda e: 0 if isinstance(e, self.Throttled) else None,
+            max_attempts=max_attempts, base_delay=0.001, max_delay=0.01)
+        manager.add(middleware)
+        service = self.DummyService(failures)
+        service.dispatcher = dispatcher
+        manager.add(service)
+        return dispatcher, middleware, service
+
+    def test_throttled_reads_are_retried(self):
+        dispatcher, middleware, service = self._setup(failures=2)
+        self.assertEqual(
+            dispatcher.dispatch(self, "provider.dummy.things.get", "a"), "a")
+        self.assertEqual(service.call_count, 3)
+        stats = middleware.stats
+        self.assertEqual(stats['retries'], 2)
+        self.assertEqual(stats['recovered'], 1)
+        self.assertEqual(stats['exhausted'], 0)
+
+    def test_retries_are_bounded(self):
+        dispatcher, middleware, service = self._setup(failures=5)
+        with self.assertRaises(self.Throttled):
+            dispatcher.dispatch(self, "provider.dummy.things.get", "a")
+        self.assertEqual(service.call_count, 3)
+        self.assertEqual(middleware.stats['exhausted'], 1)
+
+    def test_writes_and_other_errors_are_not_retried(self):
+        dispatcher, middleware, service = self._setup(failures=1)
+        with self.assertRaises(self.Throttled):
+            dispatcher.dispatch(self, "provider.dummy.things.create", "a")
+        self.assertEqual(service.call_count, 1)
+        with self.assertRaises(TypeError):
+            dispatcher.dispatch(self, "provider.dummy.things.get")
+        self.assertEqual(service.call_count, 1)
+        self.assertEqual(middleware.stats['retries'], 0)
+
+    def test_nested_reads_are_not_retried(self):
+        # A get made by a find is only retried through the find, so the
+        # attempts do not multiply
+        dispatcher, middleware, service = self._setup(failures=5)
+        with self.assertRaises(self.Throttled):
+            dispatcher.dispatch(self, "provider.dummy.things.find", "a")
+        self.assertEqual(service.call_count, 3)
+        self.assertEqual(middleware.stats['retries'], 2)
+
+    def test_decorrelated_jitter_is_capped(self):
+        middleware = RetryMiddleware(lambda e: None, base_delay=1,
+                                     max_delay=5)
+        delay = 1
+        for _ in range(20):
+            delay = middleware.next_delay(delay)
+            self.assertTrue(1 <= delay <= 5)
+
+
+class SingleFlightMiddlewareTestCase(unittest.TestCase):
+
+    _multiprocess_can_split_ = True
+
+    class DummyService(object):
+
+        def __init__(self):
+            self.call_count = 0
+            self.release = threading.Event()
+
+        @implement(event_pattern="provider.dummy.things.get", priority=2500)
+        def get(self, thing_id):
+            self.call_count += 1
+            self.release.wait(5)
+            if thing_id is None:
+                raise ValueError("No thing")
+            return [thing_id]
+
+    def _dispatch_concurrently(self, middleware, thing_ids):
+        dispatcher = SimpleEventDispatcher()
+        manager = SimpleMiddlewareManager(dispatcher)
+        manager.add(middleware)
+        service = self.DummyService()
+        manager.add(service)
+        results = [None] * len(thing_ids)
+
+        def run(i, thing_id):
+            try:
+                results[i] = dispatcher.dispatch(
+                    self, "provider.dummy.things.get", thing_id)
+            except ValueError as e:
+                results[i] = e
+
+        threads = [threading.Thread(target=run, args=(i, thing_id))
+                   for i, thing_id in enumerate(thing_ids)]
+        for thread in threads:
+            thread.start()
+        # wait till all threads are in flight before releasing them
+        deadline = time.time() + 5
+        while (middleware.stats['calls'] < len(thing_ids) and
+               time.time() < deadline):
+            time.sleep(0.01)
+        service.release.set()
+        for thread in threads:
+            thread.join()
+        return service, results
+
+    def test_identical_reads_are_coalesced(self):
+        middleware = SingleFlightMiddleware()
+        service, results = self._dispatch_concurrently(
+            middleware, ["a"] * 5 + ["b"] * 3)
+        self.assertEqual(service.call_count, 2)
+        self.assertEqual(results, [["a"]] * 5 + [["b"]] * 3)
+        self.assertEqual(middleware.stats, {'calls': 8, 'coalesced': 6})
+
+    def test_errors_are_shared(self):
+        middleware = SingleFlightMiddleware()
+        service, results = self._dispatch_concurrently(
+            middleware, [None] * 3)
+        self.assertEqual(service.call_count, 1)
+        self.assertTrue(all(isinstance(r, ValueError) for r in results))
+        # each caller gets its own exception, chained to the one raised
+        self.assertEqual(len(set(map(id, results))), 3)
+        original = [r for r in results if r.__cause__ is None]
+        self.assertEqual(len(original), 1)
+        self.assertTrue(all(r.__cause__ is original[0]
+                            for r in results if r is not original[0]))
+
+    def test_unmatched_events_are_not_coalesced(self):
+        middleware = SingleFlightMiddleware(patterns=["provider.other.*"])
+        dispatcher = SimpleEventDispatcher()
+        manager = SimpleMiddlewareManager(dispatcher)
+        manager.add(middleware)
+        service = self.DummyService()
+        service.release.set()
+        manager.add(service)
+        dispatcher.dispatch(self, "provider.dummy.things.get", "a")
+        self.assertEqual(service.call_count, 1)
+        self.assertEqual(middleware.stats['calls'], 0)
@@ -1,4 +1,5 @@
 from cloudbridge.base import helpers as cb_helpers
+from cloudbridge.base.resources import BaseVolume
 from cloudbridge.interfaces import VolumeState
 from cloudbridge.interfaces.exceptions import WaitStateException
 
@@ -38,3 +39,59 @@ class CloudObjectLifeCycleTestCase(ProviderTestBase):
             # Hitting the timeout should raise an exception
             with self.assertRaises(WaitStateException):
                 test_vol.wait_for([VolumeState.ERROR], timeout=0, interval=0)
+
+    def test_poll_schedules_are_per_provider(self):
+        schedule = self.provider.poll_schedule(BaseVolume.POLL_SCHEDULE)
+        self.assertIs(self.provider.poll_schedule(BaseVolume.POLL_SCHEDULE),
+                      schedule)
+        # Each provider keeps its own statistics
+        self.assertIsNot(
+            self.provider.clone().poll_schedule(BaseVolume.POLL_SCHEDULE),
+            schedule)
+        self.assertIsNot(schedule, BaseVolume.POLL_SCHEDULE)
+
+    @helpers.skipIfNoService(['storage.volumes'])
+    def test_wait_for_multiple_objects(self):
+        # Test bulk waits on a group of volumes
+        label = "cb-objlifecycle-{0}".format(helpers.get_uuid())
+        test_vols = []
+
+        def cleanup_vols():
+            for vol in test_vols:
+                vol.delete()
+
+        with cb_helpers.cleanup_action(cleanup_vols):
+            for _ in range(2):
+                test_vols.append(
+                    self.provider.storage.volumes.create(label, 1))
+
+            ready = self.provider.wait_all(test_vols,
+                                           [VolumeState.AVAILABLE])
+            self.assertListEqual([vol.id for vol in ready],
+                                 [vol.id for vol in test_vols])
+
+            ready = self.provider.wait_any(test_vols,
+                                           [VolumeState.AVAILABLE])
+            self.assertTrue(ready)
+
+            # Resources may be given as a generator
+            ready = self.provider.wait_all((vol for vol in test_vols),
+                                           [VolumeState.AVAILABLE])
+            self.assertEqual(len(ready), len(test_vols))
+
+            # Hitting a terminal state should raise an exception
+            with self.assertRaises(WaitStateException):
+                self.provider.wait_all(
+                    test_vols, [VolumeState.ERROR],
+                    terminal_states=[VolumeState.AVAILABLE])
+
+            # Hitting the timeout should raise an exception
+            with self.assertRaises(WaitStateException):
+                self.provider.wait_all(test_vols, [VolumeState.ERROR],
+                                       timeout=0, interval=0)
+
+            # Bulk refreshes should retain the objects' state
+            # pylint:disable=protected-access
+            test_vols[0]._refresh_all(test_vols)
+            self.assertTrue(all(vol.state == VolumeState.AVAILABLE
+                                for vol in test_vols))
@@ -0,0 +1,68 @@
+import unittest
+
+from cloudbridge.base.polling import FixedPollSchedule
+from cloudbridge.base.polling import PollSchedule
+
+
+class PollScheduleTestCase(unittest.TestCase):
+
+    _multiprocess_can_split_ = True
+
+    def test_delays_back_off_exponentially(self):
+        schedule = PollSchedule(initial_interval=1, max_interval=5,
+                                multiplier=2, jitter=False)
+        self.assertListEqual([schedule.delay(i) for i in range(5)],
+                             [1, 2, 4, 5, 5])
+
+    def test_jittered_delays_are_bounded(self):
+        schedule = PollSchedule(initial_interval=1, max_interval=5)
+        for attempt in range(10):
+            delay = schedule.delay(attempt)
+            self.assertTrue(0 <= delay <= min(5, 2 ** attempt))
+
+    def test_first_poll_waits_initial_interval(self):
+        # Jitter never brings a poll forward of the initial interval
+        self.assertEqual(PollSchedule().delay(0), 5)
+        schedule = PollSchedule(initial_interval=2, max_interval=60)
+        for attempt in range(10):
+            self.assertGreaterEqual(schedule.delay(attempt), 2)
+
+    def test_copies_keep_their_own_stats(self):
+        schedule = PollSchedule(initial_interval=1, max_interval=5,
+                                multiplier=3, jitter=False)
+        copy = schedule.copy()
+        self.assertListEqual([copy.delay(i) for i in range(3)], [1, 3, 5])
+        wait = copy.start(timeout=1)
+        wait.finish()
+        self.assertEqual(copy.stats['waits'], 1)
+        self.assertEqual(schedule.stats['waits'], 0)
+
+    def test_fixed_schedule(self):
+        schedule = FixedPollSchedule(3)
+        self.assertListEqual([schedule.delay(i) for i in range(3)],
+                             [3, 3, 3])
+
+    def test_wait_stops_at_deadline(self):
+        schedule = PollSchedule(initial_interval=0.01, max_interval=0.01,
+                                jitter=False)
+        wait = schedule.start(timeout=0.05)
+        polls = 0
+        while wait.sleep():
+            polls += 1
+        self.assertTrue(wait.expired)
+        self.assertEqual(wait.polls, polls)
+        self.assertGreater(polls, 0)
+
+    def test_stats_are_recorded(self):
+        schedule = FixedPollSchedule(0)
+        for _ in range(2):
+            wait = schedule.start(timeout=1)
+            wait.sleep()
+            wait.sleep()
+            wait.finish()
+            # finishing a wait twice should not record it twice
+            wait.finish()
+        stats = schedule.stats
+        self.assertEqual(stats['waits'], 2)
+        self.assertEqual(stats['polls'], 4)
+        self.assertGreaterEqual(stats['wait_time'], 0)
@@ -0,0 +1,70 @@
+import threading
+import unittest
+
+from cloudbridge.base.pool import ConnectionPool
+from cloudbridge.base.pool import fingerprint
+
+
+class ConnectionPoolTestCase(unittest.TestCase):
+
+    _multiprocess_can_split_ = True
+
+    def test_objects_are_shared_by_key(self):
+        pool = ConnectionPool()
+        first = pool.get(('aws', 'session', 'a'), object)
+        self.assertIs(pool.get(('aws', 'session', 'a'), object), first)
+        self.assertIsNot(pool.get(('aws', 'session', 'b'), object), first)
+        self.assertEqual(pool.stats, {'size': 2, 'hits': 1, 'misses': 2,
+                                      'evictions': 0})
+
+    def test_concurrent_requests_create_one_object(self):
+        pool = ConnectionPool()
+        created = []
+        release = threading.Event()
+
+        def factory():
+            created.append(1)
+            release.wait(5)
+            return object()
+
+        results = []
+        threads = [threading.Thread(
+            target=lambda: results.append(pool.get(('k',), factory)))
+            for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(created), 1)
+        self.assertEqual(len(set(id(r) for r in results)), 1)
+
+    def test_eviction_and_expiry(self):
+        pool = ConnectionPool(max_entries=2)
+        for key in ('a', 'b', 'a', 'c'):
+            pool.get((key,), object)
+        # "b" was the least recently used object
+        self.assertEqual(len(pool), 2)
+        self.assertEqual(pool.stats['evictions'], 1)
+        pool.get(('b',), object)
+        self.assertEqual(pool.stats['misses'], 4)
+
+        pool = ConnectionPool(ttl=0)
+        first = pool.get(('a',), object)
+        self.assertIsNot(pool.get(('a',), object), first)
+
+    def test_invalidate_by_prefix(self):
+        pool = ConnectionPool()
+        pool.get(('aws', 'session', 'a'), object)
+        pool.get(('aws', 'ec2', 'a'), object)
+        pool.get(('gcp', 'compute', 'a'), object)
+        self.assertEqual(pool.invalidate('aws', 'ec2'), 1)
+        self.assertEqual(pool.invalidate('aws'), 1)
+        self.assertEqual(len(pool), 1)
+        self.assertEqual(pool.invalidate(), 1)
+
+    def test_fingerprint(self):
+        self.assertEqual(fingerprint({'a': 1, 'b': 2}), fingerprint(
+            {'b': 2, 'a': 1}))
+        self.assertNotEqual(fingerprint('secret'), fingerprint('other'))
+        self.assertNotIn('secret', fingerprint('secret'))
@@ -85,3 +85,48 @@ class CloudVMTypeServiceTestCase(ProviderTestBase):
 
         sit.check_standard_behaviour(
                 self, self.provider.compute.vm_types, vm_type)
+
+    @helpers.skipIfNoService(['compute.vm_types'])
+    def test_vm_type_catalog(self):
+        catalog = self.provider.compute.vm_types.catalog
+        self.assertEqual(len(list(self.provider.compute.vm_types)),
+                         len(catalog.records))
+        self.assertTrue(catalog.records, "VM type catalog must not be empty")
+        version = catalog.version
+        # Clones share the catalog, so do not fetch it again
+        self.assertIs(self.provider.clone().compute.vm_types.catalog,
+                      catalog)
+        # but providers with other catalog settings keep their own
+        other_config = dict(self.provider.config, vm_type_catalog_ttl=60)
+        self.assertIsNot(self.provider.__class__(other_config)
+                         .compute.vm_types.catalog, catalog)
+        # Catalogs are only saved to disk if a path is configured
+        self.assertIsNone(catalog.file_name)
+        # The version only changes when the catalog does
+        catalog.invalidate()
+        self.assertIsNone(catalog.version)
+        list(self.provider.clone().compute.vm_types)
+        self.assertEqual(catalog.version, version)
+
+    @helpers.skipIfNoService(['compute.vm_types'])
+    def test_vm_types_select(self):
+        vm_types = list(self.provider.compute.vm_types.select(
+            min_vcpus=2, min_ram=1, limit=1000))
+        self.assertTrue(vm_types, "Expected VM types with at least 2 vcpus")
+        for vm_type in vm_types:
+            self.assertGreaterEqual(vm_type.vcpus, 2)
+            self.assertGreaterEqual(vm_type.ram, 1)
+        # Results are ordered best fit first
+        fits = [(vm_type.vcpus, vm_type.ram) for vm_type in vm_types]
+        self.assertListEqual(fits, sorted(fits))
+        self.assertListEqual(
+            list(self.provider.compute.vm_types.select(min_vcpus=100000)),
+            [])
+
+    @helpers.skipIfNoService(['compute.vm_types'])
+    def test_vm_type_get_uses_index(self):
+        vm_types = self.provider.compute.vm_types
+        vm_type = next(iter(vm_types))
+        # Lookups by id are served from the shared index
+        self.assertIs(vm_types.get(vm_type.id), vm_type)
+        self.assertIs(vm_types.index.get(vm_type.id), vm_type)